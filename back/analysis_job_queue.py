@@ -0,0 +1,249 @@
+# analysis_job_queue.py - Durable, deduplicating interview analysis queue backed by the analysis_jobs table
+
+import logging
+from datetime import datetime, timedelta
+from typing import Dict, Optional
+
+from sqlalchemy import and_, func, or_
+from sqlalchemy.exc import IntegrityError
+
+from db import AnalysisJob, SessionLocal
+
+logger = logging.getLogger(__name__)
+
+JOB_PENDING = 'pending'
+JOB_LEASED = 'leased'
+JOB_DONE = 'done'
+JOB_FAILED = 'failed'
+
+
+class AnalysisJobQueue:
+    """
+    One row per candidate (unique candidate_id), so re-queueing is an upsert and
+    nothing is held in memory. Workers in any process claim jobs with a
+    conditional UPDATE and hold them under a lease; a lease that expires
+    (crashed worker) makes the job claimable again. Each claim counts as an
+    attempt, and failures are retried with exponential backoff.
+    """
+
+    def __init__(self, lease_seconds: int = 900, max_attempts: int = 4,
+                 retry_base_delay: int = 300, retry_max_delay: int = 3600,
+                 retention_hours: int = 168, claim_scan: int = 5):
+        self.lease_seconds = lease_seconds
+        self.max_attempts = max_attempts
+        self.retry_base_delay = retry_base_delay
+        self.retry_max_delay = retry_max_delay
+        self.retention_hours = retention_hours
+        self.claim_scan = claim_scan
+
+    def enqueue(self, candidate_id: int, priority: int = 5, force: bool = False) -> bool:
+        """
+        Queue a candidate for analysis. Already-queued jobs keep their place
+        (taking the better priority); finished or failed jobs are only re-opened
+        with force=True. Forcing a running job flags it to run again once the
+        current lease completes. Returns True when the candidate is queued or running.
+        """
+        session = SessionLocal()
+        try:
+            now = datetime.now()
+            job = session.query(AnalysisJob).filter(AnalysisJob.candidate_id == candidate_id).first()
+
+            if job is None:
+                session.add(AnalysisJob(
+                    candidate_id=candidate_id,
+                    priority=priority,
+                    status=JOB_PENDING,
+                    attempts=0,
+                    max_attempts=self.max_attempts,
+                    next_attempt_at=now,
+                    created_at=now,
+                    updated_at=now
+                ))
+            elif job.status == JOB_PENDING:
+                job.priority = min(job.priority, priority)
+                if force:
+                    job.next_attempt_at = now
+                job.updated_at = now
+            elif job.status == JOB_LEASED:
+                if not force:
+                    return True
+                # The running analysis may have read stale data; complete() re-queues it
+                job.rerun_requested = True
+                job.priority = min(job.priority, priority)
+                job.updated_at = now
+            elif force:
+                job.status = JOB_PENDING
+                job.priority = priority
+                job.attempts = 0
+                job.max_attempts = self.max_attempts
+                job.next_attempt_at = now
+                job.lease_owner = None
+                job.lease_expires_at = None
+                job.last_error = None
+                job.rerun_requested = False
+                job.updated_at = now
+            else:
+                return False
+
+            session.commit()
+            return True
+        except IntegrityError:
+            # Another process inserted the same candidate first - it is queued
+            session.rollback()
+            return True
+        except Exception as e:
+            session.rollback()
+            logger.error(f"Failed to enqueue analysis for candidate {candidate_id}: {e}")
+            return False
+        finally:
+            session.close()
+
+    def _claimable(self, now: datetime):
+        return and_(
+            AnalysisJob.attempts < AnalysisJob.max_attempts,
+            or_(
+                and_(AnalysisJob.status == JOB_PENDING, AnalysisJob.next_attempt_at <= now),
+                and_(AnalysisJob.status == JOB_LEASED, AnalysisJob.lease_expires_at < now)
+            )
+        )
+
+    def claim(self, owner: str) -> Optional[AnalysisJob]:
+        """Lease the most urgent due job to `owner`, or return None when nothing is due"""
+        session = SessionLocal()
+        try:
+            now = datetime.now()
+            claimable = self._claimable(now)
+            job_ids = [row[0] for row in session.query(AnalysisJob.id)
+                       .filter(claimable)
+                       .order_by(AnalysisJob.priority, AnalysisJob.next_attempt_at)
+                       .limit(self.claim_scan).all()]
+
+            for job_id in job_ids:
+                # The WHERE clause re-checks claimability, so only one worker wins a race
+                claimed = session.query(AnalysisJob).filter(
+                    AnalysisJob.id == job_id, claimable
+                ).update({
+                    AnalysisJob.status: JOB_LEASED,
+                    AnalysisJob.lease_owner: owner,
+                    AnalysisJob.lease_expires_at: now + timedelta(seconds=self.lease_seconds),
+                    AnalysisJob.attempts: AnalysisJob.attempts + 1,
+                    AnalysisJob.updated_at: now
+                }, synchronize_session=False)
+                session.commit()
+                if claimed:
+                    return session.get(AnalysisJob, job_id)
+            return None
+        except Exception as e:
+            session.rollback()
+            logger.error(f"Failed to claim analysis job: {e}")
+            return None
+        finally:
+            session.close()
+
+    def complete(self, job_id: int, owner: str) -> bool:
+        """Mark the job done, or queue it again when a re-run was requested mid-lease"""
+        if self._rerun(job_id, owner, None):
+            return True
+        return self._finish(job_id, owner, {
+            AnalysisJob.status: JOB_DONE,
+            AnalysisJob.last_error: None
+        })
+
+    def fail(self, job: AnalysisJob, owner: str, error: str) -> bool:
+        """Schedule a retry with exponential backoff, or mark the job failed when attempts are used up"""
+        if self._rerun(job.id, owner, error):
+            return True
+
+        if job.attempts >= job.max_attempts:
+            logger.warning(f"Analysis for candidate {job.candidate_id} failed after {job.attempts} attempts")
+            return self._finish(job.id, owner, {
+                AnalysisJob.status: JOB_FAILED,
+                AnalysisJob.last_error: error
+            })
+
+        delay = min(self.retry_max_delay, self.retry_base_delay * 2 ** max(0, job.attempts - 1))
+        logger.info(f"Retrying analysis for candidate {job.candidate_id} in {delay}s "
+                    f"(attempt {job.attempts}/{job.max_attempts})")
+        return self._finish(job.id, owner, {
+            AnalysisJob.status: JOB_PENDING,
+            AnalysisJob.next_attempt_at: datetime.now() + timedelta(seconds=delay),
+            AnalysisJob.last_error: error
+        })
+
+    def _rerun(self, job_id: int, owner: str, error: Optional[str]) -> bool:
+        """Return a leased job flagged by enqueue(force=True) to pending with a fresh attempt budget"""
+        requeued = self._finish(job_id, owner, {
+            AnalysisJob.status: JOB_PENDING,
+            AnalysisJob.attempts: 0,
+            AnalysisJob.next_attempt_at: datetime.now(),
+            AnalysisJob.rerun_requested: False,
+            AnalysisJob.last_error: error
+        }, AnalysisJob.rerun_requested.is_(True), warn=False)
+        if requeued:
+            logger.info(f"Analysis job {job_id} was re-queued while running - running it again")
+        return requeued
+
+    def _finish(self, job_id: int, owner: str, values: Dict, *conditions, warn: bool = True) -> bool:
+        session = SessionLocal()
+        try:
+            values.update({
+                AnalysisJob.lease_owner: None,
+                AnalysisJob.lease_expires_at: None,
+                AnalysisJob.updated_at: datetime.now()
+            })
+            updated = session.query(AnalysisJob).filter(
+                AnalysisJob.id == job_id,
+                AnalysisJob.status == JOB_LEASED,
+                AnalysisJob.lease_owner == owner,
+                *conditions
+            ).update(values, synchronize_session=False)
+            session.commit()
+            if not updated and warn:
+                logger.warning(f"Lease on analysis job {job_id} was lost before it finished")
+            return bool(updated)
+        except Exception as e:
+            session.rollback()
+            logger.error(f"Failed to update analysis job {job_id}: {e}")
+            return False
+        finally:
+            session.close()
+
+    def sweep(self) -> Dict[str, int]:
+        """Fail expired leases with no attempts left and purge finished jobs past retention"""
+        session = SessionLocal()
+        try:
+            now = datetime.now()
+            exhausted = session.query(AnalysisJob).filter(
+                AnalysisJob.status == JOB_LEASED,
+                AnalysisJob.lease_expires_at < now,
+                AnalysisJob.attempts >= AnalysisJob.max_attempts
+            ).update({
+                AnalysisJob.status: JOB_FAILED,
+                AnalysisJob.last_error: 'Lease expired on final attempt',
+                AnalysisJob.lease_owner: None,
+                AnalysisJob.lease_expires_at: None,
+                AnalysisJob.updated_at: now
+            }, synchronize_session=False)
+
+            purged = session.query(AnalysisJob).filter(
+                AnalysisJob.status.in_([JOB_DONE, JOB_FAILED]),
+                AnalysisJob.updated_at < now - timedelta(hours=self.retention_hours)
+            ).delete(synchronize_session=False)
+            session.commit()
+            return {'exhausted': exhausted, 'purged': purged}
+        except Exception as e:
+            session.rollback()
+            logger.error(f"Analysis queue sweep failed: {e}")
+            return {'exhausted': 0, 'purged': 0}
+        finally:
+            session.close()
+
+    def stats(self) -> Dict[str, int]:
+        session = SessionLocal()
+        try:
+            counts = dict(session.query(AnalysisJob.status, func.count(AnalysisJob.id))
+                          .group_by(AnalysisJob.status).all())
+            return {status: counts.get(status, 0)
+                    for status in (JOB_PENDING, JOB_LEASED, JOB_DONE, JOB_FAILED)}
+        finally:
+            session.close()
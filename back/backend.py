@@ -4,12 +4,12 @@ from datetime import datetime, timedelta, timezone
 from db import Candidate, SessionLocal
 from flask_cors import cross_origin
 import threading
-import asyncio
 import time
 import traceback
 import os
 import json
-from sqlalchemy import func, and_
+from sqlalchemy import func, and_, or_, case
+from sqlalchemy.orm import load_only
 import requests
 import logging
 from logging.handlers import RotatingFileHandler
@@ -26,6 +26,14 @@ from email.mime.multipart import MIMEMultipart
 from interview_automation import start_interview_automation, stop_interview_automation
 from werkzeug.utils import secure_filename
 from interview_analysis_service_production import interview_analysis_service, AnalysisStatus
+from background_scheduler import scheduler
+from interview_session_resolver import resolve_candidate, resolve_candidate_id, invalidate_session
+from speech_segment_buffer import speech_buffer
+from resume_text_extractor import resume_extractor
+from cache_invalidation import (bind_cache, register_candidate_view, register_tag_view, candidates_version,
+                                invalidate_candidate, invalidate_job, invalidate_all_candidates,
+                                TAG_JOBS, TAG_INTERVIEW_RESULTS)
+from interview_event_log import append_event, candidates_with_questions, materialize_interview_views, QUESTION, ANSWER, SOURCE_KB, SOURCE_VOICE, SOURCE_UTTERANCE
 from flask_mail import Mail
 from auth_routes import auth_bp
 # from flask_caching import Cache
@@ -45,6 +53,7 @@ print("Interview Analysis Service running")
 # Import your existing modules
 try:
     from scraper import scrape_job
+    from browser_sessions import browser_sessions
     from latest import create_programming_assessment
     from test_link import get_invite_link
     from clint_recruitment_system import run_recruitment_with_invite_link
@@ -150,6 +159,7 @@ if os.getenv('REDIS_URL'):
     }
 
 cache = Cache(app, config=cache_config)
+bind_cache(cache)
 
 # Enhanced CORS Configuration
 CORS(app, 
@@ -352,6 +362,8 @@ def get_cached_jobs():
         # Fallback to database
         return get_jobs_from_database()
 
+register_tag_view(TAG_JOBS, get_cached_jobs)
+
 def get_jobs_from_database():
     """Fallback job fetching from database"""
     session = SessionLocal()
@@ -385,12 +397,137 @@ def get_jobs_from_database():
     finally:
         session.close()
 
+# Columns read by the detail shape; heavy Text columns (transcripts, Q&A blobs,
+# email content) are never loaded for candidate listings
+CANDIDATE_DETAIL_COLUMNS = [
+    'id', 'name', 'email', 'job_id', 'job_title', 'status', 'ats_score', 'linkedin', 'github',
+    'phone', 'resume_path', 'processed_date', 'score_reasoning', 'assessment_invite_link',
+    'exam_link_sent', 'exam_link_sent_date', 'exam_completed', 'exam_completed_date',
+    'exam_percentage', 'interview_scheduled', 'interview_date', 'interview_link', 'interview_token',
+    'interview_started_at', 'interview_completed_at', 'interview_duration',
+    'interview_progress_percentage', 'interview_answered_questions', 'interview_total_questions',
+    'interview_ai_score', 'interview_ai_technical_score', 'interview_ai_communication_score',
+    'interview_ai_problem_solving_score', 'interview_ai_cultural_fit_score',
+    'interview_ai_overall_feedback', 'interview_ai_analysis_status', 'interview_final_status',
+    'interview_ai_strengths', 'interview_ai_weaknesses', 'interview_recording_url', 'final_status',
+]
+
+# Lightweight list shape: plain columns only, no JSON parsing
+CANDIDATE_LIST_COLUMNS = [
+    'id', 'name', 'email', 'job_id', 'job_title', 'status', 'ats_score', 'processed_date',
+    'exam_completed', 'exam_percentage', 'interview_scheduled', 'interview_completed_at',
+    'interview_ai_score', 'interview_final_status', 'final_status',
+]
+
+CANDIDATE_PAGE_MAX = 500
+
+def _candidate_detail_dict(c):
+    """Full candidate shape returned by /api/candidates"""
+    # Calculate time remaining for assessment
+    time_remaining = None
+    link_expired = False
+    
+    if c.exam_link_sent_date and not c.exam_completed:
+        deadline = c.exam_link_sent_date + timedelta(hours=ASSESSMENT_CONFIG['EXPIRY_HOURS'])
+        if datetime.now() < deadline:
+            time_remaining = (deadline - datetime.now()).total_seconds() / 3600
+        else:
+            link_expired = True
+    
+    candidate_data = {
+        "id": c.id,
+        "name": c.name or "Unknown",
+        "email": c.email or "",
+        "job_id": c.job_id,
+        "job_title": c.job_title or "Unknown Position",
+        "status": c.status,
+        "ats_score": float(c.ats_score) if c.ats_score else 0.0,
+        "linkedin": c.linkedin,
+        "github": c.github,
+        "phone": getattr(c, 'phone', None),
+        "resume_path": c.resume_path,
+        "resume_url": c.resume_path,  # Add this for frontend compatibility
+        "processed_date": c.processed_date.isoformat() if c.processed_date else None,
+        "score_reasoning": c.score_reasoning,
+        
+        # Assessment fields
+        "assessment_invite_link": c.assessment_invite_link,
+        "exam_link_sent": bool(c.exam_link_sent),
+        "exam_link_sent_date": c.exam_link_sent_date.isoformat() if c.exam_link_sent_date else None,
+        "exam_completed": bool(c.exam_completed),
+        "exam_completed_date": c.exam_completed_date.isoformat() if c.exam_completed_date else None,
+        "link_expired": link_expired,
+        "time_remaining_hours": time_remaining,
+        "exam_percentage": float(c.exam_percentage) if c.exam_percentage else None,
+        
+        # Interview scheduling fields
+        "interview_scheduled": bool(c.interview_scheduled),
+        "interview_date": c.interview_date.isoformat() if c.interview_date else None,
+        "interview_link": c.interview_link,
+        "interview_token": c.interview_token,
+        
+        # Interview progress fields
+        "interview_started_at": c.interview_started_at.isoformat() if c.interview_started_at else None,
+        "interview_completed_at": c.interview_completed_at.isoformat() if c.interview_completed_at else None,
+        "interview_duration": c.interview_duration or 0,
+        "interview_progress": c.interview_progress_percentage or 0,
+        "interview_questions_answered": c.interview_answered_questions or 0,
+        "interview_total_questions": c.interview_total_questions or 0,
+        
+        # Interview AI analysis fields
+        "interview_ai_score": c.interview_ai_score,
+        "interview_ai_technical_score": c.interview_ai_technical_score,
+        "interview_ai_communication_score": c.interview_ai_communication_score,
+        "interview_ai_problem_solving_score": c.interview_ai_problem_solving_score,
+        "interview_ai_cultural_fit_score": c.interview_ai_cultural_fit_score,
+        "interview_ai_overall_feedback": c.interview_ai_overall_feedback,
+        "interview_ai_analysis_status": c.interview_ai_analysis_status,
+        "interview_final_status": c.interview_final_status,
+        
+        # Interview insights
+        "strengths": json.loads(c.interview_ai_strengths or '[]') if c.interview_ai_strengths else [],
+        "weaknesses": json.loads(c.interview_ai_weaknesses or '[]') if c.interview_ai_weaknesses else [],
+        "recommendations": json.loads(c.interview_recommendations or '[]') if hasattr(c, 'interview_recommendations') and c.interview_recommendations else [],
+        
+        # Interview recording
+        "interview_recording_url": c.interview_recording_url,
+        
+        # Status fields
+        "final_status": c.final_status,
+    }
+    
+    return candidate_data
+
+def _candidate_projection_dict(c, columns):
+    """Project the requested plain columns, serializing datetimes"""
+    data = {}
+    for name in columns:
+        value = getattr(c, name, None)
+        data[name] = value.isoformat() if isinstance(value, datetime) else value
+    return data
+
 @cache.memoize(timeout=180)  # 3 minutes cache
-def get_cached_candidates(job_id=None, status_filter=None):
-    """Cached candidate fetching with optimized queries"""
+def get_cached_candidates(job_id=None, status_filter=None, limit=None, cursor=None, fields=None, view=None,
+                          version=None):
+    """
+    Cached candidate fetching with optimized queries.
+    `version` only participates in the cache key (see cache_invalidation).
+    Without limit it returns the legacy full list; with limit it returns one
+    keyset page ({items, next_cursor}) ordered by id descending.
+    fields (tuple of column names) or view='list' select a projected shape.
+    """
     session = SessionLocal()
     try:
-        query = session.query(Candidate)
+        if fields:
+            columns = ['id'] + [f for f in fields if f != 'id']
+        elif view == 'list':
+            columns = CANDIDATE_LIST_COLUMNS
+        else:
+            columns = CANDIDATE_DETAIL_COLUMNS
+        
+        query = session.query(Candidate).options(
+            load_only(*[getattr(Candidate, name) for name in columns])
+        )
         
         if job_id:
             query = query.filter_by(job_id=str(job_id))
@@ -398,90 +535,32 @@ def get_cached_candidates(job_id=None, status_filter=None):
         if status_filter:
             query = query.filter_by(status=status_filter)
         
+        if limit:
+            query = query.order_by(Candidate.id.desc())
+            if cursor:
+                query = query.filter(Candidate.id < int(cursor))
+            query = query.limit(limit + 1)
+        
         candidates = query.all()
         
+        next_cursor = None
+        if limit and len(candidates) > limit:
+            candidates = candidates[:limit]
+            next_cursor = str(candidates[-1].id)
+        
         result = []
         for c in candidates:
             try:
-                # Calculate time remaining for assessment
-                time_remaining = None
-                link_expired = False
-                
-                if c.exam_link_sent_date and not c.exam_completed:
-                    deadline = c.exam_link_sent_date + timedelta(hours=ASSESSMENT_CONFIG['EXPIRY_HOURS'])
-                    if datetime.now() < deadline:
-                        time_remaining = (deadline - datetime.now()).total_seconds() / 3600
-                    else:
-                        link_expired = True
-                
-                candidate_data = {
-                    "id": c.id,
-                    "name": c.name or "Unknown",
-                    "email": c.email or "",
-                    "job_id": c.job_id,
-                    "job_title": c.job_title or "Unknown Position",
-                    "status": c.status,
-                    "ats_score": float(c.ats_score) if c.ats_score else 0.0,
-                    "linkedin": c.linkedin,
-                    "github": c.github,
-                    "phone": getattr(c, 'phone', None),
-                    "resume_path": c.resume_path,
-                    "resume_url": c.resume_path,  # Add this for frontend compatibility
-                    "processed_date": c.processed_date.isoformat() if c.processed_date else None,
-                    "score_reasoning": c.score_reasoning,
-                    
-                    # Assessment fields
-                    "assessment_invite_link": c.assessment_invite_link,
-                    "exam_link_sent": bool(c.exam_link_sent),
-                    "exam_link_sent_date": c.exam_link_sent_date.isoformat() if c.exam_link_sent_date else None,
-                    "exam_completed": bool(c.exam_completed),
-                    "exam_completed_date": c.exam_completed_date.isoformat() if c.exam_completed_date else None,
-                    "link_expired": link_expired,
-                    "time_remaining_hours": time_remaining,
-                    "exam_percentage": float(c.exam_percentage) if c.exam_percentage else None,
-                    
-                    # Interview scheduling fields
-                    "interview_scheduled": bool(c.interview_scheduled),
-                    "interview_date": c.interview_date.isoformat() if c.interview_date else None,
-                    "interview_link": c.interview_link,
-                    "interview_token": c.interview_token,
-                    
-                    # Interview progress fields
-                    "interview_started_at": c.interview_started_at.isoformat() if c.interview_started_at else None,
-                    "interview_completed_at": c.interview_completed_at.isoformat() if c.interview_completed_at else None,
-                    "interview_duration": c.interview_duration or 0,
-                    "interview_progress": c.interview_progress_percentage or 0,
-                    "interview_questions_answered": c.interview_answered_questions or 0,
-                    "interview_total_questions": c.interview_total_questions or 0,
-                    
-                    # Interview AI analysis fields
-                    "interview_ai_score": c.interview_ai_score,
-                    "interview_ai_technical_score": c.interview_ai_technical_score,
-                    "interview_ai_communication_score": c.interview_ai_communication_score,
-                    "interview_ai_problem_solving_score": c.interview_ai_problem_solving_score,
-                    "interview_ai_cultural_fit_score": c.interview_ai_cultural_fit_score,
-                    "interview_ai_overall_feedback": c.interview_ai_overall_feedback,
-                    "interview_ai_analysis_status": c.interview_ai_analysis_status,
-                    "interview_final_status": c.interview_final_status,
-                    
-                    # Interview insights
-                    "strengths": json.loads(c.interview_ai_strengths or '[]') if c.interview_ai_strengths else [],
-                    "weaknesses": json.loads(c.interview_ai_weaknesses or '[]') if c.interview_ai_weaknesses else [],
-                    "recommendations": json.loads(c.interview_recommendations or '[]') if hasattr(c, 'interview_recommendations') and c.interview_recommendations else [],
-                    
-                    # Interview recording
-                    "interview_recording_url": c.interview_recording_url,
-                    
-                    # Status fields
-                    "final_status": c.final_status,
-                }
-                
-                result.append(candidate_data)
-                
+                if fields or view == 'list':
+                    result.append(_candidate_projection_dict(c, columns))
+                else:
+                    result.append(_candidate_detail_dict(c))
             except Exception as e:
                 logger.error(f"Error processing candidate {c.id}: {e}")
                 continue
         
+        if limit:
+            return {"items": result, "next_cursor": next_cursor, "limit": limit}
         return result
     finally:
         session.close()
@@ -613,8 +692,30 @@ def api_candidates():
     try:
         job_id = request.args.get('job_id')
         status_filter = request.args.get('status')
+        view = request.args.get('view')
+        cursor = request.args.get('cursor')
         
-        candidates = get_cached_candidates(job_id, status_filter)
+        limit = request.args.get('limit')
+        if limit is not None or cursor:
+            try:
+                limit = min(max(int(limit or 50), 1), CANDIDATE_PAGE_MAX)
+                if cursor:
+                    int(cursor)
+            except ValueError:
+                return jsonify({"error": "limit and cursor must be integers"}), 400
+            # Paginated callers get the list shape unless they ask for detail
+            view = view or 'list'
+        
+        fields = None
+        if request.args.get('fields'):
+            fields = tuple(f.strip() for f in request.args['fields'].split(',') if f.strip())
+            unknown = [f for f in fields if f not in Candidate.__table__.columns]
+            if unknown:
+                return jsonify({"error": f"Unknown fields: {', '.join(unknown)}"}), 400
+        
+        candidates = get_cached_candidates(job_id, status_filter, limit, cursor, fields,
+                                           view if view in ('list', 'detail') else None,
+                                           candidates_version(job_id))
         return jsonify(candidates), 200
         
     except Exception as e:
@@ -759,8 +860,7 @@ def run_pipeline_with_monitoring(job_id, job_title, job_desc, create_assessment=
         update_pipeline_status(job_id, 'running', 'Pipeline started', 10)
         
         # Clear caches
-        cache.delete_memoized(get_cached_candidates)
-        cache.delete_memoized(get_cached_jobs)
+        invalidate_job(job_id, candidates_changed=True)
         
         # Run modified pipeline
         full_recruitment_pipeline(job_id, job_title, job_desc, create_assessment)
@@ -785,7 +885,7 @@ def full_recruitment_pipeline(job_id, job_title, job_desc, create_assessment=Fal
         try:
             update_pipeline_status(job_id, 'running', 'Scraping resumes...', progress_step1)
             logger.info(f"STEP 1: Scraping resumes for job_id={job_id}")
-            asyncio.run(scrape_job(job_id))
+            browser_sessions.run(scrape_job(job_id))
             logger.info("Scraping completed successfully")
         except Exception as e:
             logger.error(f"Scraping failed: {str(e)}", exc_info=True)
@@ -813,11 +913,16 @@ def full_recruitment_pipeline(job_id, job_title, job_desc, create_assessment=Fal
         try:
             update_pipeline_status(job_id, 'running', 'Running AI-powered screening...', final_progress - 10)
             logger.info("Running AI-powered screening...")
+            screening_start = final_progress - 10
             run_recruitment_with_invite_link(
                 job_id=job_id, 
                 job_title=job_title, 
                 job_desc=job_desc, 
-                invite_link=invite_link
+                invite_link=invite_link,
+                progress_callback=lambda done, total: update_pipeline_status(
+                    job_id, 'running', f'Screened {done}/{total} resumes',
+                    screening_start + int(9 * done / total)
+                )
             )
             logger.info("AI screening completed successfully")
         except Exception as e:
@@ -825,8 +930,7 @@ def full_recruitment_pipeline(job_id, job_title, job_desc, create_assessment=Fal
             raise
         
         # Clear caches
-        cache.delete_memoized(get_cached_candidates)
-        cache.delete_memoized(get_cached_jobs)
+        invalidate_job(job_id, candidates_changed=True)
         
         logger.info("Recruitment pipeline finished successfully")
             
@@ -834,77 +938,128 @@ def full_recruitment_pipeline(job_id, job_title, job_desc, create_assessment=Fal
         logger.error(f"Fatal pipeline error: {e}", exc_info=True)
         raise
 
+def _month_bucket(column, dialect_name):
+    """SQL expression bucketing a datetime column into 'YYYY-MM' for the given dialect"""
+    if dialect_name == 'postgresql':
+        return func.to_char(func.date_trunc('month', column), 'YYYY-MM')
+    if dialect_name in ('mysql', 'mariadb'):
+        return func.date_format(column, '%Y-%m')
+    return func.strftime('%Y-%m', column)
+
+def _calendar_months(count, now=None):
+    """First day of each of the last `count` calendar months, oldest first"""
+    now = now or datetime.now()
+    year, month = now.year, now.month
+    months = []
+    for _ in range(count):
+        months.append(datetime(year, month, 1))
+        month -= 1
+        if month == 0:
+            year, month = year - 1, 12
+    months.reverse()
+    return months
+
 @app.route('/api/recruitment-stats', methods=['GET', 'OPTIONS'])
 @rate_limit(max_calls=20, time_window=60)
-@cache.memoize(timeout=600)  # 10 minute cache
+@cache.cached(timeout=600, query_string=True, unless=lambda: request.method != 'GET')  # 10 minute cache per query string
 def api_recruitment_stats():
-    """Cached recruitment statistics"""
+    """
+    Cached recruitment statistics per calendar month.
+    Query params: months (default 6, max 36), job_id (filter),
+    breakdown=job (adds per-job counts to each month).
+    """
     if request.method == 'OPTIONS':
         return '', 200
     
+    try:
+        months_count = min(max(int(request.args.get('months', 6)), 1), 36)
+    except ValueError:
+        return jsonify({"error": "months must be an integer"}), 400
+    job_id = request.args.get('job_id')
+    by_job = request.args.get('breakdown') == 'job'
+    
     session = SessionLocal()
     try:
-        stats = []
-        current_date = datetime.now()
+        months = _calendar_months(months_count)
+        range_start = months[0]
+        dialect_name = session.bind.dialect.name
         
-        # Get last 6 months of data efficiently
-        for i in range(6):
-            try:
-                month_date = current_date - timedelta(days=30*i)
-                month_name = month_date.strftime('%b')
-                
-                # Calculate month boundaries
-                month_start = month_date.replace(day=1, hour=0, minute=0, second=0, microsecond=0)
-                if month_start.month == 12:
-                    month_end = month_start.replace(year=month_start.year + 1, month=1, day=1) - timedelta(seconds=1)
-                else:
-                    month_end = month_start.replace(month=month_start.month + 1, day=1) - timedelta(seconds=1)
-                
-                # Single query for all stats
-                applications = session.query(func.count(Candidate.id)).filter(
-                    and_(
-                        Candidate.processed_date >= month_start,
-                        Candidate.processed_date <= month_end
-                    )
-                ).scalar() or 0
-                
-                interviews = session.query(func.count(Candidate.id)).filter(
-                    and_(
-                        Candidate.interview_scheduled == True,
-                        Candidate.interview_date >= month_start,
-                        Candidate.interview_date <= month_end
-                    )
-                ).scalar() or 0
-                
-                hires = session.query(func.count(Candidate.id)).filter(
-                    and_(
-                        Candidate.final_status == "Hired",
-                        Candidate.processed_date >= month_start,
-                        Candidate.processed_date <= month_end
-                    )
-                ).scalar() or 0
-                
-                stats.append({
-                    "month": month_name,
-                    "applications": applications,
-                    "interviews": interviews,
-                    "hires": hires
-                })
-                
-            except Exception as e:
-                logger.error(f"Error calculating stats for month {i}: {e}")
-                stats.append({
-                    "month": (current_date - timedelta(days=30*i)).strftime('%b'),
-                    "applications": 0,
-                    "interviews": 0,
-                    "hires": 0
-                })
+        # Applications and hires share the processed_date bucket: one grouped query
+        applied_bucket = _month_bucket(Candidate.processed_date, dialect_name)
+        applied_columns = [
+            applied_bucket.label('period'),
+            func.count(Candidate.id),
+            func.sum(case((Candidate.final_status == "Hired", 1), else_=0))
+        ]
+        if by_job:
+            applied_columns.append(Candidate.job_id)
+        applied_query = session.query(*applied_columns).filter(
+            Candidate.processed_date >= range_start
+        )
+        
+        # Interviews are bucketed on interview_date: one grouped query
+        interview_bucket = _month_bucket(Candidate.interview_date, dialect_name)
+        interview_columns = [interview_bucket.label('period'), func.count(Candidate.id)]
+        if by_job:
+            interview_columns.append(Candidate.job_id)
+        interview_query = session.query(*interview_columns).filter(
+            Candidate.interview_scheduled == True,
+            Candidate.interview_date >= range_start
+        )
+        
+        if job_id:
+            applied_query = applied_query.filter(Candidate.job_id == str(job_id))
+            interview_query = interview_query.filter(Candidate.job_id == str(job_id))
+        
+        group_applied = [applied_bucket] + ([Candidate.job_id] if by_job else [])
+        group_interview = [interview_bucket] + ([Candidate.job_id] if by_job else [])
+        
+        stats = {}
+        for month_start in months:
+            period = month_start.strftime('%Y-%m')
+            stats[period] = {
+                "month": month_start.strftime('%b'),
+                "period": period,
+                "applications": 0,
+                "interviews": 0,
+                "hires": 0
+            }
+            if by_job:
+                stats[period]["by_job"] = {}
+        
+        def _bucket(period, row_job_id):
+            entry = stats.get(period)
+            if entry is None:
+                return None, None
+            if not by_job:
+                return entry, None
+            job_entry = entry["by_job"].setdefault(
+                str(row_job_id), {"applications": 0, "interviews": 0, "hires": 0}
+            )
+            return entry, job_entry
+        
+        for row in applied_query.group_by(*group_applied).all():
+            entry, job_entry = _bucket(row[0], row[3] if by_job else None)
+            if entry is None:
+                continue
+            entry["applications"] += row[1] or 0
+            entry["hires"] += int(row[2] or 0)
+            if job_entry is not None:
+                job_entry["applications"] += row[1] or 0
+                job_entry["hires"] += int(row[2] or 0)
+        
+        for row in interview_query.group_by(*group_interview).all():
+            entry, job_entry = _bucket(row[0], row[2] if by_job else None)
+            if entry is None:
+                continue
+            entry["interviews"] += row[1] or 0
+            if job_entry is not None:
+                job_entry["interviews"] += row[1] or 0
         
-        # Reverse to get chronological order
-        stats.reverse()
+        result = list(stats.values())
         
-        logger.info(f"Generated recruitment stats for {len(stats)} months")
-        return jsonify(stats), 200
+        logger.info(f"Generated recruitment stats for {len(result)} months")
+        return jsonify(result), 200
         
     except Exception as e:
         logger.error(f"Error in api_recruitment_stats: {e}", exc_info=True)
@@ -945,7 +1100,7 @@ def api_send_reminder(candidate_id):
             session.commit()
             
             # Clear cache
-            cache.delete_memoized(get_cached_candidates)
+            invalidate_candidate(candidate.id, candidate.job_id)
             
             return jsonify({
                 "success": True,
@@ -1550,13 +1705,8 @@ def run_scraping_with_monitoring(assessment_name: str):
             )
             return
         
-        # Run the async scraping function
-        loop = asyncio.new_event_loop()
-        asyncio.set_event_loop(loop)
-        try:
-            results = loop.run_until_complete(scrape_assessment_results_by_name(assessment_name))
-        finally:
-            loop.close()
+        # Run on the shared browser pool so the warm browser and saved login are reused
+        results = browser_sessions.run(scrape_assessment_results_by_name(assessment_name))
         
         duration = time.time() - start_time
         logger.info(f"Scraping completed successfully in {duration:.2f} seconds. Found {len(results)} candidates.")
@@ -1818,6 +1968,31 @@ def debug_schedule_interview():
 
 # Add this enhanced function to your backend.py
 
+def structured_interview_questions(candidate_name, position, company, skills):
+    """(heading, question) pairs asked in order by the structured interview KB"""
+    return [
+        ("SELF INTRODUCTION (ALWAYS ASK FIRST)", f"Hello {candidate_name}, welcome to your interview for the {position} position at {company}. Let's begin. Could you please introduce yourself and tell me about your professional background and what led you to apply for this role?"),
+        ("TECHNICAL EXPERIENCE", f"I see from your resume that you have experience with {skills[0]}. Can you tell me about a specific project where you used {skills[0]} and what challenges you faced?" if skills else "Can you tell me about your most significant technical project and the technologies you used?"),
+        ("PROBLEM SOLVING", "That's interesting. Now, let me ask you about problem-solving. Can you describe a time when you encountered a complex technical problem and walk me through how you approached and solved it?"),
+        ("TEAMWORK", "Great. Let's talk about teamwork. Tell me about a time when you had to collaborate with other team members on a challenging project. How did you handle any conflicts or disagreements?"),
+        ("SPECIFIC SKILL DEEP DIVE", f"I noticed you also have experience with {skills[1]}. What's the most complex thing you've built using {skills[1]}? Please be specific about the technical details." if len(skills) > 1 else "What would you say is your strongest technical skill, and can you give me a detailed example of how you've applied it?"),
+        ("LEARNING ABILITY", "Technology evolves rapidly. Can you tell me about a time when you had to quickly learn a new technology or framework for a project? How did you approach the learning process?"),
+        ("ROLE-SPECIFIC", f"Let's talk specifically about this {position} role. Based on your understanding of the position, how do you see your skills and experience contributing to our team in the first 90 days?"),
+        ("CHALLENGES", "What do you think would be the biggest challenge for you in this role, and how would you address it?"),
+        ("CAREER GOALS", f"Where do you see your career heading in the next 3-5 years, and how does this {position} role fit into those plans?"),
+        ("CANDIDATE QUESTIONS", f"Thank you for your answers. Now, do you have any questions for me about the role, the team, or {company}?"),
+    ]
+
+
+def build_structured_kb_questions(candidate_name, position, company, resume_content):
+    """Question types for the structured interview KB, precomputed once for interview analysis"""
+    from dynamic_interview_analyzer import get_default_analyzer
+    
+    skills = extract_skills_from_resume(resume_content) if resume_content else []
+    questions = structured_interview_questions(candidate_name, position, company, skills)
+    return get_default_analyzer().classify_questions([question for _, question in questions])
+
+
 def create_structured_interview_kb(candidate_name, position, company, resume_content, job_description):
     """Create a highly structured knowledge base for professional interviews"""
     
@@ -1826,6 +2001,11 @@ def create_structured_interview_kb(candidate_name, position, company, resume_con
     experience = extract_experience_years(resume_content) if resume_content else "Not specified"
     projects = extract_projects_from_resume(resume_content) if resume_content else []
     
+    questions_block = "\n\n".join(
+        f'=== QUESTION {number}: {heading} ===\n"{question}"'
+        for number, (heading, question) in enumerate(structured_interview_questions(candidate_name, position, company, skills), 1)
+    )
+    
     # Build the structured interview content
     structured_content = f"""
 STRICT INTERVIEW PROTOCOL - FOLLOW EXACTLY:
@@ -1842,35 +2022,7 @@ CANDIDATE DETAILS:
 
 INTERVIEW STRUCTURE - ASK THESE QUESTIONS IN EXACT ORDER:
 
-=== QUESTION 1: SELF INTRODUCTION (ALWAYS ASK FIRST) ===
-"Hello {candidate_name}, welcome to your interview for the {position} position at {company}. Let's begin. Could you please introduce yourself and tell me about your professional background and what led you to apply for this role?"
-
-=== QUESTION 2: TECHNICAL EXPERIENCE ===
-{"I see from your resume that you have experience with " + skills[0] + ". Can you tell me about a specific project where you used " + skills[0] + " and what challenges you faced?" if skills else "Can you tell me about your most significant technical project and the technologies you used?"}
-
-=== QUESTION 3: PROBLEM SOLVING ===
-"That's interesting. Now, let me ask you about problem-solving. Can you describe a time when you encountered a complex technical problem and walk me through how you approached and solved it?"
-
-=== QUESTION 4: TEAMWORK ===
-"Great. Let's talk about teamwork. Tell me about a time when you had to collaborate with other team members on a challenging project. How did you handle any conflicts or disagreements?"
-
-=== QUESTION 5: SPECIFIC SKILL DEEP DIVE ===
-{"I noticed you also have experience with " + skills[1] + ". What's the most complex thing you've built using " + skills[1] + "? Please be specific about the technical details." if len(skills) > 1 else "What would you say is your strongest technical skill, and can you give me a detailed example of how you've applied it?"}
-
-=== QUESTION 6: LEARNING ABILITY ===
-"Technology evolves rapidly. Can you tell me about a time when you had to quickly learn a new technology or framework for a project? How did you approach the learning process?"
-
-=== QUESTION 7: ROLE-SPECIFIC ===
-"Let's talk specifically about this {position} role. Based on your understanding of the position, how do you see your skills and experience contributing to our team in the first 90 days?"
-
-=== QUESTION 8: CHALLENGES ===
-"What do you think would be the biggest challenge for you in this role, and how would you address it?"
-
-=== QUESTION 9: CAREER GOALS ===
-"Where do you see your career heading in the next 3-5 years, and how does this {position} role fit into those plans?"
-
-=== QUESTION 10: CANDIDATE QUESTIONS ===
-"Thank you for your answers. Now, do you have any questions for me about the role, the team, or {company}?"
+{questions_block}
 
 CRITICAL RULES:
 1. When you receive "INIT_INTERVIEW", IMMEDIATELY ask Question 1
@@ -1942,6 +2094,7 @@ def create_knowledge_base_enhanced():
             resume_content=resume_content,
             job_description=job_description
         )
+        kb_questions = build_structured_kb_questions(candidate_name, position, company, resume_content)
         
         # Create opening line that immediately asks first question
         opening_line = f"Hello {candidate_name}, welcome to your interview for the {position} position at {company}. Let's begin. Could you please introduce yourself and tell me about your professional background and what led you to apply for this role?"
@@ -1959,6 +2112,7 @@ def create_knowledge_base_enhanced():
                     if cand:
                         cand.knowledge_base_id = fallback_kb_id
                         cand.interview_kb_content = kb_content
+                        cand.interview_kb_questions = json.dumps(kb_questions)
                         session.commit()
                 finally:
                     session.close()
@@ -2036,6 +2190,7 @@ def create_knowledge_base_enhanced():
                 if cand:
                     cand.knowledge_base_id = kb_id
                     cand.interview_kb_content = kb_content
+                    cand.interview_kb_questions = json.dumps(kb_questions)
                     session.commit()
             finally:
                 session.close()
@@ -2045,7 +2200,7 @@ def create_knowledge_base_enhanced():
             "knowledgeBaseId": kb_id,
             "endpoint_used": successful_endpoint,
             "structured": True,
-            "question_count": 10
+            "question_count": len(kb_questions)
         }), 200
         
     except Exception as e:
@@ -3324,7 +3479,7 @@ Remember: This is a conversation, not an interrogation. Make {candidate.name} fe
                 logger.error(f"Email failed: {e}")
             
             # Clear caches
-            cache.delete_memoized(get_cached_candidates)
+            invalidate_candidate(candidate.id, candidate.job_id)
             
             return jsonify({
                 "success": True,
@@ -3622,7 +3777,7 @@ def update_session_progress():
         # if session.dirty:
         session.commit()
 
-        cache.delete_memoized(get_cached_candidates)
+        invalidate_candidate(candidate.id, candidate.job_id)
 
         return jsonify({
             "success": True,
@@ -3666,6 +3821,11 @@ def complete_interview_session():
         if not candidate:
             return jsonify({"error": "Session not found"}), 404
         
+        # Persist buffered speech and the Q&A views built from the event log
+        if candidate.interview_session_id:
+            speech_buffer.flush_into(session, candidate, candidate.interview_session_id)
+        materialize_interview_views(session, candidate)
+        
         # Mark as completed
         candidate.interview_completed_at = datetime.now()
         candidate.interview_progress_percentage = 100
@@ -3692,17 +3852,12 @@ def complete_interview_session():
             candidate.interview_ai_analysis_status = 'pending'
         
         session.commit()
+        invalidate_session(candidate.interview_session_id, candidate.id)
         
         logger.info(f"Interview completed for candidate {candidate.id} - {candidate.name}")
         
-        # Trigger analysis in background (auto-scoring)
-        try:
-            if 'trigger_auto_scoring' in globals():
-                from concurrent.futures import ThreadPoolExecutor
-                executor = ThreadPoolExecutor(max_workers=2)
-                executor.submit(trigger_auto_scoring, candidate.id)
-        except Exception as e:
-            logger.error(f"Failed to trigger analysis: {e}")
+        # Hand the interview straight to the analysis service
+        interview_analysis_service.notify_interview_completed(candidate.id)
         
         return jsonify({
             "success": True,
@@ -3719,36 +3874,6 @@ def complete_interview_session():
     finally:
         session.close()
 
-# Add to backend.py
-def periodic_interview_completion_check():
-    """Periodically check for interviews that should be completed"""
-    while True:
-        try:
-            time.sleep(300)  # Check every 5 minutes
-            
-            session = SessionLocal()
-            try:
-                # Find uncompleted interviews
-                uncompleted = session.query(Candidate).filter(
-                    Candidate.interview_started_at.isnot(None),
-                    Candidate.interview_completed_at.is_(None)
-                ).all()
-                
-                for candidate in uncompleted:
-                    check_and_complete_interview(candidate.id)
-                    
-            finally:
-                session.close()
-                
-        except Exception as e:
-            logger.error(f"Error in periodic completion check: {e}")
-
-# Start this when the app starts
-completion_check_thread = threading.Thread(
-    target=periodic_interview_completion_check,
-    daemon=True
-)
-completion_check_thread.start()
 
 
 def check_and_update_expired_interviews():
@@ -4083,6 +4208,7 @@ def trigger_auto_scoring(candidate_id):
                 return
             
             # Update status to processing
+            materialize_interview_views(session, candidate)
             candidate.interview_ai_analysis_status = 'processing'
             session.commit()
             
@@ -4156,7 +4282,7 @@ def trigger_auto_scoring(candidate_id):
             session.commit()
             
             # Clear cache to update frontend
-            cache.delete_memoized(get_cached_candidates)
+            invalidate_candidate(candidate.id, candidate.job_id)
             
             logger.info(f"Auto-scoring completed for candidate {candidate_id}: {candidate.interview_ai_score}%")
             
@@ -4264,7 +4390,7 @@ Recommendation: Schedule a new interview
             logger.info(f"Dynamic analysis completed for {candidate.name}: {candidate.interview_ai_score}%")
             
             # Clear cache
-            cache.delete_memoized(get_cached_candidates)
+            invalidate_candidate(candidate.id, candidate.job_id)
             
         except Exception as e:
             logger.error(f"AI analysis failed for candidate {candidate_id}: {e}", exc_info=True)
@@ -4605,6 +4731,8 @@ def get_all_interview_results():
         logger.error(f"Error getting interview results: {e}", exc_info=True)
         return jsonify({"error": "Internal server error"}), 500
 
+register_tag_view(TAG_INTERVIEW_RESULTS, get_all_interview_results)
+
 @app.route('/api/interview/trigger-analysis/<int:candidate_id>', methods=['POST'])
 @rate_limit(max_calls=5, time_window=60)
 def trigger_analysis_manually(candidate_id):
@@ -4656,6 +4784,7 @@ def validate_analysis(candidate_id):
             return jsonify({"error": "Candidate not found"}), 404
         
         # Get Q&A data
+        materialize_interview_views(session, candidate)
         qa_pairs = json.loads(candidate.interview_qa_pairs or '[]')
         
         # Check for invalid responses
@@ -4712,6 +4841,8 @@ def get_analysis_service_status():
     """Get analysis service health status"""
     try:
         stats = interview_analysis_service.get_service_stats()
+        stats['scheduler'] = scheduler.get_stats()
+        stats['browser_sessions'] = browser_sessions.get_stats()
         
         # Add database stats
         session = SessionLocal()
@@ -4858,6 +4989,7 @@ def get_live_interview_status(candidate_id):
             return jsonify({"error": "Candidate not found"}), 404
         
         # Parse Q&A data
+        materialize_interview_views(session, candidate)
         qa_pairs = json.loads(candidate.interview_qa_pairs or '[]')
         
         # Calculate live stats
@@ -5139,7 +5271,7 @@ def start_recording():
     try:
         db = SessionLocal()
         try:
-            cand = db.query(Candidate).filter_by(interview_session_id=session_id).first()
+            cand = resolve_candidate(db, session_id)
             if cand:
                 cand.recording_started_at = datetime.now(timezone.utc)
                 db.commit()
@@ -5189,7 +5321,7 @@ def upload_recording():
         try:
             db = SessionLocal()
             try:
-                cand = db.query(Candidate).filter_by(interview_session_id=session_id).first()
+                cand = resolve_candidate(db, session_id)
                 if cand:
                     cand.recording_path = path
                     cand.interview_recording_format = ext
@@ -5232,119 +5364,63 @@ def track_interview_qa_unified():
         
         session = SessionLocal()
         try:
-            # Try to find the candidate using the session_id
-            candidate = session.query(Candidate).filter_by(interview_session_id=session_id).first()
-
-            if not candidate:
-                # Fallback 1: Try parsing session_id (split by '_')
-                if '_' in session_id:
-                    parts = session_id.split('_')
-                    if len(parts) >= 2 and parts[1].isdigit():
-                        candidate = session.query(Candidate).filter_by(id=int(parts[1])).first()
-                        if candidate:
-                            # Update the session_id for the candidate
-                            candidate.interview_session_id = session_id
-
-                # Fallback 2: Try by interview token if session_id contains it
-                if not candidate and 'token' in session_id:
-                    token = session_id.split('token_')[-1]  # Assuming token is part of the session_id
-                    candidate = session.query(Candidate).filter_by(interview_token=token).first()
+            # Find the candidate (cached session_id -> candidate resolution)
+            candidate = resolve_candidate(session, session_id)
             
             # If no candidate is found, return error
             if not candidate:
                 logger.error(f"No candidate found for session_id={session_id}")
                 return jsonify({"error": "Session not found"}), 404
             
-            # Proceed to track the Q&A data for the candidate
-            # Initialize or retrieve current interview data
-            qa_pairs = json.loads(candidate.interview_qa_pairs or '[]')
-            conversation = json.loads(candidate.interview_conversation or '[]')
-            transcript = candidate.interview_transcript or ""
+            # Append a single event instead of rewriting the JSON blobs;
+            # qa_pairs/conversation/transcript are materialized on demand
             timestamp = datetime.now()
+            total_questions = candidate.interview_total_questions or 0
+            answered_questions = candidate.interview_answered_questions or 0
 
             if content_type == 'question':
                 # This is a question from the knowledge base (KB)
-                question_id = f"q_{len(qa_pairs) + 1}_{int(time.time())}"
-
-                # Store the question data
-                qa_entry = {
-                    'id': question_id,
-                    'question': content,
-                    'answer': None,
-                    'timestamp': timestamp.isoformat(),
-                    'source': 'knowledge_base',
-                    'is_transcribed': False,
-                    'metadata': metadata
-                }
-                qa_pairs.append(qa_entry)
-
-                # Add the question to the conversation
-                conversation.append({
-                    'type': 'question',
-                    'speaker': 'Avatar',
-                    'content': content,
-                    'timestamp': timestamp.isoformat(),
-                    'source': 'knowledge_base'
-                })
-
-                # Update transcript
-                transcript += f"\n[{timestamp.strftime('%H:%M:%S')}] Avatar (KB): {content}\n"
+                append_event(session, candidate.id, session_id, QUESTION, content,
+                             source=SOURCE_KB, metadata=metadata, timestamp=timestamp)
 
                 # Update the candidate's total question count
-                candidate.interview_total_questions = len(qa_pairs)
-                logger.info(f"Stored KB question #{len(qa_pairs)}: {content[:50]}...")
+                candidate.interview_total_questions = total_questions + 1
+                logger.info(f"Stored KB question #{candidate.interview_total_questions}: {content[:50]}...")
 
             elif content_type == 'answer':
                 # This is a transcribed answer from the candidate
-                # Find the most recent unanswered question
-                for qa in reversed(qa_pairs):
-                    if qa.get('question') and not qa.get('answer'):
-                        qa['answer'] = content
-                        qa['answer_timestamp'] = timestamp.isoformat()
-                        qa['answer_source'] = 'voice_transcription'
-                        qa['is_answer_transcribed'] = True
-                        qa['answer_metadata'] = metadata
-                        break
-
-                # Add the answer to the conversation
-                conversation.append({
-                    'type': 'answer',
-                    'speaker': 'Candidate',
-                    'content': content,
-                    'timestamp': timestamp.isoformat(),
-                    'source': 'voice_transcription'
-                })
+                append_event(session, candidate.id, session_id, ANSWER, content,
+                             source=SOURCE_VOICE, metadata=metadata, timestamp=timestamp)
 
-                # Update transcript
-                transcript += f"[{timestamp.strftime('%H:%M:%S')}] Candidate (Voice): {content}\n"
-
-                # Update the answered question count
-                answered = sum(1 for qa in qa_pairs if qa.get('answer'))
-                candidate.interview_answered_questions = answered
+                # Each answer fills the most recent unanswered question, if any
+                if answered_questions < total_questions:
+                    candidate.interview_answered_questions = answered_questions + 1
                 logger.info(f"Stored transcribed answer: {content[:50]}...")
 
             # Calculate interview progress
             if candidate.interview_total_questions > 0:
-                progress = (candidate.interview_answered_questions / candidate.interview_total_questions) * 100
+                progress = ((candidate.interview_answered_questions or 0) / candidate.interview_total_questions) * 100
                 candidate.interview_progress_percentage = progress
 
-            # Save all updated data to the candidate record
-            candidate.interview_qa_pairs = json.dumps(qa_pairs)
-            candidate.interview_conversation = json.dumps(conversation)
-            candidate.interview_transcript = transcript
             candidate.interview_last_activity = timestamp
 
             # Check for automatic interview completion if all questions are answered
+            auto_completed = False
             if (candidate.interview_total_questions >= 10 and 
                 candidate.interview_answered_questions >= candidate.interview_total_questions):
                 if not candidate.interview_completed_at:
+                    materialize_interview_views(session, candidate)
                     candidate.interview_completed_at = datetime.now()
                     candidate.interview_ai_analysis_status = 'pending'
+                    auto_completed = True
                     logger.info(f"Auto-completed interview for {candidate.name}")
 
             # Commit the changes to the database
             session.commit()
 
+            if auto_completed:
+                interview_analysis_service.notify_interview_completed(candidate.id)
+
             return jsonify({
                 "success": True,
                 "stats": {
@@ -5373,6 +5449,7 @@ def get_full_interview_analysis(token):
             return jsonify({"error": "Interview not found"}), 404
         
         # Parse Q&A data
+        materialize_interview_views(session, candidate)
         qa_pairs = json.loads(candidate.interview_qa_pairs or '[]')
         questions_asked = json.loads(candidate.interview_questions_asked or '[]')
         answers_given = json.loads(candidate.interview_answers_given or '[]')
@@ -5440,6 +5517,7 @@ def debug_qa_tracking(session_id):
             return jsonify({"error": "Candidate not found"}), 404
         
         # Parse Q&A data
+        materialize_interview_views(session, candidate)
         qa_pairs = json.loads(candidate.interview_qa_pairs or '[]')
         qa_sequence = json.loads(candidate.interview_qa_sequence or '[]')
         conversation = json.loads(candidate.interview_conversation or '[]')
@@ -5556,6 +5634,7 @@ def get_qa_conversation_unified(session_id):
             return jsonify({"error": "Session not found"}), 404
         
         # Get data from all systems
+        materialize_interview_views(session, candidate)
         qa_pairs = json.loads(candidate.interview_qa_pairs or '[]')
         qa_sequence = json.loads(getattr(candidate, 'interview_qa_sequence', '[]'))
         conversation = json.loads(getattr(candidate, 'interview_conversation', '[]'))
@@ -5728,6 +5807,7 @@ def export_conversation_unified(session_id):
         if not candidate:
             return jsonify({"error": "Session not found"}), 404
         
+        materialize_interview_views(session, candidate)
         conversation = json.loads(getattr(candidate, 'interview_conversation', '[]'))
         
         # If no conversation data, build from qa_pairs
@@ -5869,7 +5949,7 @@ def fix_all_pending_interviews():
             logger.info(f"Triggered analysis for candidate {candidate.id} - {candidate.name}")
         
         # Clear cache
-        cache.delete_memoized(get_cached_candidates)
+        invalidate_all_candidates()
         
         return jsonify({
             "success": True,
@@ -5884,6 +5964,46 @@ def fix_all_pending_interviews():
     finally:
         session.close()
 
+@app.route('/api/interview/rescore-all', methods=['POST'])
+def rescore_all_interviews_endpoint():
+    """
+    Re-score stored interviews with the rule-based batch scorer (no LLM calls),
+    e.g. after changing scoring weights. Body (all optional):
+    {"job_id": "...", "weights": {"technical": .., "communication": .., "problem_solving": .., "cultural_fit": ..},
+     "sentiment": "lexicon" | "textblob" | "off", "include_other_methods": false}
+    Only interviews scored by the dynamic analyzer are re-scored unless
+    include_other_methods is true, which replaces AI / production-service results.
+    """
+    from dynamic_interview_analyzer import rescore_all_interviews, DEFAULT_SCORE_WEIGHTS
+    
+    data = request.get_json(silent=True) or {}
+    weights = data.get('weights')
+    if weights is not None:
+        if not isinstance(weights, dict) or set(weights) != set(DEFAULT_SCORE_WEIGHTS):
+            return jsonify({"error": f"weights must have exactly the keys {sorted(DEFAULT_SCORE_WEIGHTS)}"}), 400
+        try:
+            weights = {key: float(value) for key, value in weights.items()}
+        except (TypeError, ValueError):
+            return jsonify({"error": "weights must be numbers"}), 400
+    
+    try:
+        start = time.time()
+        updated = rescore_all_interviews(
+            job_id=data.get('job_id'),
+            weights=weights,
+            sentiment_backend=data.get('sentiment'),
+            include_other_methods=bool(data.get('include_other_methods', False))
+        )
+        invalidate_all_candidates()
+        return jsonify({
+            "success": True,
+            "rescored": updated,
+            "duration_seconds": round(time.time() - start, 2)
+        }), 200
+    except Exception as e:
+        logger.error(f"Error re-scoring interviews: {e}", exc_info=True)
+        return jsonify({"error": str(e)}), 500
+
 @app.route('/api/interview/poll-updates', methods=['GET'])
 def poll_for_updates():
     """Poll for interview analysis updates"""
@@ -5930,6 +6050,7 @@ def test_qa_tracking_unified(session_id):
             return jsonify({"error": "Session not found"}), 404
         
         # Get raw data from all systems
+        materialize_interview_views(session, candidate)
         qa_pairs = json.loads(candidate.interview_qa_pairs or '[]')
         qa_sequence = json.loads(getattr(candidate, 'interview_qa_sequence', '[]'))
         conversation = json.loads(getattr(candidate, 'interview_conversation', '[]'))
@@ -6152,6 +6273,7 @@ def export_conversation(candidate_id):
         if not candidate:
             return jsonify({"error": "Candidate not found"}), 404
         
+        materialize_interview_views(session, candidate)
         if format_type == 'text':
             # Return plain text conversation
             conversation = candidate.interview_conversation or "No conversation recorded"
@@ -6512,6 +6634,11 @@ def store_knowledge_base_enhanced():
             if hasattr(candidate, 'interview_kb_content'):
                 candidate.interview_kb_content = content
             
+            # Question types for analysis: sent by the client or read from the KB content
+            kb_questions = classify_kb_questions(data.get('questions') or kb_questions_from_content(content))
+            if kb_questions:
+                candidate.interview_kb_questions = json.dumps(kb_questions)
+            
             # Store metadata
             if hasattr(candidate, 'interview_kb_metadata'):
                 metadata = {
@@ -6546,126 +6673,19 @@ def store_knowledge_base_enhanced():
         return jsonify({"error": str(e)}), 500
 
 
-# 4. Enhanced resume extraction function
+# 4. Resume extraction via the shared extractor (process pool + on-disk text cache)
 def extract_resume_content(resume_path):
-    """Enhanced resume extraction with fixed f-string syntax"""
-    try:
-        if not os.path.exists(resume_path):
-            logger.error(f"Resume file not found: {resume_path}")
-            return ""
-        
-        file_ext = os.path.splitext(resume_path)[1].lower()
-        logger.info(f"Extracting resume: {resume_path} (type: {file_ext})")
-        
-        resume_text = ""
-        
-        if file_ext == '.pdf':
-            # Try multiple PDF extraction methods
-            resume_text = extract_pdf_content(resume_path)
-        elif file_ext in ['.docx', '.doc']:
-            resume_text = extract_docx_content(resume_path)
-        elif file_ext == '.txt':
-            resume_text = extract_txt_content(resume_path)
-        else:
-            logger.warning(f"Unsupported file type: {file_ext}")
-        
-        if resume_text and len(resume_text.strip()) > 50:
-            logger.info(f"Resume extracted successfully: {len(resume_text)} characters")
-            return resume_text.strip()
-        else:
-            logger.error("Resume extraction failed or produced minimal content")
-            return ""
-            
-    except Exception as e:
-        logger.error(f"Resume extraction error: {str(e)}", exc_info=True)
+    """Extract text content from a resume; "" when the file is missing or unreadable"""
+    if not resume_path or not os.path.exists(resume_path):
+        logger.error(f"Resume file not found: {resume_path}")
         return ""
-
-
-def extract_pdf_content(pdf_path):
-    """Extract content from PDF using multiple methods"""
-    try:
-        # Method 1: Try PyPDF2
-        try:
-            import PyPDF2
-            with open(pdf_path, 'rb') as file:
-                pdf_reader = PyPDF2.PdfReader(file)
-                text = ""
-                for page in pdf_reader.pages:
-                    text += page.extract_text() + "\n"
-                if text.strip():
-                    return text.strip()
-        except Exception as e:
-            logger.warning(f"PyPDF2 extraction failed: {str(e)}")
-        
-        # Method 2: Try pdfplumber
-        try:
-            import pdfplumber
-            with pdfplumber.open(pdf_path) as pdf:
-                text = ""
-                for page in pdf.pages:
-                    page_text = page.extract_text()
-                    if page_text:
-                        text += page_text + "\n"
-                if text.strip():
-                    return text.strip()
-        except Exception as e:
-            logger.warning(f"pdfplumber extraction failed: {str(e)}")
-        
-        # Method 3: Try pymupdf (fitz)
-        try:
-            import fitz  # pymupdf
-            doc = fitz.open(pdf_path)
-            text = ""
-            for page in doc:
-                text += page.get_text() + "\n"
-            doc.close()
-            if text.strip():
-                return text.strip()
-        except Exception as e:
-            logger.warning(f"pymupdf extraction failed: {str(e)}")
-            
-    except Exception as e:
-        logger.error(f"PDF extraction failed: {str(e)}")
     
-    return ""
-
-
-def extract_docx_content(docx_path):
-    """Extract content from DOCX files"""
-    try:
-        from docx import Document
-        doc = Document(docx_path)
-        
-        # Extract text from paragraphs
-        text = "\n".join([para.text for para in doc.paragraphs if para.text.strip()])
-        
-        # Also extract text from tables
-        for table in doc.tables:
-            for row in table.rows:
-                for cell in row.cells:
-                    if cell.text.strip():
-                        text += "\n" + cell.text.strip()
-        
-        return text.strip()
-    except Exception as e:
-        logger.error(f"DOCX extraction failed: {str(e)}")
-        return ""
-
-
-def extract_txt_content(txt_path):
-    """Extract content from text files"""
-    try:
-        # Try UTF-8 first
-        try:
-            with open(txt_path, 'r', encoding='utf-8') as file:
-                return file.read().strip()
-        except UnicodeDecodeError:
-            # Fallback to latin-1
-            with open(txt_path, 'r', encoding='latin-1') as file:
-                return file.read().strip()
-    except Exception as e:
-        logger.error(f"TXT extraction failed: {str(e)}")
-        return ""
+    resume_text = resume_extractor.extract(resume_path)
+    if resume_text:
+        logger.info(f"Resume extracted: {len(resume_text)} chars from {resume_path}")
+    else:
+        logger.error(f"Failed to extract any text from {resume_path}")
+    return resume_text
 
 # 5. Add validation endpoint for knowledge base creation
 @app.route('/api/validate-kb-creation/<int:candidate_id>', methods=['GET', 'OPTIONS'])
@@ -6933,6 +6953,10 @@ def end_interview_session():
             if not candidate:
                 return jsonify({"error": "Session not found"}), 404
             
+            # Persist buffered speech and the Q&A views built from the event log
+            speech_buffer.flush_into(session, candidate, session_id)
+            materialize_interview_views(session, candidate)
+            
             # Update session status
             candidate.interview_completed_at = datetime.now()
             candidate.interview_status = 'completed'
@@ -6945,7 +6969,9 @@ def end_interview_session():
             session.commit()
             
             # Clear caches
-            cache.delete_memoized(get_cached_candidates)
+            invalidate_candidate(candidate.id, candidate.job_id)
+            invalidate_session(session_id, candidate.id)
+            speech_buffer.end_session(session_id)
             
             logger.info(f"Interview session ended: {session_id}")
             
@@ -7019,6 +7045,8 @@ def get_interview_analysis_production(candidate_id):
     finally:
         session.close()
 
+register_candidate_view(get_interview_analysis_production)
+
 # Add this to your backend.py to properly create knowledge base from resume/job
 
 @app.route('/api/create-interview-knowledge-base', methods=['POST', 'OPTIONS'])
@@ -7045,6 +7073,13 @@ def create_interview_knowledge_base():
             # Get job description
             job_description = candidate.job_description or f"Position: {candidate.job_title}"
             
+            company = os.getenv('COMPANY_NAME', 'Our Company')
+            kb_questions = build_interview_kb_questions(candidate.name, candidate.job_title, company, resume_content)
+            questions_block = "\n".join(
+                f"            {number}. {item['question']}" for number, item in enumerate(kb_questions, 1)
+            )
+            candidate.interview_kb_questions = json.dumps(kb_questions)
+            
             # Create knowledge base content
             kb_content = f"""
             CANDIDATE INFORMATION:
@@ -7063,6 +7098,9 @@ def create_interview_knowledge_base():
             - Focus on skills required for {candidate.job_title}
             - Assess technical competence based on job requirements
             - Ask behavioral questions related to their past experiences
+            
+            INTERVIEW QUESTIONS (ask in this order):
+{questions_block}
             """
             
             # Call HeyGen API to create knowledge base
@@ -7136,79 +7174,6 @@ def generate_custom_interview_prompt(candidate, resume_content, job_description)
     """
 
 
-# 2. Enhanced resume extraction function with better error handling
-def extract_resume_content(resume_path):
-    """Extract text content from resume with better error handling"""
-    try:
-        if not os.path.exists(resume_path):
-            logger.error(f"Resume file not found: {resume_path}")
-            return ""
-        
-        file_ext = os.path.splitext(resume_path)[1].lower()
-        logger.info(f"Extracting resume: {resume_path} (type: {file_ext})")
-        
-        resume_text = ""
-        
-        if file_ext == '.pdf':
-            # Try PyPDF2 first
-            try:
-                import PyPDF2
-                with open(resume_path, 'rb') as file:
-                    pdf_reader = PyPDF2.PdfReader(file)
-                    for page in pdf_reader.pages:
-                        resume_text += page.extract_text() + "\n"
-                
-                if resume_text.strip():
-                    logger.info(f"PDF extracted with PyPDF2: {len(resume_text)} chars")
-                    return resume_text.strip()
-            except Exception as e:
-                logger.warning(f"PyPDF2 failed: {e}")
-            
-            # Try pdfplumber as fallback
-            try:
-                import pdfplumber
-                with pdfplumber.open(resume_path) as pdf:
-                    for page in pdf.pages:
-                        page_text = page.extract_text()
-                        if page_text:
-                            resume_text += page_text + "\n"
-                
-                if resume_text.strip():
-                    logger.info(f"PDF extracted with pdfplumber: {len(resume_text)} chars")
-                    return resume_text.strip()
-            except Exception as e:
-                logger.warning(f"pdfplumber failed: {e}")
-                    
-        elif file_ext in ['.docx', '.doc']:
-            try:
-                from docx import Document
-                doc = Document(resume_path)
-                resume_text = "\n".join([para.text for para in doc.paragraphs if para.text.strip()])
-                logger.info(f"DOCX extracted: {len(resume_text)} chars")
-                return resume_text.strip()
-            except Exception as e:
-                logger.error(f"DOCX extraction error: {e}")
-                
-        elif file_ext == '.txt':
-            try:
-                with open(resume_path, 'r', encoding='utf-8') as file:
-                    resume_text = file.read()
-                logger.info(f"TXT extracted: {len(resume_text)} chars")
-                return resume_text.strip()
-            except UnicodeDecodeError:
-                with open(resume_path, 'r', encoding='latin-1') as file:
-                    resume_text = file.read()
-                return resume_text.strip()
-        
-        # If we couldn't extract anything, return empty string
-        if not resume_text:
-            logger.error(f"Failed to extract any text from {resume_path}")
-            
-    except Exception as e:
-        logger.error(f"Resume extraction failed: {e}", exc_info=True)
-    
-    return ""
-
 # Add this fixed version to your backend.py
 
 @app.route('/api/verify-kb-creation/<int:candidate_id>', methods=['GET'])
@@ -7266,11 +7231,15 @@ def force_create_kb(candidate_id):
             resume_content = extract_resume_content(candidate.resume_path)
         
         # Try to create HeyGen KB
+        position = candidate.job_title or "Software Engineer"
+        company = os.getenv('COMPANY_NAME', 'Our Company')
+        kb_questions = build_interview_kb_questions(candidate.name, position, company, resume_content)
         kb_id = create_heygen_knowledge_base(
             candidate_name=candidate.name,
-            position=candidate.job_title or "Software Engineer",
+            position=position,
             resume_content=resume_content,
-            company=os.getenv('COMPANY_NAME', 'Our Company')
+            company=company,
+            kb_questions=kb_questions
         )
         
         # Check if HeyGen succeeded
@@ -7282,10 +7251,11 @@ def force_create_kb(candidate_id):
         
         # Update candidate
         candidate.interview_kb_id = kb_id
+        candidate.interview_kb_questions = json.dumps(kb_questions)
         session.commit()
         
         # Clear cache
-        cache.delete_memoized(get_cached_candidates)
+        invalidate_candidate(candidate.id, candidate.job_id)
         
         return jsonify({
             "success": True,
@@ -7317,20 +7287,28 @@ def fix_missing_knowledge_bases():
         
         logger.info(f"Found {len(candidates)} candidates with missing knowledge bases")
         
+        # Parse every resume in one extraction batch instead of one by one
+        resume_texts = resume_extractor.extract_many(
+            [c.resume_path for c in candidates if c.resume_path]
+        )
+        
         for candidate in candidates:
             try:
                 # Extract resume content
                 resume_content = ""
                 if candidate.resume_path and os.path.exists(candidate.resume_path):
-                    resume_content = extract_resume_content(candidate.resume_path)
+                    resume_content = resume_texts.get(candidate.resume_path, "")
                     logger.info(f"Extracted {len(resume_content)} chars from resume for {candidate.name}")
                 
                 # Try to create HeyGen KB
+                company = os.getenv('COMPANY_NAME', 'Our Company')
+                kb_questions = build_interview_kb_questions(candidate.name, candidate.job_title, company, resume_content)
                 kb_id = create_heygen_knowledge_base(
                     candidate_name=candidate.name,
                     position=candidate.job_title,
                     resume_content=resume_content,
-                    company=os.getenv('COMPANY_NAME', 'Our Company')
+                    company=company,
+                    kb_questions=kb_questions
                 )
                 
                 if kb_id and not kb_id.startswith('kb_fallback'):
@@ -7344,6 +7322,7 @@ def fix_missing_knowledge_bases():
                 
                 # Update candidate
                 candidate.interview_kb_id = kb_id
+                candidate.interview_kb_questions = json.dumps(kb_questions)
                 fixed_count += 1
                 
             except Exception as e:
@@ -7355,7 +7334,7 @@ def fix_missing_knowledge_bases():
         session.commit()
         
         # Clear cache
-        cache.delete_memoized(get_cached_candidates)
+        invalidate_all_candidates()
         
         return jsonify({
             "success": True,
@@ -7564,7 +7543,55 @@ def debug_heygen_test():
         "test_results": results
     }), 200
 
-def create_heygen_knowledge_base(candidate_name, position, resume_content, company):
+def build_interview_kb_questions(candidate_name, position, company, resume_content):
+    """Fixed KB question list with question types precomputed once for interview analysis"""
+    from dynamic_interview_analyzer import get_default_analyzer
+    
+    # Extract skills for better questions
+    skills = extract_skills_from_resume(resume_content) if resume_content else []
+    
+    questions = [
+        f"Hello {candidate_name}, welcome to your interview for the {position} position at {company}. Let's begin. Could you please introduce yourself and tell me about your professional background?",
+        f"I see from your resume that you have experience with {skills[0]}. Can you tell me about a specific project where you used this technology?" if skills else "Can you tell me about your most significant technical project and the technologies you used?",
+        "Can you describe a time when you encountered a complex technical problem and walk me through how you approached and solved it?",
+        "Tell me about a time when you had to collaborate with team members on a challenging project. How did you handle any conflicts?",
+        "What would you say is your strongest technical skill, and can you give me a detailed example of how you've applied it?",
+        "Technology evolves rapidly. Can you tell me about a time when you had to quickly learn a new technology for a project?",
+        f"Based on your understanding of this {position} role, how do you see your skills contributing to our team?",
+        "What do you think would be the biggest challenge for you in this role?",
+        "Where do you see your career heading in the next 3-5 years?",
+        f"Do you have any questions for me about the role or {company}?"
+    ]
+    return get_default_analyzer().classify_questions(questions)
+
+def classify_kb_questions(questions):
+    """Question types for a KB question list (strings, or dicts that may already carry a question_type)"""
+    from dynamic_interview_analyzer import get_default_analyzer, QUESTION_TYPES
+    
+    analyzer = get_default_analyzer()
+    kb_questions = []
+    for item in questions or []:
+        question = item.get('question') if isinstance(item, dict) else item
+        if not isinstance(question, str) or not question.strip():
+            continue
+        question_type = item.get('question_type') if isinstance(item, dict) else None
+        if question_type not in QUESTION_TYPES:
+            question_type = analyzer.classify_questions([question])[0]['question_type']
+        kb_questions.append({'question': question.strip(), 'question_type': question_type})
+    return kb_questions
+
+def kb_questions_from_content(content):
+    """Question lines from free-form KB content ('Question 3: "..."', '1. ...', quoted or plain)"""
+    import re
+    
+    questions = []
+    for line in (content or '').splitlines():
+        line = re.sub(r'^\s*(?:question\s*\d+\s*:|\d+[.)])\s*', '', line, flags=re.IGNORECASE).strip().strip('"')
+        if line.endswith('?') and len(line) > 15:
+            questions.append(line)
+    return questions
+
+def create_heygen_knowledge_base(candidate_name, position, resume_content, company, kb_questions=None):
     """Create HeyGen knowledge base with correct field names"""
     
     heygen_key = os.getenv('HEYGEN_API_KEY')
@@ -7572,8 +7599,11 @@ def create_heygen_knowledge_base(candidate_name, position, resume_content, compa
         logger.error("HEYGEN_API_KEY not set!")
         return None
     
-    # Extract skills for better questions
-    skills = extract_skills_from_resume(resume_content) if resume_content else []
+    if not kb_questions:
+        kb_questions = build_interview_kb_questions(candidate_name, position, company, resume_content)
+    questions_block = "\n\n".join(
+        f'Question {number}: "{item["question"]}"' for number, item in enumerate(kb_questions, 1)
+    )
     
     # Create a more HeyGen-friendly prompt format
     heygen_prompt = f"""You are an AI interviewer conducting a professional technical interview.
@@ -7588,25 +7618,7 @@ When the interview starts or when you hear "INIT_INTERVIEW", immediately greet t
 
 INTERVIEW QUESTIONS TO ASK IN ORDER:
 
-Question 1: "Hello {candidate_name}, welcome to your interview for the {position} position at {company}. Let's begin. Could you please introduce yourself and tell me about your professional background?"
-
-Question 2: {"I see from your resume that you have experience with " + skills[0] + ". Can you tell me about a specific project where you used this technology?" if skills else "Can you tell me about your most significant technical project and the technologies you used?"}
-
-Question 3: "Can you describe a time when you encountered a complex technical problem and walk me through how you approached and solved it?"
-
-Question 4: "Tell me about a time when you had to collaborate with team members on a challenging project. How did you handle any conflicts?"
-
-Question 5: "What would you say is your strongest technical skill, and can you give me a detailed example of how you've applied it?"
-
-Question 6: "Technology evolves rapidly. Can you tell me about a time when you had to quickly learn a new technology for a project?"
-
-Question 7: "Based on your understanding of this {position} role, how do you see your skills contributing to our team?"
-
-Question 8: "What do you think would be the biggest challenge for you in this role?"
-
-Question 9: "Where do you see your career heading in the next 3-5 years?"
-
-Question 10: "Do you have any questions for me about the role or {company}?"
+{questions_block}
 
 INSTRUCTIONS:
 - Ask ONE question at a time
@@ -7618,7 +7630,7 @@ INSTRUCTIONS:
     # HeyGen payload with CORRECT field names
     payload = {
         "name": f"Interview_{candidate_name.replace(' ', '_')}_{int(time.time())}",
-        "opening": f"Hello {candidate_name}, welcome to your interview for the {position} position at {company}. Let's begin. Could you please introduce yourself and tell me about your professional background?",
+        "opening": kb_questions[0]["question"],
         "prompt": heygen_prompt
     }
     
@@ -7719,9 +7731,6 @@ def complete_interview_by_token(token):
         result = completion_handler.complete_interview(token, trigger_source)
         
         if result["success"]:
-            # Clear cache to update frontend
-            cache.delete_memoized(get_cached_candidates)
-            
             return jsonify({
                 "success": True,
                 "message": "Interview completed and saved to database",
@@ -7901,8 +7910,8 @@ def fix_null_completions():
         rows_updated = result.rowcount
         session.commit()
         
-        # Clear all caches
-        cache.clear()
+        # Clear candidate caches
+        invalidate_all_candidates()
         
         return jsonify({
             "success": True,
@@ -7982,6 +7991,7 @@ def check_interview_completion(token):
             return jsonify({"error": "Interview not found"}), 404
         
         # Get Q&A data
+        materialize_interview_views(session, candidate)
         qa_pairs = json.loads(candidate.interview_qa_pairs or '[]')
         questions = json.loads(candidate.interview_questions_asked or '[]')
         answers = json.loads(candidate.interview_answers_given or '[]')
@@ -8030,6 +8040,7 @@ def fix_interview_by_token(token):
             return jsonify({"error": "Candidate not found"}), 404
         
         # Force complete if it has Q&A data but not marked complete
+        materialize_interview_views(session, candidate)
         qa_pairs = json.loads(candidate.interview_qa_pairs or '[]')
         
         if qa_pairs and not candidate.interview_completed_at:
@@ -8150,6 +8161,7 @@ def validate_interview_completion(token):
             return jsonify({"error": "Interview not found"}), 404
         
         # Force completion check
+        materialize_interview_views(session, candidate)
         qa_pairs = json.loads(candidate.interview_qa_pairs or '[]')
         questions = json.loads(candidate.interview_questions_asked or '[]')
         answers = json.loads(candidate.interview_answers_given or '[]')
@@ -8247,6 +8259,7 @@ def cleanup_incomplete_interviews():
         
         for candidate in incomplete:
             # Check if interview is actually complete based on other indicators
+            materialize_interview_views(session, candidate)
             qa_pairs = json.loads(candidate.interview_qa_pairs or '[]')
             
             # If they have Q&A data or have been inactive for over 2 hours
@@ -8284,73 +8297,94 @@ def cleanup_incomplete_interviews():
     finally:
         session.close()
 
-def interview_auto_recovery_system():
-    """Continuously monitor and fix incomplete interviews"""
-    while True:
-        time.sleep(120)  # Check every 2 minutes
+ACTIVE_INTERVIEW_COLUMNS = [
+    'id', 'name', 'job_id', 'interview_token', 'interview_started_at', 'interview_completed_at',
+    'interview_progress_percentage', 'interview_total_questions', 'interview_answered_questions',
+    'interview_last_activity', 'interview_qa_pairs', 'interview_questions_asked'
+]
+
+
+def load_active_interviews(session):
+    """Interviews that are not completed yet: started, or at 100% progress (shared per scheduler tick)"""
+    return session.query(Candidate).options(
+        load_only(*[getattr(Candidate, name) for name in ACTIVE_INTERVIEW_COLUMNS])
+    ).filter(
+        Candidate.interview_completed_at.is_(None),
+        or_(
+            Candidate.interview_started_at.isnot(None),
+            Candidate.interview_progress_percentage >= 100
+        )
+    ).all()
+
+
+scheduler.register_query('active_interviews', load_active_interviews)
+
+
+def interview_auto_recovery_system(ctx):
+    """Fix incomplete interviews (scheduled every 2 minutes on the background scheduler)"""
+    session = ctx.session
+    try:
+        now = datetime.now()
+        recovered = []
+        active = [c for c in ctx.query('active_interviews') if c.interview_completed_at is None]
         
-        session = SessionLocal()
-        try:
-            from datetime import datetime, timedelta
-            
-            # Find potentially stuck interviews
-            now = datetime.now()
-            
-            # Case 1: Started but not completed after 1 hour
-            one_hour_ago = now - timedelta(hours=1)
-            stuck_interviews = session.query(Candidate).filter(
-                Candidate.interview_started_at.isnot(None),
-                Candidate.interview_completed_at.is_(None),
-                Candidate.interview_started_at < one_hour_ago
-            ).all()
-            
-            for candidate in stuck_interviews:
-                # Check if has Q&A data
-                has_qa_data = False
+        # Case 1: Started but not completed after 1 hour
+        one_hour_ago = now - timedelta(hours=1)
+        stuck_interviews = [c for c in active
+                            if c.interview_started_at and c.interview_started_at < one_hour_ago]
+        
+        # Questions live in the event log; the legacy columns cover pre-event-log interviews
+        with_questions = candidates_with_questions(session, [c.id for c in stuck_interviews])
+        
+        for candidate in stuck_interviews:
+            # Check if has Q&A data
+            has_qa_data = candidate.id in with_questions
+            if not has_qa_data:
                 try:
                     qa_pairs = json.loads(candidate.interview_qa_pairs or '[]')
                     questions = json.loads(candidate.interview_questions_asked or '[]')
                     has_qa_data = len(qa_pairs) > 0 or len(questions) > 0
                 except:
                     pass
-                
-                if has_qa_data or (now - candidate.interview_started_at).total_seconds() > 7200:
-                    candidate.interview_completed_at = now
-                    candidate.interview_status = 'completed'
-                    candidate.interview_progress_percentage = 100
-                    candidate.final_status = 'Interview Completed - Auto Recovery'
-                    candidate.interview_ai_analysis_status = 'pending'
-                    
-                    if candidate.interview_started_at:
-                        duration = (now - candidate.interview_started_at).total_seconds()
-                        candidate.interview_duration = int(duration)
-                    
-                    logger.info(f"Auto-recovered interview for {candidate.name} (ID: {candidate.id})")
-            
-            # Case 2: Has 100% progress but no completion timestamp
-            incomplete_100 = session.query(Candidate).filter(
-                Candidate.interview_progress_percentage >= 100,
-                Candidate.interview_completed_at.is_(None)
-            ).all()
             
-            for candidate in incomplete_100:
+            if has_qa_data or (now - candidate.interview_started_at).total_seconds() > 7200:
+                if candidate.id in with_questions:
+                    materialize_interview_views(session, candidate)
                 candidate.interview_completed_at = now
                 candidate.interview_status = 'completed'
-                candidate.final_status = 'Interview Completed - Progress 100%'
+                candidate.interview_progress_percentage = 100
+                candidate.final_status = 'Interview Completed - Auto Recovery'
                 candidate.interview_ai_analysis_status = 'pending'
-                logger.info(f"Completed interview at 100% progress for {candidate.name}")
-            
-            session.commit()
-            
-            # Clear cache after updates
-            if stuck_interviews or incomplete_100:
-                cache.clear()
-            
-        except Exception as e:
-            logger.error(f"Auto-recovery error: {e}")
-            session.rollback()
-        finally:
-            session.close()
+                
+                if candidate.interview_started_at:
+                    duration = (now - candidate.interview_started_at).total_seconds()
+                    candidate.interview_duration = int(duration)
+                
+                recovered.append((candidate.id, candidate.job_id))
+                logger.info(f"Auto-recovered interview for {candidate.name} (ID: {candidate.id})")
+        
+        # Case 2: Has 100% progress but no completion timestamp
+        incomplete_100 = [c for c in active
+                          if c.interview_completed_at is None and (c.interview_progress_percentage or 0) >= 100]
+        
+        for candidate in incomplete_100:
+            candidate.interview_completed_at = now
+            candidate.interview_status = 'completed'
+            candidate.final_status = 'Interview Completed - Progress 100%'
+            candidate.interview_ai_analysis_status = 'pending'
+            recovered.append((candidate.id, candidate.job_id))
+            logger.info(f"Completed interview at 100% progress for {candidate.name}")
+        
+        session.commit()
+        
+        # Drop cached views for the recovered candidates only
+        for candidate_id, job_id in recovered:
+            invalidate_candidate(candidate_id, job_id)
+            interview_analysis_service.notify_interview_completed(candidate_id)
+        
+    except Exception as e:
+        logger.error(f"Auto-recovery error: {e}")
+        session.rollback()
 
 @app.route('/api/interview/debug-status', methods=['GET'])
 def debug_interview_status():
@@ -8375,6 +8409,7 @@ def debug_interview_status():
         }
         
         for candidate in all_interviews:
+            materialize_interview_views(session, candidate)
             qa_pairs = json.loads(candidate.interview_qa_pairs or '[]')
             
             status = "unknown"
@@ -8427,6 +8462,7 @@ def fix_incomplete_interviews():
         
         for candidate in candidates:
             # Check if they have Q&A data
+            materialize_interview_views(session, candidate)
             qa_pairs = json.loads(candidate.interview_qa_pairs or '[]')
             questions_asked = json.loads(candidate.interview_questions_asked or '[]')
             answers_given = json.loads(candidate.interview_answers_given or '[]')
@@ -8456,7 +8492,7 @@ def fix_incomplete_interviews():
                 logger.info(f"Fixed and triggered analysis for {candidate.name} (ID: {candidate.id})")
         
         # Clear cache
-        cache.delete_memoized(get_cached_candidates)
+        invalidate_all_candidates()
         
         return jsonify({
             "success": True,
@@ -8522,6 +8558,7 @@ def get_interview_qa_data(candidate_id):
             return jsonify({"error": "Candidate not found"}), 404
         
         # Parse all Q&A data
+        materialize_interview_views(session, candidate)
         questions = json.loads(candidate.interview_questions_asked or '[]')
         answers = json.loads(candidate.interview_answers_given or '[]')
         qa_pairs = json.loads(getattr(candidate, 'interview_qa_pairs', '[]'))
@@ -8722,65 +8759,55 @@ def track_speech_segment():
         if not session_id:
             return jsonify({"error": "session_id required"}), 400
         
-        session = SessionLocal()
-        try:
-            # Find candidate
-            candidate = session.query(Candidate).filter_by(
-                interview_session_id=session_id
-            ).first()
-            
-            if not candidate:
-                # Try alternate lookup
-                parts = session_id.split('_')
-                if len(parts) >= 2 and parts[1].isdigit():
-                    candidate = session.query(Candidate).filter_by(id=int(parts[1])).first()
-            
-            if not candidate:
-                return jsonify({"error": "Session not found"}), 404
-            
-            # Parse existing speech data
-            speech_segments = json.loads(getattr(candidate, 'interview_speech_segments', '[]'))
-            
-            # Add new segment
-            segment_data = {
-                'id': f"seg_{len(speech_segments)}_{int(time.time())}",
-                'text': segment.get('text', ''),
-                'confidence': segment.get('confidence', 0),
-                'is_final': segment.get('is_final', False),
-                'timestamp': segment.get('timestamp', datetime.now().isoformat()),
-                'duration_ms': segment.get('duration', 0)
-            }
-            
-            speech_segments.append(segment_data)
-            
-            # Store segments
-            if hasattr(candidate, 'interview_speech_segments'):
-                candidate.interview_speech_segments = json.dumps(speech_segments)
-            
-            # Update transcript
-            if segment.get('is_final'):
-                transcript = candidate.interview_transcript or ""
-                transcript += f"\n[Candidate]: {segment.get('text', '')}\n"
-                candidate.interview_transcript = transcript
-            
-            # Update last activity
-            candidate.interview_last_activity = datetime.now()
-            
-            session.commit()
-            
-            return jsonify({
-                "success": True,
-                "segment_id": segment_data['id'],
-                "total_segments": len(speech_segments)
-            }), 200
-            
-        finally:
-            session.close()
+        # Session lookups are cached; segments are buffered and written in batches
+        if resolve_candidate_id(session_id) is None:
+            return jsonify({"error": "Session not found"}), 404
+        
+        result = speech_buffer.add(session_id, [segment])
+        
+        return jsonify({
+            "success": True,
+            "segment_id": result['segment_ids'][0],
+            "total_segments": result['total_segments']
+        }), 200
             
     except Exception as e:
         logger.error(f"Speech tracking error: {e}")
         return jsonify({"error": str(e)}), 500
 
+@app.route('/api/interview/speech/track-batch', methods=['POST', 'OPTIONS'])
+@cross_origin()
+def track_speech_segments_batch():
+    """Track many speech recognition segments in one request"""
+    if request.method == 'OPTIONS':
+        return '', 200
+    
+    try:
+        data = request.json or {}
+        session_id = data.get('session_id')
+        segments = data.get('segments', [])
+        
+        if not session_id:
+            return jsonify({"error": "session_id required"}), 400
+        if not isinstance(segments, list) or not segments:
+            return jsonify({"error": "segments must be a non-empty list"}), 400
+        
+        if resolve_candidate_id(session_id) is None:
+            return jsonify({"error": "Session not found"}), 404
+        
+        result = speech_buffer.add(session_id, segments)
+        
+        return jsonify({
+            "success": True,
+            "segment_ids": result['segment_ids'],
+            "total_segments": result['total_segments'],
+            "flushed": result['flushed']
+        }), 200
+        
+    except Exception as e:
+        logger.error(f"Batch speech tracking error: {e}")
+        return jsonify({"error": str(e)}), 500
+
 @app.route('/api/interview/speech/complete-utterance', methods=['POST', 'OPTIONS'])
 @cross_origin()
 def track_complete_utterance():
@@ -8795,30 +8822,23 @@ def track_complete_utterance():
         
         session = SessionLocal()
         try:
-            candidate = session.query(Candidate).filter_by(
-                interview_session_id=session_id
-            ).first()
+            candidate = resolve_candidate(session, session_id)
             
             if not candidate:
                 return jsonify({"error": "Session not found"}), 404
             
-            # Find the current unanswered question
-            qa_pairs = json.loads(candidate.interview_qa_pairs or '[]')
-            
-            for qa in reversed(qa_pairs):
-                if qa.get('question') and not qa.get('answer'):
-                    # Found unanswered question - add answer
-                    qa['answer'] = utterance.get('text', '')
-                    qa['answer_confidence'] = utterance.get('confidence', 0)
-                    qa['answer_timestamp'] = utterance.get('timestamp')
-                    qa['answer_duration_ms'] = utterance.get('duration')
-                    break
-            
-            # Update database
-            candidate.interview_qa_pairs = json.dumps(qa_pairs)
+            # Record the answer; it fills the most recent unanswered question on materialization
+            append_event(session, candidate.id, session_id, ANSWER, utterance.get('text', ''),
+                         source=SOURCE_UTTERANCE, metadata={
+                             'confidence': utterance.get('confidence', 0),
+                             'timestamp': utterance.get('timestamp'),
+                             'duration': utterance.get('duration')
+                         })
             
             # Update answer count
-            answered = sum(1 for qa in qa_pairs if qa.get('answer'))
+            answered = candidate.interview_answered_questions or 0
+            if answered < (candidate.interview_total_questions or 0):
+                answered += 1
             candidate.interview_answered_questions = answered
             
             # Update progress
@@ -8862,6 +8882,7 @@ def migrate_qa_data():
             changes = []
             
             # Parse existing data
+            materialize_interview_views(session, candidate)
             qa_pairs = json.loads(candidate.interview_qa_pairs or '[]')
             questions = json.loads(candidate.interview_questions_asked or '[]')
             answers = json.loads(candidate.interview_answers_given or '[]')
@@ -8932,7 +8953,7 @@ def migrate_qa_data():
         session.commit()
         
         # Clear cache
-        cache.clear()
+        invalidate_all_candidates()
         
         return jsonify({
             'success': True,
@@ -8965,13 +8986,8 @@ def run_bulk_scraping_with_monitoring():
             )
             return
         
-        # Run the async scraping function
-        loop = asyncio.new_event_loop()
-        asyncio.set_event_loop(loop)
-        try:
-            results_summary = loop.run_until_complete(scrape_all_pending_assessments())
-        finally:
-            loop.close()
+        # Run on the shared browser pool so the warm browser and saved login are reused
+        results_summary = browser_sessions.run(scrape_all_pending_assessments())
         
         duration = time.time() - start_time
         total_candidates = sum(results_summary.values()) if isinstance(results_summary, dict) else 0
@@ -9262,6 +9278,9 @@ class InterviewCompletionHandler:
                         "completed_at": candidate.interview_completed_at.isoformat()
                     }
                 
+                # Persist the Q&A views built from the event log
+                materialize_interview_views(session, candidate)
+                
                 # Set completion fields
                 completion_time = datetime.now(timezone.utc)
                 candidate.interview_completed_at = completion_time
@@ -9296,14 +9315,13 @@ class InterviewCompletionHandler:
                 
                 # Verify the update worked
                 session.refresh(candidate)
+                invalidate_session(candidate.interview_session_id, candidate.id)
+                invalidate_candidate(candidate.id, candidate.job_id)
                 if candidate.interview_completed_at:
                     logger.info(f"Interview completed successfully for {candidate.name} at {completion_time}")
                     
-                    # Trigger AI scoring in background
-                    try:
-                        executor.submit(trigger_auto_scoring, candidate.id)
-                    except Exception as e:
-                        logger.error(f"Failed to trigger scoring: {e}")
+                    # Hand the interview straight to the analysis service
+                    interview_analysis_service.notify_interview_completed(candidate.id)
                     
                     return {
                         "success": True,
@@ -9343,6 +9361,7 @@ class InterviewCompletionHandler:
                         session.commit()
                         
                         if result.rowcount > 0:
+                            invalidate_all_candidates()
                             logger.info(f"Completed via direct SQL for token {token}")
                             return {"success": True, "method": "direct_sql"}
                     except Exception as sql_error:
@@ -9369,52 +9388,33 @@ class AutomaticCompletionMonitor:
     def __init__(self):
         self.is_running = False
         self.check_interval = 30  # seconds
-        self.thread = None
     
     def start(self):
         if self.is_running:
             return
         self.is_running = True
-        self.thread = threading.Thread(target=self._monitor_loop, daemon=True)
-        self.thread.start()
+        scheduler.register('interview_completion', self._check_all_interviews, interval=self.check_interval)
+        scheduler.start()
         logger.info("Automatic completion monitor started")
     
     def stop(self):
         self.is_running = False
-        if self.thread:
-            self.thread.join(timeout=5)
-    
-    def _monitor_loop(self):
-        while self.is_running:
-            try:
-                self._check_all_interviews()
-                time.sleep(self.check_interval)
-            except Exception as e:
-                logger.error(f"Monitor error: {e}")
-                time.sleep(10)
+        scheduler.unregister('interview_completion')
     
-    def _check_all_interviews(self):
+    def _check_all_interviews(self, ctx):
         """Check all active interviews for completion conditions"""
-        session = SessionLocal()
-        try:
-            # Find all active interviews
-            active_interviews = session.query(Candidate).filter(
-                Candidate.interview_started_at.isnot(None),
-                Candidate.interview_completed_at.is_(None)
-            ).all()
-            
-            for candidate in active_interviews:
-                if self._should_complete(candidate):
-                    logger.info(f"Auto-completing interview for {candidate.name}")
-                    completion_handler.complete_interview(
-                        candidate.interview_token,
-                        "automatic_condition_met"
-                    )
-            
-        except Exception as e:
-            logger.error(f"Error checking interviews: {e}")
-        finally:
-            session.close()
+        for candidate in ctx.query('active_interviews'):
+            if candidate.interview_completed_at is not None or not candidate.interview_started_at:
+                continue
+            if self._should_complete(candidate):
+                logger.info(f"Auto-completing interview for {candidate.name}")
+                result = completion_handler.complete_interview(
+                    candidate.interview_token,
+                    "automatic_condition_met"
+                )
+                if result.get("success"):
+                    # Keep later jobs on this tick from acting on the stale snapshot
+                    ctx.session.expire(candidate)
     
     def _should_complete(self, candidate) -> bool:
         """Check if interview should be completed"""
@@ -9450,23 +9450,22 @@ class AutomaticCompletionMonitor:
 # Create global instance
 completion_monitor = AutomaticCompletionMonitor()
 
-def process_pending_analyses():
-    """Process any pending interview analyses"""
+def process_pending_analyses(ctx=None):
+    """Hand completed interviews without scores to the analysis service queue"""
     session = SessionLocal()
     try:
         # Find all completed interviews without scores
-        pending = session.query(Candidate).filter(
+        pending_ids = [row.id for row in session.query(Candidate.id).filter(
             Candidate.interview_completed_at.isnot(None),
             Candidate.interview_ai_score.is_(None),
             Candidate.interview_ai_analysis_status != 'processing'
-        ).all()
+        ).all()]
         
-        logger.info(f"Found {len(pending)} pending interview analyses")
+        logger.info(f"Found {len(pending_ids)} pending interview analyses")
         
-        for candidate in pending:
-            logger.info(f"Processing pending analysis for candidate {candidate.id}")
-            trigger_auto_scoring(candidate.id)
-            time.sleep(1)  # Small delay between processing
+        # The queue skips candidates that are already queued or finished
+        for candidate_id in pending_ids:
+            interview_analysis_service.queue_analysis(candidate_id)
             
     except Exception as e:
         logger.error(f"Error processing pending analyses: {e}")
@@ -9476,16 +9475,8 @@ def process_pending_analyses():
 # Add scheduled task to check every 5 minutes
 def start_analysis_monitor():
     """Start monitoring for pending analyses"""
-    def monitor():
-        while True:
-            time.sleep(300)  # Check every 5 minutes
-            try:
-                process_pending_analyses()
-            except Exception as e:
-                logger.error(f"Analysis monitor error: {e}")
-    
-    thread = threading.Thread(target=monitor, daemon=True)
-    thread.start()
+    scheduler.register('pending_analyses', process_pending_analyses, interval=300)
+    scheduler.start()
 
 # Configure Flask-Mail
 app.config['MAIL_SERVER'] = os.getenv('MAIL_SERVER', 'smtp.gmail.com')
@@ -9537,8 +9528,7 @@ if __name__ == "__main__":
             start_interview_automation()
             print("Interview automation running (checking every 30 minutes)")
 
-            recovery_thread = threading.Thread(target=interview_auto_recovery_system, daemon=True)
-            recovery_thread.start()
+            scheduler.register('interview_recovery', interview_auto_recovery_system, interval=120)
             logger.info("Interview auto-recovery system started")
             
             completion_monitor.start()
@@ -9558,4 +9548,5 @@ if __name__ == "__main__":
     finally:
         print("Shutting down interview automation...")
         stop_interview_automation()
-        completion_monitor.stop()
\ No newline at end of file
+        completion_monitor.stop()
+        scheduler.stop()
\ No newline at end of file
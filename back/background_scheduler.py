@@ -0,0 +1,241 @@
+# background_scheduler.py - Single cooperative scheduler for the backend's periodic monitors
+
+import os
+import time
+import random
+import logging
+import threading
+from datetime import datetime
+from typing import Any, Callable, Dict, Optional
+
+from db import SessionLocal
+
+logger = logging.getLogger(__name__)
+
+
+class TickContext:
+    """
+    Per-tick state handed to every job that runs on the tick. Registered
+    queries are loaded at most once per tick into a shared DB session, so jobs
+    scanning the same rows share one query. The session is closed when the
+    tick ends.
+    """
+
+    def __init__(self, scheduler: 'BackgroundScheduler'):
+        self._scheduler = scheduler
+        self._session = None
+        self._results: Dict[str, Any] = {}
+
+    @property
+    def session(self):
+        if self._session is None:
+            self._session = SessionLocal()
+        return self._session
+
+    def query(self, name: str):
+        if name not in self._results:
+            self._results[name] = self._scheduler._load_query(name, self.session)
+        return self._results[name]
+
+    def close(self):
+        if self._session is not None:
+            self._session.close()
+            self._session = None
+
+
+class ScheduledJob:
+    def __init__(self, name: str, func: Callable[[TickContext], Any], interval: float, next_run: float,
+                 own_thread: bool = False):
+        self.name = name
+        self.func = func
+        self.interval = interval
+        self.next_run = next_run
+        self.own_thread = own_thread
+        self.thread: Optional[threading.Thread] = None
+        self.runs = 0
+        self.failures = 0
+        self.total_duration = 0.0
+        self.max_duration = 0.0
+        self.last_duration = 0.0
+        self.last_run_at: Optional[datetime] = None
+        self.last_error: Optional[str] = None
+
+    def stats(self) -> Dict:
+        return {
+            'interval_seconds': self.interval,
+            'own_thread': self.own_thread,
+            'running': bool(self.thread and self.thread.is_alive()),
+            'runs': self.runs,
+            'failures': self.failures,
+            'last_run_at': self.last_run_at.isoformat() if self.last_run_at else None,
+            'last_duration_ms': round(self.last_duration * 1000, 1),
+            'avg_duration_ms': round(self.total_duration / self.runs * 1000, 1) if self.runs else 0,
+            'max_duration_ms': round(self.max_duration * 1000, 1),
+            'last_error': self.last_error
+        }
+
+
+class BackgroundScheduler:
+    """
+    Runs registered jobs on one daemon thread. The thread wakes every
+    tick_interval seconds (with +/- jitter so several backend processes do
+    not scan in lockstep) and runs every job that is due, one after another.
+    Jobs whose intervals are multiples of the tick land on the same ticks and
+    share the tick's queries. Jobs doing slow external I/O are registered
+    with own_thread=True: they run on a worker thread with their own
+    TickContext so they do not hold up the tick, and a run is skipped while
+    the previous one is still going.
+    """
+
+    def __init__(self, tick_interval: float = 30, jitter: float = 0.1):
+        self.tick_interval = tick_interval
+        self.jitter = jitter
+        self._jobs: Dict[str, ScheduledJob] = {}
+        self._queries: Dict[str, Callable] = {}
+        self._query_stats: Dict[str, Dict] = {}
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+        self._thread = None
+        self.is_running = False
+        self.ticks = 0
+        self.last_tick_duration = 0.0
+
+    def register(self, name: str, func: Callable[[TickContext], Any], interval: float,
+                 run_immediately: bool = False, own_thread: bool = False):
+        """Run func(ctx) every `interval` seconds (rounded to scheduler ticks); re-registering replaces the job"""
+        now = time.monotonic()
+        with self._lock:
+            self._jobs[name] = ScheduledJob(name, func, interval, now if run_immediately else now + interval,
+                                            own_thread=own_thread)
+        if run_immediately:
+            self._wake.set()
+        logger.info(f"Scheduled background job '{name}' every {interval}s")
+
+    def unregister(self, name: str):
+        with self._lock:
+            self._jobs.pop(name, None)
+
+    def is_registered(self, name: str) -> bool:
+        with self._lock:
+            return name in self._jobs
+
+    def register_query(self, name: str, loader: Callable):
+        """Register a shared query: loader(session) runs at most once per tick via ctx.query(name)"""
+        with self._lock:
+            self._queries[name] = loader
+            self._query_stats.setdefault(name, {'loads': 0, 'last_rows': 0, 'last_duration_ms': 0})
+
+    def _load_query(self, name: str, session):
+        started = time.monotonic()
+        result = self._queries[name](session)
+        with self._lock:
+            stats = self._query_stats[name]
+            stats['loads'] += 1
+            stats['last_rows'] = len(result) if hasattr(result, '__len__') else None
+            stats['last_duration_ms'] = round((time.monotonic() - started) * 1000, 1)
+        return result
+
+    def start(self):
+        with self._lock:
+            if self.is_running:
+                return
+            self.is_running = True
+            self._wake.clear()
+            self._thread = threading.Thread(target=self._run_loop, name="BackgroundScheduler", daemon=True)
+            self._thread.start()
+        logger.info(f"Background scheduler started (tick {self.tick_interval}s)")
+
+    def stop(self):
+        self.is_running = False
+        self._wake.set()
+        if self._thread:
+            self._thread.join(timeout=5)
+
+    def _run_loop(self):
+        while self.is_running:
+            started = time.monotonic()
+            try:
+                self._run_due_jobs(started)
+            except Exception as e:
+                logger.error(f"Background scheduler tick failed: {e}", exc_info=True)
+            self.last_tick_duration = time.monotonic() - started
+            self.ticks += 1
+
+            delay = self.tick_interval * (1 + random.uniform(-self.jitter, self.jitter))
+            self._wake.wait(max(0.0, delay - self.last_tick_duration))
+            self._wake.clear()
+
+    def _run_due_jobs(self, now: float):
+        # Half a tick of slack so jittered ticks do not push jobs to the following tick
+        horizon = now + self.tick_interval / 2
+        with self._lock:
+            due = [job for job in self._jobs.values() if job.next_run <= horizon]
+        if not due:
+            return
+
+        for job in due:
+            if job.own_thread:
+                self._start_job_thread(job)
+                job.next_run = now + job.interval
+
+        ctx = TickContext(self)
+        try:
+            for job in sorted((j for j in due if not j.own_thread), key=lambda j: j.interval):
+                if not self.is_running:
+                    break
+                self._run_job(job, ctx)
+                # Scheduled from the tick start so equal-period jobs stay aligned
+                job.next_run = now + job.interval
+        finally:
+            ctx.close()
+
+    def _start_job_thread(self, job: ScheduledJob):
+        if job.thread and job.thread.is_alive():
+            logger.warning(f"Background job '{job.name}' is still running; skipping this run")
+            return
+
+        def run():
+            ctx = TickContext(self)
+            try:
+                self._run_job(job, ctx)
+            finally:
+                ctx.close()
+
+        job.thread = threading.Thread(target=run, name=f"BackgroundJob-{job.name}", daemon=True)
+        job.thread.start()
+
+    def _run_job(self, job: ScheduledJob, ctx: TickContext):
+        job.last_run_at = datetime.now()
+        started = time.monotonic()
+        try:
+            job.func(ctx)
+            job.last_error = None
+        except Exception as e:
+            job.failures += 1
+            job.last_error = str(e)
+            logger.error(f"Background job '{job.name}' failed: {e}", exc_info=True)
+            if ctx._session is not None:
+                ctx._session.rollback()
+        finally:
+            duration = time.monotonic() - started
+            job.runs += 1
+            job.last_duration = duration
+            job.total_duration += duration
+            job.max_duration = max(job.max_duration, duration)
+
+    def get_stats(self) -> Dict:
+        with self._lock:
+            return {
+                'is_running': self.is_running,
+                'tick_interval': self.tick_interval,
+                'ticks': self.ticks,
+                'last_tick_duration_ms': round(self.last_tick_duration * 1000, 1),
+                'jobs': {name: job.stats() for name, job in self._jobs.items()},
+                'queries': {name: dict(stats) for name, stats in self._query_stats.items()}
+            }
+
+
+scheduler = BackgroundScheduler(
+    tick_interval=float(os.getenv('SCHEDULER_TICK_SECONDS', '30')),
+    jitter=float(os.getenv('SCHEDULER_JITTER', '0.1'))
+)
@@ -0,0 +1,304 @@
+# bamboohr_api.py - Applicant-tracking REST client for listing applicants and downloading resumes
+
+import os
+import re
+import json
+import hashlib
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from datetime import datetime
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Tuple
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+logger = logging.getLogger(__name__)
+
+API_BASE = "https://api.bamboohr.com/api/gateway.php/{subdomain}/v1"
+
+# Applicants whose resume could not be fetched are retried this many runs, then skipped until they change
+MAX_RESUME_ATTEMPTS = 3
+
+
+def sanitize_filename(name: str) -> str:
+    """Same rules as scraper.sanitize_filename so API and browser downloads share file names."""
+    sanitized = re.sub(r'[<>:"/\\|?*]', '_', name)
+    sanitized = re.sub(r'\s+', '_', sanitized.strip())
+    return sanitized[:50]
+
+
+def application_fingerprint(application: Dict) -> str:
+    """Hash of an application's list entry; changes when its status or applicant details change."""
+    return hashlib.sha1(json.dumps(application, sort_keys=True, default=str).encode('utf-8')).hexdigest()
+
+
+def is_current(known: Optional[Dict], fingerprint: Optional[str] = None) -> bool:
+    """True if a previously seen applicant needs no new download (fingerprint is None when unknown, e.g. DOM scrape)."""
+    if not known:
+        return False
+    if fingerprint is not None and known.get('fingerprint') != fingerprint:
+        return False
+    return bool(known.get('downloaded')) or known.get('attempts', 0) >= MAX_RESUME_ATTEMPTS
+
+
+class BambooHRApplicantClient:
+    """
+    Lists a job's applications and downloads their resumes through the
+    BambooHR applicant-tracking API, so the scraper only needs the browser
+    for what the API cannot provide.
+
+    Requests share one pooled requests.Session (retrying 429/5xx with
+    backoff). Application listing pages are revalidated with ETag /
+    Last-Modified and a 304 reuses the cached JSON body. Only the pages from
+    each job's latest listing are kept; application details and files are not
+    cached, since unchanged applicants are skipped via the job metadata.
+    """
+
+    def __init__(self, max_workers: int = 8, cache_path: Optional[str] = None, timeout: float = 30):
+        self.max_workers = max_workers
+        self.timeout = timeout
+        self.cache_path = Path(cache_path) if cache_path else None
+        self._cache: Optional[Dict[str, Dict]] = None
+        self._cache_lock = threading.Lock()
+        self._session: Optional[requests.Session] = None
+        self._session_lock = threading.Lock()
+
+    @property
+    def api_key(self) -> Optional[str]:
+        return os.getenv("BAMBOOHR_API_KEY")
+
+    @property
+    def subdomain(self) -> Optional[str]:
+        return os.getenv("BAMBOOHR_SUBDOMAIN")
+
+    @property
+    def configured(self) -> bool:
+        return bool(self.api_key and self.subdomain)
+
+    @property
+    def session(self) -> requests.Session:
+        with self._session_lock:
+            if self._session is None:
+                session = requests.Session()
+                retry = Retry(total=3, backoff_factor=0.5, status_forcelist=[429, 500, 502, 503, 504],
+                              allowed_methods=["GET"], respect_retry_after_header=True)
+                adapter = HTTPAdapter(pool_connections=2, pool_maxsize=self.max_workers, max_retries=retry)
+                session.mount("https://", adapter)
+                session.auth = (self.api_key, "x")
+                session.headers.update({"Accept": "application/json"})
+                self._session = session
+            return self._session
+
+    def _url(self, path: str) -> str:
+        return f"{API_BASE.format(subdomain=self.subdomain)}/{path.lstrip('/')}"
+
+    # ---- conditional GET cache ----------------------------------------------
+
+    def _load_cache(self) -> Dict[str, Dict]:
+        with self._cache_lock:
+            if self._cache is None:
+                self._cache = {}
+                if self.cache_path and self.cache_path.exists():
+                    try:
+                        cache = json.loads(self.cache_path.read_text(encoding='utf-8'))
+                        # Entries without a job were written by older versions (details, files)
+                        self._cache = {url: entry for url, entry in cache.items() if entry.get('job_id')}
+                    except (OSError, ValueError, AttributeError) as e:
+                        logger.warning(f"Ignoring unreadable BambooHR API cache: {e}")
+            return self._cache
+
+    def _save_cache(self):
+        if not self.cache_path:
+            return
+        with self._cache_lock:
+            try:
+                self.cache_path.parent.mkdir(parents=True, exist_ok=True)
+                tmp_path = self.cache_path.with_suffix('.tmp')
+                tmp_path.write_text(json.dumps(self._cache), encoding='utf-8')
+                os.replace(tmp_path, self.cache_path)
+            except OSError as e:
+                logger.warning(f"Could not write BambooHR API cache: {e}")
+
+    def _conditional_headers(self, url: str) -> Dict[str, str]:
+        entry = self._load_cache().get(url) or {}
+        headers = {}
+        if entry.get('etag'):
+            headers['If-None-Match'] = entry['etag']
+        if entry.get('last_modified'):
+            headers['If-Modified-Since'] = entry['last_modified']
+        return headers
+
+    def _remember(self, url: str, response: requests.Response, **values):
+        if not (response.headers.get('ETag') or response.headers.get('Last-Modified')):
+            return
+        with self._cache_lock:
+            self._cache[url] = {
+                'etag': response.headers.get('ETag'),
+                'last_modified': response.headers.get('Last-Modified'),
+                **values
+            }
+
+    def _prune_job_cache(self, job_id: str, keep_urls: set):
+        """Drop cached listing pages of the job that the latest listing no longer requested"""
+        cache = self._load_cache()
+        with self._cache_lock:
+            for url in [url for url, entry in cache.items()
+                        if entry.get('job_id') == job_id and url not in keep_urls]:
+                del cache[url]
+
+    def _prepared_url(self, path: str, params: Optional[Dict] = None) -> str:
+        return requests.Request('GET', self._url(path), params=params).prepare().url
+
+    def get_json(self, path: str, params: Optional[Dict] = None, cache_job_id: Optional[str] = None):
+        """GET a JSON resource; with cache_job_id the response is revalidated and cached under that job"""
+        url = self._prepared_url(path, params)
+        headers = self._conditional_headers(url) if cache_job_id else {}
+        response = self.session.get(url, headers=headers, timeout=self.timeout)
+        if response.status_code == 304:
+            return self._cache[url]['body']
+        response.raise_for_status()
+        body = response.json()
+        if cache_job_id:
+            self._remember(url, response, body=body, job_id=cache_job_id)
+        return body
+
+    # ---- endpoints ----------------------------------------------------------
+
+    def list_applications(self, job_id: str, since: Optional[datetime] = None) -> List[Dict]:
+        """Every application for the job (only those newer than `since` if given), following pagination"""
+        applications = []
+        page_urls = set()
+        page = 1
+        params = {"jobId": job_id}
+        if since:
+            params["newSince"] = since.strftime("%Y-%m-%d %H:%M:%S")
+        while True:
+            page_params = {**params, "page": page}
+            page_urls.add(self._prepared_url("applicant_tracking/applications", page_params))
+            data = self.get_json("applicant_tracking/applications", page_params, cache_job_id=str(job_id))
+            applications.extend(data.get("applications", []))
+            if data.get("paginationComplete", True) or not data.get("applications"):
+                self._prune_job_cache(str(job_id), page_urls)
+                return applications
+            page += 1
+
+    def get_application(self, application_id) -> Dict:
+        return self.get_json(f"applicant_tracking/applications/{application_id}")
+
+    def download_file(self, file_id, output_stem: Path) -> Optional[Path]:
+        """Download a file to output_stem + its extension"""
+        url = self._url(f"files/{file_id}")
+        with self.session.get(url, headers={'Accept': '*/*'}, timeout=self.timeout, stream=True) as response:
+            response.raise_for_status()
+
+            disposition = response.headers.get('Content-Disposition', '')
+            match = re.search(r'filename="?([^";]+)"?', disposition)
+            extension = Path(match.group(1)).suffix.lower() if match else ''
+            output_path = output_stem.with_name(output_stem.name + (extension or '.pdf'))
+            output_path.parent.mkdir(parents=True, exist_ok=True)
+            with open(output_path, 'wb') as f:
+                for chunk in response.iter_content(chunk_size=65536):
+                    f.write(chunk)
+
+        return output_path
+
+    # ---- job resumes --------------------------------------------------------
+
+    def _fetch_resume(self, job_id: str, application: Dict, download_dir: str, min_size: int,
+                      known: Optional[Dict] = None) -> Tuple[Dict, bool]:
+        applicant = application.get("applicant") or {}
+        candidate = {
+            "id": str(application["id"]),
+            "name": f"{applicant.get('firstName', '')} {applicant.get('lastName', '')}".strip() or str(application["id"]),
+            "email": applicant.get("email"),
+            "applied_at": application.get("appliedDate"),
+            "fingerprint": application_fingerprint(application),
+            "source": "api",
+            "downloaded": False
+        }
+        try:
+            details = self.get_application(application["id"])
+            file_id = details.get("resumeFileId")
+            if not file_id:
+                logger.info(f"      No resume attached via API for {candidate['name']}")
+                return candidate, False
+            candidate["resume_file_id"] = file_id
+
+            # Application changed but the resume did not: keep the file we already have
+            if known and known.get("resume_file_id") == file_id and os.path.exists(known.get("resume_path") or ""):
+                candidate["resume_path"] = known["resume_path"]
+                candidate["downloaded"] = True
+                return candidate, True
+
+            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+            stem = Path(download_dir) / f"job_{job_id}_{candidate['id']}_{sanitize_filename(candidate['name'])}_{timestamp}"
+            output_path = self.download_file(file_id, stem)
+            size = output_path.stat().st_size
+            if size < min_size:
+                logger.warning(f"      ⚠️  Small file ({size} bytes) for {candidate['name']}")
+            candidate["resume_path"] = str(output_path)
+            candidate["downloaded"] = True
+            return candidate, True
+        except Exception as e:
+            logger.warning(f"      API resume download failed for {candidate['name']}: {e}")
+            return candidate, False
+
+    def fetch_job_resumes(self, job_id: str, download_dir: str, min_size: int = 0,
+                          progress_callback: Optional[Callable[[int, int, Dict, bool], None]] = None,
+                          known: Optional[Dict[str, Dict]] = None, since: Optional[datetime] = None
+                          ) -> Optional[Tuple[List[Dict], List[Dict], List[str]]]:
+        """
+        List the job's applications and download new or changed resumes in
+        parallel. `known` maps application id -> entry from the previous run;
+        applicants that are unchanged and already downloaded are skipped.
+        Returns (candidates, failed, unchanged_ids) or None if the listing
+        itself failed, in which case the caller should fall back to the browser.
+        """
+        if not self.configured:
+            return None
+        try:
+            applications = self.list_applications(job_id, since)
+        except Exception as e:
+            logger.warning(f"BambooHR applications API unavailable for job {job_id}: {e}")
+            return None
+
+        known = known or {}
+        pending, unchanged = [], []
+        for application in applications:
+            application_id = str(application["id"])
+            if is_current(known.get(application_id), application_fingerprint(application)):
+                unchanged.append(application_id)
+            else:
+                pending.append(application)
+
+        total = len(pending)
+        logger.info(f"📥 API: {len(applications)} applications for job {job_id}, {len(unchanged)} unchanged, "
+                    f"downloading {total} resumes with {self.max_workers} workers...")
+        candidates, failed = [], []
+        with ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="bamboohr-api") as executor:
+            futures = [executor.submit(self._fetch_resume, job_id, application, download_dir, min_size,
+                                       known.get(str(application["id"])))
+                       for application in pending]
+            for done, future in enumerate(as_completed(futures), 1):
+                candidate, success = future.result()
+                candidates.append(candidate)
+                if not success:
+                    failed.append(candidate)
+                logger.info(f"[{done}/{total}] {'✅' if success else '❌'} {candidate['name']} ({candidate['id']})")
+                if progress_callback:
+                    try:
+                        progress_callback(done, total, candidate, success)
+                    except Exception as e:
+                        logger.debug(f"Progress callback failed: {e}")
+
+        self._save_cache()
+        return candidates, failed, unchanged
+
+
+applicant_api = BambooHRApplicantClient(
+    max_workers=int(os.getenv('BAMBOOHR_API_WORKERS', '8')),
+    cache_path=os.getenv('BAMBOOHR_API_CACHE', os.path.join(os.path.dirname(os.path.abspath(__file__)), 'bamboohr_cache', 'http_cache.json'))
+)
@@ -0,0 +1,186 @@
+# benchmark_interview_indexes.py - Query plans and timings for the background interview queries
+#
+# Seeds a scratch SQLite database, then runs every background monitor query
+# with and without INTERVIEW_LIFECYCLE_INDEXES and prints the plan and median
+# time of each. Exits non-zero if any query still scans the whole table.
+#
+#   python benchmark_interview_indexes.py --rows 50000
+#   python benchmark_interview_indexes.py --database-url postgresql://...   # plans only, existing data
+
+import os
+import sys
+import random
+import argparse
+import statistics
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+from sqlalchemy import create_engine, or_, select, text
+
+from db import Base, Candidate, INTERVIEW_LIFECYCLE_INDEXES
+
+
+def background_queries(now: datetime):
+    """The monitor/dashboard queries the lifecycle indexes are meant to serve"""
+    one_hour_ago = now - timedelta(hours=1)
+    return {
+        # background scheduler 'active_interviews' (completion monitor + auto-recovery)
+        'active_interviews': select(Candidate.id).where(
+            Candidate.interview_completed_at.is_(None),
+            or_(Candidate.interview_started_at.isnot(None),
+                Candidate.interview_progress_percentage >= 100)
+        ),
+        # check_and_update_expired_interviews
+        'expired_interviews': select(Candidate.id).where(
+            Candidate.interview_expires_at < now,
+            Candidate.interview_completed_at.is_(None),
+            Candidate.interview_status != 'expired'
+        ),
+        'abandoned_interviews': select(Candidate.id).where(
+            Candidate.interview_started_at.isnot(None),
+            Candidate.interview_completed_at.is_(None),
+            Candidate.interview_last_activity < now - timedelta(hours=2),
+            Candidate.interview_status != 'abandoned'
+        ),
+        # ProductionInterviewAnalysisService._check_pending_interviews
+        'analysis_reconcile': select(Candidate.id).where(
+            Candidate.interview_completed_at.isnot(None),
+            Candidate.interview_ai_analysis_status.is_(None) |
+            Candidate.interview_ai_analysis_status.in_(['pending', 'retry']),
+            Candidate.interview_auto_score_triggered == False
+        ).limit(10),
+        # ProductionInterviewAnalysisService._check_stale_analyses
+        'stale_analyses': select(Candidate.id).where(
+            Candidate.interview_ai_analysis_status == 'processing',
+            Candidate.interview_analysis_started_at < one_hour_ago
+        ),
+        # process_pending_analyses
+        'unscored_interviews': select(Candidate.id).where(
+            Candidate.interview_completed_at.isnot(None),
+            Candidate.interview_ai_score.is_(None),
+            Candidate.interview_ai_analysis_status != 'processing'
+        ),
+        'token_lookup': select(Candidate.id).where(Candidate.interview_token == 'token-42'),
+        'session_lookup': select(Candidate.id).where(Candidate.interview_session_id == 'session-42'),
+    }
+
+
+def seed(engine, rows: int):
+    """Mostly finished interviews with a small open/unprocessed tail, like production"""
+    now = datetime.now()
+    batch = []
+    for i in range(rows):
+        finished = random.random() < 0.95
+        started = now - timedelta(hours=random.uniform(0, 2000)) if random.random() < 0.9 else None
+        scored = finished and random.random() < 0.98
+        batch.append({
+            'job_id': f"job-{i % 50}",
+            'job_title': 'Engineer',
+            'name': f"Candidate {i}",
+            'email': f"candidate{i}@example.com",
+            'processed_date': now,
+            'interview_token': f"token-{i}",
+            'interview_session_id': f"session-{i}",
+            'interview_started_at': started,
+            'interview_last_activity': started,
+            'interview_completed_at': (started or now) if finished else None,
+            'interview_expires_at': now + timedelta(days=random.randint(-90, 7)),
+            'interview_progress_percentage': 100.0 if finished else random.uniform(0, 100),
+            'interview_status': 'completed' if finished else 'in_progress',
+            'interview_ai_analysis_status': 'completed' if scored else random.choice([None, 'pending', 'processing', 'failed']),
+            'interview_auto_score_triggered': finished,
+            'interview_analysis_started_at': started,
+            'interview_ai_score': 60.0 if scored else None,
+        })
+        if len(batch) == 5000:
+            with engine.begin() as conn:
+                conn.execute(Candidate.__table__.insert(), batch)
+            batch = []
+    if batch:
+        with engine.begin() as conn:
+            conn.execute(Candidate.__table__.insert(), batch)
+
+
+def explain(conn, query) -> str:
+    compiled = query.compile(conn.engine, compile_kwargs={'render_postcompile': True})
+    params = compiled.params
+    if conn.dialect.name == 'sqlite':
+        args = tuple(params[name] for name in compiled.positiontup)
+        rows = conn.exec_driver_sql(f"EXPLAIN QUERY PLAN {compiled}", args).fetchall()
+        return '; '.join(row[-1] for row in rows)
+    return '; '.join(row[0] for row in conn.execute(text(f"EXPLAIN {compiled}"), params))
+
+
+def is_full_scan(plan: str) -> bool:
+    # SQLite: "SCAN candidates" without an index; PostgreSQL: "Seq Scan on candidates"
+    return plan.strip() == 'SCAN candidates' or 'Seq Scan on candidates' in plan
+
+
+def time_query(conn, query, repeat: int) -> float:
+    samples = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        conn.execute(query).fetchall()
+        samples.append(time.perf_counter() - started)
+    return statistics.median(samples) * 1000
+
+
+def measure(engine, repeat: int):
+    results = {}
+    with engine.connect() as conn:
+        for name, query in background_queries(datetime.now()).items():
+            results[name] = (explain(conn, query), time_query(conn, query, repeat))
+    return results
+
+
+def analyze(engine):
+    with engine.begin() as conn:
+        conn.exec_driver_sql('ANALYZE')
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Background interview query plans with and without the lifecycle indexes')
+    parser.add_argument('--rows', type=int, default=50000, help='candidates to seed in the scratch database')
+    parser.add_argument('--repeat', type=int, default=5, help='timed runs per query')
+    parser.add_argument('--database-url', help='inspect plans on an existing database instead (no seeding)')
+    args = parser.parse_args()
+
+    if args.database_url:
+        engine = create_engine(args.database_url)
+        after = measure(engine, args.repeat)
+        before = None
+    else:
+        path = os.path.join(tempfile.mkdtemp(), 'index_benchmark.db')
+        engine = create_engine(f"sqlite:///{path}")
+        Base.metadata.create_all(engine)
+        print(f"Seeding {args.rows} candidates into {path} ...")
+        seed(engine, args.rows)
+
+        for index in INTERVIEW_LIFECYCLE_INDEXES:
+            index.drop(engine, checkfirst=True)
+        analyze(engine)
+        before = measure(engine, args.repeat)
+
+        for index in INTERVIEW_LIFECYCLE_INDEXES:
+            index.create(engine)
+        analyze(engine)
+        after = measure(engine, args.repeat)
+
+    full_scans = []
+    for name, (plan, elapsed) in after.items():
+        print(f"\n{name}")
+        if before:
+            print(f"  before: {before[name][1]:8.2f} ms  {before[name][0]}")
+        print(f"  after:  {elapsed:8.2f} ms  {plan}")
+        if is_full_scan(plan):
+            full_scans.append(name)
+
+    if full_scans:
+        print(f"\nFull table scans remaining: {', '.join(full_scans)}")
+        sys.exit(1)
+    print("\nAll background queries use an index")
+
+
+if __name__ == "__main__":
+    main()
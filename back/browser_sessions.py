@@ -0,0 +1,300 @@
+# browser_sessions.py - Warm shared Chromium pool and persisted login state for the Playwright scrapers
+
+import os
+import sys
+import json
+import time
+import atexit
+import asyncio
+import logging
+import threading
+import functools
+from concurrent.futures import TimeoutError as FutureTimeoutError
+from contextlib import asynccontextmanager
+from pathlib import Path
+from typing import Awaitable, Callable, Dict, Optional
+from urllib.parse import urlparse
+
+from playwright.async_api import async_playwright, Browser, BrowserContext
+
+logger = logging.getLogger(__name__)
+
+TESTLIFY_DOMAIN = "https://app.testlify.com"
+
+BROWSER_ARGS = [
+    '--no-sandbox',
+    '--disable-setuid-sandbox',
+    '--disable-dev-shm-usage',
+    '--disable-blink-features=AutomationControlled'
+]
+
+SessionValidator = Callable[[BrowserContext], Awaitable[bool]]
+
+
+async def run_blocking(func, *args, **kwargs):
+    """Run a blocking call (sync HTTP client, console prompt) in the default executor instead of on the loop"""
+    return await asyncio.get_running_loop().run_in_executor(None, functools.partial(func, *args, **kwargs))
+
+
+async def ainput(prompt: str = "") -> str:
+    """input() that does not block the event loop; returns '' without prompting when stdin is not a terminal"""
+    if not (sys.stdin and sys.stdin.isatty()):
+        logger.info(f"Non-interactive run, skipping prompt: {prompt.strip()}")
+        return ""
+    return await run_blocking(input, prompt)
+
+
+def _domain_key(domain: str) -> str:
+    """'https://greenoceanpm.bamboohr.com' -> 'greenoceanpm.bamboohr.com'"""
+    return urlparse(domain).netloc or domain
+
+
+class BrowserSessionManager:
+    """
+    Keeps one warm Chromium per headless mode on a long-lived event loop
+    thread and persists each domain's storage_state (cookies + local storage)
+    to disk after login. Scrapers open a fresh context per run that is
+    pre-loaded with the saved state, so back-to-back runs skip login.
+
+    Playwright objects belong to the loop that created them, so the pool is
+    only used by coroutines run through run(). Coroutines awaited on any
+    other loop (e.g. a CLI's asyncio.run) get a one-off browser but still
+    reuse the saved login.
+    """
+
+    def __init__(self, state_dir: str, state_max_age: float = 12 * 3600, idle_timeout: float = 600,
+                 run_timeout: Optional[float] = 1800):
+        self.state_dir = Path(state_dir)
+        self.state_max_age = state_max_age
+        self.idle_timeout = idle_timeout
+        self.run_timeout = run_timeout
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._thread: Optional[threading.Thread] = None
+        self._thread_lock = threading.Lock()
+        self._launch_lock: Optional[asyncio.Lock] = None
+        self._playwright = None
+        self._browsers: Dict[bool, Browser] = {}
+        self._open_contexts = 0
+        self._idle_handle = None
+        self._authenticated = set()
+        self.stats = {
+            'browser_launches': 0,
+            'browser_reuses': 0,
+            'state_restored': 0,
+            'state_rejected': 0,
+            'state_saved': 0
+        }
+        atexit.register(self.shutdown)
+
+    # ---- event loop ---------------------------------------------------------
+
+    def _ensure_loop(self) -> asyncio.AbstractEventLoop:
+        with self._thread_lock:
+            if self._loop is None or not self._thread.is_alive():
+                self._loop = asyncio.new_event_loop()
+                self._launch_lock = None
+                self._thread = threading.Thread(target=self._loop.run_forever, name="BrowserSessionLoop", daemon=True)
+                self._thread.start()
+            return self._loop
+
+    def run(self, coro, timeout: Optional[float] = None):
+        """
+        Run a scraper coroutine on the pool's loop from synchronous code and
+        return its result. After `timeout` (default run_timeout) seconds the
+        coroutine is cancelled and TimeoutError raised.
+        """
+        if threading.current_thread() is self._thread:
+            raise RuntimeError("browser_sessions.run() called from the browser loop; await the coroutine instead")
+        loop = self._ensure_loop()
+        future = asyncio.run_coroutine_threadsafe(coro, loop)
+        try:
+            return future.result(timeout if timeout is not None else self.run_timeout)
+        except FutureTimeoutError:
+            future.cancel()
+            raise TimeoutError(f"Browser task did not finish within {timeout or self.run_timeout}s")
+
+    def _on_pool_loop(self) -> bool:
+        try:
+            return asyncio.get_running_loop() is self._loop
+        except RuntimeError:
+            return False
+
+    # ---- warm browsers ------------------------------------------------------
+
+    async def _get_browser(self, headless: bool) -> Browser:
+        if self._launch_lock is None:
+            self._launch_lock = asyncio.Lock()
+        async with self._launch_lock:
+            browser = self._browsers.get(headless)
+            if browser and browser.is_connected():
+                self.stats['browser_reuses'] += 1
+                return browser
+            if self._playwright is None:
+                self._playwright = await async_playwright().start()
+            browser = await self._playwright.chromium.launch(headless=headless, args=BROWSER_ARGS)
+            self._browsers[headless] = browser
+            self.stats['browser_launches'] += 1
+            logger.info(f"Launched shared Chromium (headless={headless})")
+            return browser
+
+    def _context_opened(self):
+        self._open_contexts += 1
+        if self._idle_handle:
+            self._idle_handle.cancel()
+            self._idle_handle = None
+
+    def _context_closed(self):
+        self._open_contexts -= 1
+        if self._open_contexts == 0 and self.idle_timeout > 0:
+            self._idle_handle = self._loop.call_later(
+                self.idle_timeout, lambda: asyncio.ensure_future(self._close_browsers()))
+
+    async def _close_browsers(self, force: bool = False):
+        if self._open_contexts and not force:
+            return
+        for browser in list(self._browsers.values()):
+            try:
+                await browser.close()
+            except Exception:
+                pass
+        self._browsers.clear()
+        if self._playwright is not None:
+            try:
+                await self._playwright.stop()
+            except Exception:
+                pass
+            self._playwright = None
+        logger.info("Closed shared Chromium pool")
+
+    def shutdown(self):
+        """Close the warm browsers and stop the loop thread"""
+        if self._loop is None or not self._thread or not self._thread.is_alive():
+            return
+        try:
+            asyncio.run_coroutine_threadsafe(self._close_browsers(force=True), self._loop).result(10)
+        except Exception as e:
+            logger.debug(f"Browser pool shutdown: {e}")
+        self._loop.call_soon_threadsafe(self._loop.stop)
+
+    # ---- persisted login state ----------------------------------------------
+
+    def state_path(self, domain: str) -> Path:
+        return self.state_dir / f"{_domain_key(domain)}.json"
+
+    def load_state(self, domain: str) -> Optional[Dict]:
+        """Saved storage_state for the domain if it is recent and still holds unexpired cookies"""
+        path = self.state_path(domain)
+        try:
+            if time.time() - path.stat().st_mtime > self.state_max_age:
+                return None
+            state = json.loads(path.read_text(encoding='utf-8'))
+        except (OSError, ValueError):
+            return None
+
+        now = time.time()
+        state['cookies'] = [c for c in state.get('cookies', [])
+                            if c.get('expires', -1) == -1 or c['expires'] > now]
+        return state if state['cookies'] else None
+
+    async def save_state(self, context: BrowserContext, domain: str):
+        """Persist the context's authenticated state; call after a successful login"""
+        self._authenticated.add(id(context))
+        try:
+            state = await context.storage_state()
+            self.state_dir.mkdir(parents=True, exist_ok=True)
+            path = self.state_path(domain)
+            tmp_path = path.with_suffix('.tmp')
+            tmp_path.write_text(json.dumps(state), encoding='utf-8')
+            os.chmod(tmp_path, 0o600)  # session cookies
+            os.replace(tmp_path, path)
+            self.stats['state_saved'] += 1
+            logger.info(f"Saved browser session for {_domain_key(domain)}")
+        except Exception as e:
+            logger.warning(f"Could not save browser session for {_domain_key(domain)}: {e}")
+
+    def invalidate(self, domain: str):
+        try:
+            self.state_path(domain).unlink()
+        except OSError:
+            pass
+
+    # ---- contexts -----------------------------------------------------------
+
+    @asynccontextmanager
+    async def session(self, domain: str, headless: bool = False,
+                      validate: Optional[SessionValidator] = None, **context_kwargs):
+        """
+        Yield (context, logged_in) for the domain. logged_in is True when the
+        saved state was restored and passed validate(context); otherwise the
+        caller logs in and calls save_state(). The context is closed on exit
+        and the refreshed state saved if the session was authenticated.
+        """
+        if not self._on_pool_loop():
+            async with async_playwright() as playwright:
+                browser = await playwright.chromium.launch(headless=headless, args=BROWSER_ARGS)
+                try:
+                    async with self._context(browser, domain, validate, context_kwargs) as result:
+                        yield result
+                finally:
+                    await browser.close()
+            return
+
+        browser = await self._get_browser(headless)
+        self._context_opened()
+        try:
+            async with self._context(browser, domain, validate, context_kwargs) as result:
+                yield result
+        finally:
+            self._context_closed()
+
+    @asynccontextmanager
+    async def _context(self, browser: Browser, domain: str, validate: Optional[SessionValidator], context_kwargs: Dict):
+        state = self.load_state(domain)
+        context = await browser.new_context(storage_state=state, **context_kwargs)
+        logged_in = False
+        if state:
+            logged_in = await self._validate(context, validate)
+            if logged_in:
+                self.stats['state_restored'] += 1
+                logger.info(f"Reusing saved browser session for {_domain_key(domain)}")
+            else:
+                self.stats['state_rejected'] += 1
+                logger.info(f"Saved browser session for {_domain_key(domain)} is no longer valid")
+                await context.clear_cookies()
+                self.invalidate(domain)
+        try:
+            yield context, logged_in
+        finally:
+            if logged_in or id(context) in self._authenticated:
+                await self.save_state(context, domain)  # keep rotated cookies
+            self._authenticated.discard(id(context))
+            try:
+                await context.close()
+            except Exception:
+                pass
+
+    async def _validate(self, context: BrowserContext, validate: Optional[SessionValidator]) -> bool:
+        if validate is None:
+            return True  # cookie expiry check in load_state is the only validation
+        try:
+            return bool(await validate(context))
+        except Exception as e:
+            logger.debug(f"Session validation failed: {e}")
+            return False
+
+    def get_stats(self) -> Dict:
+        return {
+            'browsers': {('headless' if headless else 'headed'): browser.is_connected()
+                         for headless, browser in self._browsers.items()},
+            'open_contexts': self._open_contexts,
+            'saved_sessions': sorted(p.stem for p in self.state_dir.glob('*.json')) if self.state_dir.exists() else [],
+            **self.stats
+        }
+
+
+browser_sessions = BrowserSessionManager(
+    state_dir=os.getenv('BROWSER_STATE_DIR', os.path.join(os.path.dirname(os.path.abspath(__file__)), 'browser_state')),
+    state_max_age=float(os.getenv('BROWSER_STATE_MAX_AGE_HOURS', '12')) * 3600,
+    idle_timeout=float(os.getenv('BROWSER_POOL_IDLE_SECONDS', '600')),
+    run_timeout=float(os.getenv('BROWSER_RUN_TIMEOUT_SECONDS', '1800')) or None
+)
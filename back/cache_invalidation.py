@@ -0,0 +1,127 @@
+# cache_invalidation.py - Keyed cache invalidation with per-job / per-candidate tags
+
+import logging
+from typing import Callable, Dict, List
+
+logger = logging.getLogger(__name__)
+
+# Tags
+TAG_CANDIDATES = 'candidates'      # any candidate list spanning all jobs
+TAG_CANDIDATES_EPOCH = 'candidates_epoch'  # every candidate list, job-scoped or not
+TAG_JOBS = 'jobs'                  # job listings (candidate counts per job)
+TAG_INTERVIEW_RESULTS = 'interview_results'
+
+_cache = None
+_candidate_views: List[Callable] = []          # memoized functions keyed by candidate_id
+_tag_views: Dict[str, List[Callable]] = {}     # memoized functions dropped wholesale per tag
+
+
+def bind_cache(cache):
+    """Attach the Flask-Caching instance (called once by the backend)"""
+    global _cache
+    _cache = cache
+
+
+def register_candidate_view(func):
+    """Register a memoized function whose first argument is a candidate_id"""
+    _candidate_views.append(func)
+    return func
+
+
+def register_tag_view(tag: str, func):
+    """Register a memoized function to be dropped whenever `tag` is invalidated"""
+    _tag_views.setdefault(tag, []).append(func)
+    return func
+
+
+def job_tag(job_id) -> str:
+    return f"job:{job_id}"
+
+
+def candidate_tag(candidate_id) -> str:
+    return f"candidate:{candidate_id}"
+
+
+def _version_key(tag: str) -> str:
+    return f"cache_version:{tag}"
+
+
+def get_version(*tags) -> str:
+    """Combined version string for the given tags, used as part of cache keys"""
+    if _cache is None:
+        return '0'
+    parts = []
+    for tag in tags:
+        try:
+            parts.append(str(_cache.get(_version_key(tag)) or 0))
+        except Exception as e:
+            logger.warning(f"Cache version lookup failed for {tag}: {e}")
+            parts.append('0')
+    return '.'.join(parts)
+
+
+def candidates_version(job_id=None) -> str:
+    """Version for a candidate listing, scoped to one job or to all jobs"""
+    if job_id:
+        return get_version(TAG_CANDIDATES_EPOCH, job_tag(job_id))
+    return get_version(TAG_CANDIDATES_EPOCH, TAG_CANDIDATES)
+
+
+def _bump(tag: str):
+    # Concurrent bumps may collapse into one increment; either way the version changes
+    key = _version_key(tag)
+    try:
+        _cache.set(key, (_cache.get(key) or 0) + 1, timeout=0)
+    except Exception as e:
+        logger.warning(f"Cache version bump failed for {tag}: {e}")
+
+
+def _drop_tag_views(tag: str):
+    for func in _tag_views.get(tag, []):
+        try:
+            _cache.delete_memoized(func)
+        except Exception as e:
+            logger.warning(f"Failed to drop cached {func.__name__}: {e}")
+
+
+def invalidate_candidate(candidate_id: int, job_id=None):
+    """
+    Drop cached views that contain this candidate. Without job_id the affected
+    job listing is unknown, so every candidate listing is refreshed.
+    """
+    if _cache is None:
+        return
+    _bump(candidate_tag(candidate_id))
+    _bump(TAG_CANDIDATES)
+    if job_id:
+        _bump(job_tag(job_id))
+    else:
+        _bump(TAG_CANDIDATES_EPOCH)
+    for func in _candidate_views:
+        try:
+            _cache.delete_memoized(func, candidate_id)
+        except Exception as e:
+            logger.warning(f"Failed to drop cached {func.__name__} for candidate {candidate_id}: {e}")
+    _drop_tag_views(TAG_INTERVIEW_RESULTS)
+
+
+def invalidate_job(job_id, candidates_changed: bool = False):
+    """
+    Drop cached views for one job. Pass candidates_changed=True when candidates
+    were added or removed so job listings (applicant counts) refresh too.
+    """
+    if _cache is None:
+        return
+    _bump(job_tag(job_id))
+    _bump(TAG_CANDIDATES)
+    _drop_tag_views(TAG_INTERVIEW_RESULTS)
+    if candidates_changed:
+        _drop_tag_views(TAG_JOBS)
+
+
+def invalidate_all_candidates():
+    """Drop every candidate listing (bulk fixes touching many jobs)"""
+    if _cache is None:
+        return
+    _bump(TAG_CANDIDATES_EPOCH)
+    _drop_tag_views(TAG_INTERVIEW_RESULTS)
@@ -2,15 +2,14 @@ import os
 import re
 import json
 # import openai
-import docx2txt
-import PyPDF2
 import smtplib
 import logging
 from langchain_openai import ChatOpenAI
 import shutil
 from email.mime.text import MIMEText
 from datetime import datetime, timedelta
-from concurrent.futures import ThreadPoolExecutor
+from concurrent.futures import ThreadPoolExecutor, as_completed
+import threading
 import time
 from dotenv import load_dotenv
 from typing import Dict, List, Optional
@@ -18,6 +17,8 @@ from langchain_openai import ChatOpenAI
 
 # === DB Imports (make sure your db.py has Candidate, SessionLocal) ===
 from db import Candidate, SessionLocal
+from resume_text_extractor import resume_extractor
+from llm_result_cache import get_cached_result, store_result, make_cache_key, sha256_text, sha256_json
 
 # LangChain, LangGraph imports
 from langchain_core.messages import AIMessage
@@ -68,6 +69,15 @@ def get_all_candidates_from_db() -> list:
     session.close()
     return data
 
+def get_processed_resume_names() -> set:
+    """Filenames of every resume already stored, loaded with a single column query"""
+    session = SessionLocal()
+    try:
+        rows = session.query(Candidate.resume_path).filter(Candidate.resume_path.isnot(None)).all()
+        return {os.path.basename(path) for (path,) in rows if path}
+    finally:
+        session.close()
+
 def save_candidate_to_db(candidate_info: dict):
     session = SessionLocal()
     try:
@@ -87,14 +97,21 @@ def save_candidate_to_db(candidate_info: dict):
                     setattr(cand, k, v)
         print(">>> About to commit candidate:", cand)
         session.commit()
+        return True
     except Exception as e:
         print(f"❌ DB error for {candidate_info.get('email')}: {str(e)}")
         session.rollback()
+        return False
     finally:
         session.close()
 
 
-def get_llm(temperature=0, model="gpt-4o"):
+# Bump a prompt version whenever its prompt changes so cached results are not reused
+LLM_MODEL = "gpt-4o"
+SCREENING_PROMPT_VERSION = "1"
+FEEDBACK_PROMPT_VERSION = "1"
+
+def get_llm(temperature=0, model=LLM_MODEL):
     return ChatOpenAI(
         temperature=temperature,
         model=model,
@@ -102,25 +119,8 @@ def get_llm(temperature=0, model="gpt-4o"):
     )
 
 def extract_text_from_resume(resume_path: str) -> str:
-    try:
-        if resume_path.lower().endswith('.pdf'):
-            with open(resume_path, 'rb') as file:
-                pdf_reader = PyPDF2.PdfReader(file)
-                text = ""
-                for page in pdf_reader.pages:
-                    text += page.extract_text()
-                return text
-        elif resume_path.lower().endswith('.docx'):
-            return docx2txt.process(resume_path)
-        elif resume_path.lower().endswith('.txt'):
-            with open(resume_path, 'r', encoding='utf-8') as file:
-                return file.read()
-        else:
-            logger.warning(f"Unsupported file format for {resume_path}")
-            return ""
-    except Exception as e:
-        logger.error(f"Error extracting text from {resume_path}: {str(e)}")
-        return ""
+    """Resume text via the shared extractor (process pool + on-disk text cache)"""
+    return resume_extractor.extract(resume_path)
 
 def send_email_notification(candidate_info: Dict, is_shortlisted: bool, resume_score: Optional[float] = None,
                             feedback: Optional[str] = None) -> bool:
@@ -216,6 +216,15 @@ def get_env_int(key, default):
     except ValueError:
         return default
 
+# Shared budget for concurrent LLM calls across all scoring workers
+LLM_MAX_CONCURRENCY = get_env_int("LLM_MAX_CONCURRENCY", 4)
+_llm_semaphore = threading.BoundedSemaphore(LLM_MAX_CONCURRENCY)
+
+def invoke_llm(chain, inputs):
+    """Invoke an LLM chain, waiting for a free slot in the concurrency budget"""
+    with _llm_semaphore:
+        return chain.invoke(inputs)
+
 # === PYDANTIC MODELS (Define these FIRST) ===
 class CandidateInfo(BaseModel):
     name: str = Field(default="Unknown Candidate")
@@ -249,118 +258,96 @@ class RecruitmentState(BaseModel):
     feedback: str = Field(default="")
     testlify_link: str = Field(default="")
 
-def resume_parser(state: RecruitmentState) -> RecruitmentState:
-    logger.info("Resume Parser Agent: Extracting candidate information...")
-    print("📄 Resume Parser Agent: Extracting candidate information...")
+class ResumeScreening(BaseModel):
+    """Structured output of the combined extraction + scoring call"""
+    name: str = Field(default="Unknown Candidate", description="Candidate full name")
+    email: str = Field(default="", description="Candidate email address")
+    linkedin: str = Field(default="", description="LinkedIn profile URL")
+    github: str = Field(default="", description="GitHub profile URL")
+    score: float = Field(default=50, description="ATS score between 0 and 100")
+    reasoning: str = Field(default="", description="Detailed explanation of the score")
+    matched_skills: List[str] = Field(default_factory=list, description="Required skills found in the resume")
+    missing_skills: List[str] = Field(default_factory=list, description="Required skills not clearly demonstrated")
+
+def default_skills_for_title(job_title: str):
+    """Fallback (required, preferred, experience_years) based on the job title"""
+    job_title_lower = (job_title or "").lower()
+    experience_years = 2 if "junior" in job_title_lower else 3
+
+    if "ai" in job_title_lower or "machine learning" in job_title_lower or "ml" in job_title_lower:
+        return (['Python', 'Machine Learning', 'Data Science', 'TensorFlow/PyTorch', 'Statistics'],
+                ['Deep Learning', 'NLP', 'Computer Vision', 'MLOps', 'Cloud Platforms'], experience_years)
+    if "data scientist" in job_title_lower:
+        return (['Python', 'Statistics', 'Machine Learning', 'SQL', 'Data Analysis'],
+                ['R', 'Tableau', 'Big Data', 'Spark', 'Deep Learning'], experience_years)
+    if "backend" in job_title_lower:
+        return (['Python/Java/Node.js', 'REST APIs', 'Databases', 'Cloud Services', 'Git'],
+                ['Docker', 'Kubernetes', 'Microservices', 'CI/CD', 'GraphQL'], experience_years)
+    if "frontend" in job_title_lower:
+        return (['JavaScript', 'React/Vue/Angular', 'HTML/CSS', 'Responsive Design', 'Git'],
+                ['TypeScript', 'Testing', 'Performance Optimization', 'State Management', 'Build Tools'], experience_years)
+    if "full stack" in job_title_lower:
+        return (['JavaScript', 'Python/Node.js', 'Databases', 'React/Vue', 'APIs'],
+                ['Cloud Platforms', 'Docker', 'TypeScript', 'DevOps', 'Testing'], experience_years)
+    # Generic technical position
+    return (['Programming', 'Problem Solving', 'Software Development', 'Version Control', 'Team Collaboration'],
+            ['Agile/Scrum', 'Cloud Technologies', 'Testing', 'Documentation', 'Communication'], experience_years)
+
+def ensure_job_requirements(job_requirements: JobRequirements) -> JobRequirements:
+    """
+    Fill in missing required/preferred skills once per job: derived from the job
+    description by the LLM, else defaults for the job title. No-op when skills are set.
+    """
+    if job_requirements.required_skills:
+        return job_requirements
+
+    print("⚠️ No job requirements found, creating them automatically...")
+    if job_requirements.description and job_requirements.title:
+        try:
+            prompt = ChatPromptTemplate.from_messages([
+                ("system", """You are an expert job requirements analyzer. Extract required and preferred skills from the job description.
+                Return as JSON with 'required_skills' (list of 4-6 most important skills) and 'preferred_skills' (list of 3-5 nice-to-have skills).
+                Focus on technical skills, programming languages, frameworks, and tools."""), 
+                ("human", "Job Title: {title}\nJob Description: {desc}")
+            ])
+            parser = JsonOutputParser()
+            skill_chain = prompt | get_llm() | parser
+            skills_result = invoke_llm(skill_chain, {
+                "title": job_requirements.title,
+                "desc": job_requirements.description
+            })
+            job_requirements.required_skills = skills_result.get("required_skills", [])[:6]
+            job_requirements.preferred_skills = skills_result.get("preferred_skills", [])[:5]
+            print(f"✅ Extracted {len(job_requirements.required_skills)} required skills from job description")
+        except Exception as e:
+            print(f"⚠️ Could not extract skills from description: {e}")
+
+    if not job_requirements.required_skills:
+        print("📋 Using default skills based on job title...")
+        required, preferred, experience_years = default_skills_for_title(job_requirements.title)
+        job_requirements.required_skills = required
+        job_requirements.preferred_skills = preferred
+        if not job_requirements.experience_years:
+            job_requirements.experience_years = experience_years
+        print(f"✅ Set default requirements for '{job_requirements.title or 'Technical Position'}'")
+
+    return job_requirements
+
+def resume_screener(state: RecruitmentState) -> RecruitmentState:
+    """Extract contact details and ATS-score the resume in a single LLM call"""
+    logger.info("Resume Screener Agent: Extracting candidate information and calculating ATS score...")
+    print("🔍 Resume Screener Agent: Extracting candidate information and scoring...")
     if not state.resume_text:
         raise ValueError("Resume text not provided in state")
-    prompt = ChatPromptTemplate.from_messages([
-        ("system", """You are an expert resume parser AI. Extract name, email, linkedin, github."""),
-        ("human", "Resume text: {resume_text}\n\nExtract info as JSON: name, email, linkedin, github.")
-    ])
-    parser = JsonOutputParser()
-    parsing_chain = prompt | get_llm() | parser
-    try:
-        result = parsing_chain.invoke({"resume_text": state.resume_text[:4000]})
-        extracted_email = result.get("email", "")
-        if extracted_email:
-            extracted_email = extracted_email.replace(" ", "").strip().lower()
-        state.candidate.name = result.get("name", "Unknown Candidate")
-        state.candidate.email = extracted_email
-        state.candidate.linkedin = result.get("linkedin", "")
-        state.candidate.github = result.get("github", "")
-        state.candidate.job_title = state.job_requirements.title
-        state.candidate.testlify_link = state.testlify_link
-        state.candidate.assessment_invite_link = state.testlify_link
-        return state
-    except Exception as e:
-        logger.error(f"Error in resume parser agent: {str(e)}")
-        print(f"❌ Error in resume parser: {str(e)}")
-        return state
-def ats_scorer(state: RecruitmentState) -> RecruitmentState:
-    """Dynamic ATS scorer with automatic job requirements handling"""
-    logger.info("ATS Scorer Agent: Calculating ATS score...")
-    print("🔍 ATS Scorer Agent: Calculating ATS score...")
-
-    # Debug output
-    print(f"ATS Scorer DEBUG - Job ID: {state.job_requirements.job_id}")
-    print(f"ATS Scorer DEBUG - Job Title: {state.job_requirements.title}")
-    print(f"ATS Scorer DEBUG - Job Desc: {state.job_requirements.description}")
-    print(f"ATS Scorer DEBUG - Required Skills: {state.job_requirements.required_skills}")
-
-    # If job requirements are missing, create them automatically
-    if not state.job_requirements.required_skills or len(state.job_requirements.required_skills) == 0:
-        print("⚠️ No job requirements found, creating them automatically...")
-
-        # Extract required skills from the job description using AI model
-        if state.job_requirements.description and state.job_requirements.title:
-            try:
-                prompt = ChatPromptTemplate.from_messages([
-                    ("system", """You are an expert job requirements analyzer. Extract required and preferred skills from the job description.
-                    Return as JSON with 'required_skills' (list of 4-6 most important skills) and 'preferred_skills' (list of 3-5 nice-to-have skills).
-                    Focus on technical skills, programming languages, frameworks, and tools."""), 
-                    ("human", "Job Title: {title}\nJob Description: {desc}")
-                ])
-                parser = JsonOutputParser()
-                skill_chain = prompt | get_llm() | parser
-                skills_result = skill_chain.invoke({
-                    "title": state.job_requirements.title,
-                    "desc": state.job_requirements.description
-                })
-
-                state.job_requirements.required_skills = skills_result.get("required_skills", [])[:6]
-                state.job_requirements.preferred_skills = skills_result.get("preferred_skills", [])[:5]
-                print(f"✅ Extracted {len(state.job_requirements.required_skills)} required skills from job description")
-            except Exception as e:
-                print(f"⚠️ Could not extract skills from description: {e}")
-
-        # If still no skills, use defaults based on job title (fallback mechanism)
-        if not state.job_requirements.required_skills:
-            print("📋 Using default skills based on job title...")
-
-            job_title_lower = (state.job_requirements.title or "").lower()
-
-            # Default skills based on job title
-            if "ai" in job_title_lower or "machine learning" in job_title_lower or "ml" in job_title_lower:
-                state.job_requirements.required_skills = ['Python', 'Machine Learning', 'Data Science', 'TensorFlow/PyTorch', 'Statistics']
-                state.job_requirements.preferred_skills = ['Deep Learning', 'NLP', 'Computer Vision', 'MLOps', 'Cloud Platforms']
-            elif "data scientist" in job_title_lower:
-                state.job_requirements.required_skills = ['Python', 'Statistics', 'Machine Learning', 'SQL', 'Data Analysis']
-                state.job_requirements.preferred_skills = ['R', 'Tableau', 'Big Data', 'Spark', 'Deep Learning']
-            elif "backend" in job_title_lower:
-                state.job_requirements.required_skills = ['Python/Java/Node.js', 'REST APIs', 'Databases', 'Cloud Services', 'Git']
-                state.job_requirements.preferred_skills = ['Docker', 'Kubernetes', 'Microservices', 'CI/CD', 'GraphQL']
-            elif "frontend" in job_title_lower:
-                state.job_requirements.required_skills = ['JavaScript', 'React/Vue/Angular', 'HTML/CSS', 'Responsive Design', 'Git']
-                state.job_requirements.preferred_skills = ['TypeScript', 'Testing', 'Performance Optimization', 'State Management', 'Build Tools']
-            elif "full stack" in job_title_lower:
-                state.job_requirements.required_skills = ['JavaScript', 'Python/Node.js', 'Databases', 'React/Vue', 'APIs']
-                state.job_requirements.preferred_skills = ['Cloud Platforms', 'Docker', 'TypeScript', 'DevOps', 'Testing']
-            else:
-                # Generic technical position
-                state.job_requirements.required_skills = ['Programming', 'Problem Solving', 'Software Development', 'Version Control', 'Team Collaboration']
-                state.job_requirements.preferred_skills = ['Agile/Scrum', 'Cloud Technologies', 'Testing', 'Documentation', 'Communication']
-
-            if not state.job_requirements.experience_years:
-                state.job_requirements.experience_years = 2 if "junior" in job_title_lower else 3
-
-            print(f"✅ Set default requirements for '{state.job_requirements.title or 'Technical Position'}'")
 
+    # Normally already derived once per job by the caller
+    ensure_job_requirements(state.job_requirements)
 
-    # FINAL SAFETY: If still no required_skills, set to generic fallback
-    if not state.job_requirements.required_skills:
-        print("⚠️ Fallback: Setting generic required skills to avoid ValueError.")
-        state.job_requirements.required_skills = ['Programming', 'Problem Solving', 'Software Development']
-        state.job_requirements.preferred_skills = ['Communication']
-        if not state.job_requirements.experience_years:
-            state.job_requirements.experience_years = 2
-
-    # Now continue with scoring - requirements are guaranteed to exist
-    required_skills = ", ".join(state.job_requirements.required_skills)
-    preferred_skills = ", ".join(state.job_requirements.preferred_skills)
-
+    parser = JsonOutputParser(pydantic_object=ResumeScreening)
     prompt = ChatPromptTemplate.from_messages([
-        ("system", """You are an expert ATS (Applicant Tracking System) AI. Score the resume from 0-100 based on how well it matches the job requirements.
+        ("system", """You are an expert resume parser and ATS (Applicant Tracking System) AI.
+First extract the candidate's name, email, linkedin and github from the resume.
+Then score the resume from 0-100 based on how well it matches the job requirements.
 
 Scoring criteria:
 - Required skills match (40 points): How many required skills does the candidate clearly demonstrate?
@@ -369,11 +356,7 @@ Scoring criteria:
 - Education & certifications (10 points): Relevant degrees, certifications, courses
 - Overall fit (10 points): Communication, achievements, project relevance
 
-Return JSON with:
-- score: number between 0-100
-- reasoning: detailed explanation of the score
-- matched_skills: list of skills from requirements found in resume
-- missing_skills: list of required skills not clearly demonstrated"""),
+{format_instructions}"""),
         ("human", """Resume text: {resume_text}
 
 Job requirements:
@@ -383,20 +366,43 @@ Required skills: {required_skills}
 Preferred skills: {preferred_skills}
 Experience years: {experience_years}
 
-Analyze and score this resume.""")
+Extract the candidate details and score this resume.""")
     ])
-    parser = JsonOutputParser()
-    scoring_chain = prompt | get_llm() | parser
+    screening_chain = prompt | get_llm() | parser
+
+    state.candidate.job_title = state.job_requirements.title
+    state.candidate.testlify_link = state.testlify_link
+    state.candidate.assessment_invite_link = state.testlify_link
+
+    # Same resume text + same requirements -> reuse the earlier result (job_id excluded
+    # so identical postings share entries)
+    cache_key = make_cache_key(
+        "screening", LLM_MODEL, SCREENING_PROMPT_VERSION,
+        sha256_text(state.resume_text),
+        sha256_json(state.job_requirements.model_dump(exclude={"job_id"}))
+    )
 
     try:
-        result = scoring_chain.invoke({
-            "resume_text": state.resume_text[:4000],
-            "title": state.job_requirements.title or "Technical Position",
-            "description": state.job_requirements.description or f"Position for {state.job_requirements.title}",
-            "required_skills": required_skills,
-            "preferred_skills": preferred_skills,
-            "experience_years": state.job_requirements.experience_years or 0
-        })
+        result = get_cached_result(cache_key)
+        if result is not None:
+            print("♻️ Using cached screening result")
+        else:
+            result = invoke_llm(screening_chain, {
+                "format_instructions": parser.get_format_instructions(),
+                "resume_text": state.resume_text[:4000],
+                "title": state.job_requirements.title or "Technical Position",
+                "description": state.job_requirements.description or f"Position for {state.job_requirements.title}",
+                "required_skills": ", ".join(state.job_requirements.required_skills),
+                "preferred_skills": ", ".join(state.job_requirements.preferred_skills),
+                "experience_years": state.job_requirements.experience_years or 0
+            })
+            store_result(cache_key, "screening", result, LLM_MODEL, SCREENING_PROMPT_VERSION)
+
+        extracted_email = result.get("email") or ""
+        state.candidate.name = result.get("name") or "Unknown Candidate"
+        state.candidate.email = extracted_email.replace(" ", "").strip().lower()
+        state.candidate.linkedin = result.get("linkedin") or ""
+        state.candidate.github = result.get("github") or ""
 
         score = result.get("score", 50)
         try:
@@ -406,20 +412,20 @@ Analyze and score this resume.""")
 
         score = max(0, min(100, score))
         state.candidate.ats_score = score
-        state.candidate.score_reasoning = result.get("reasoning", "No reasoning provided")
+        state.candidate.score_reasoning = result.get("reasoning") or "No reasoning provided"
 
         # Add matched/missing skills info if available
-        if "matched_skills" in result:
+        if result.get("matched_skills"):
             state.candidate.score_reasoning += f"\n\nMatched skills: {', '.join(result['matched_skills'])}"
-        if "missing_skills" in result:
+        if result.get("missing_skills"):
             state.candidate.score_reasoning += f"\nMissing skills: {', '.join(result['missing_skills'])}"
 
-        print(f"✅ Calculated ATS score: {score}")
+        print(f"✅ {state.candidate.name}: calculated ATS score {score}")
         return state
 
     except Exception as e:
-        logger.error(f"Error in ATS scorer agent: {str(e)}")
-        print(f"❌ Error in ATS scorer: {str(e)}")
+        logger.error(f"Error in resume screener agent: {str(e)}")
+        print(f"❌ Error in resume screener: {str(e)}")
         state.candidate.ats_score = 50
         state.candidate.score_reasoning = f"Error occurred during scoring: {str(e)}"
         return state
@@ -461,13 +467,23 @@ Score reasoning: {score_reasoning}
 """)
         ])
     feedback_chain = prompt | get_llm()
+    cache_key = make_cache_key(
+        "feedback", LLM_MODEL, FEEDBACK_PROMPT_VERSION,
+        state.candidate.status, state.candidate.ats_score,
+        sha256_text(state.resume_text[:3000]), sha256_text(state.candidate.score_reasoning)
+    )
     try:
-        raw = feedback_chain.invoke({
+        cached = get_cached_result(cache_key)
+        if cached is not None:
+            state.feedback = cached.get("feedback", "")
+            return state
+        raw = invoke_llm(feedback_chain, {
             "ats_score": state.candidate.ats_score,
             "resume_text": state.resume_text[:3000],
             "score_reasoning": state.candidate.score_reasoning
         })
         state.feedback = raw.content if isinstance(raw, AIMessage) else str(raw)
+        store_result(cache_key, "feedback", {"feedback": state.feedback}, LLM_MODEL, FEEDBACK_PROMPT_VERSION)
         return state
     except Exception as e:
         logger.error(f"Error in feedback generator agent: {str(e)}")
@@ -508,6 +524,9 @@ def email_notifier(state: RecruitmentState) -> RecruitmentState:
 class ClintRecruitmentSystem:
     def __init__(self, testlify_link=None):
         self.candidates = []
+        self._candidate_positions = {}  # email -> index in self.candidates
+        self._processed_resumes = None  # resume filenames already in the DB, loaded once
+        self._index_lock = threading.Lock()
         self.ats_threshold = float(os.getenv("ATS_THRESHOLD", "70"))
         self.max_workers = get_env_int("MAX_WORKERS", 4)
         self.testlify_link = testlify_link or ""
@@ -519,17 +538,15 @@ class ClintRecruitmentSystem:
 
     def _build_workflow(self):
         self.workflow = StateGraph(RecruitmentState)
-        self.workflow.add_node("resume_parser", resume_parser)
-        self.workflow.add_node("ats_scorer", ats_scorer)
+        self.workflow.add_node("resume_screener", resume_screener)
         self.workflow.add_node("decision_maker", decision_maker)
         self.workflow.add_node("feedback_generator", feedback_generator)
         self.workflow.add_node("email_notifier", email_notifier)
-        self.workflow.add_edge("resume_parser", "ats_scorer")
-        self.workflow.add_edge("ats_scorer", "decision_maker")
+        self.workflow.add_edge("resume_screener", "decision_maker")
         self.workflow.add_edge("decision_maker", "feedback_generator")
         self.workflow.add_edge("feedback_generator", "email_notifier")
         self.workflow.add_edge("email_notifier", END)
-        self.workflow.set_entry_point("resume_parser")
+        self.workflow.set_entry_point("resume_screener")
         self.graph = self.workflow.compile(checkpointer=None)
 
     def set_job_requirements(self, job_id, job_title, job_description, required_skills, preferred_skills, experience_years=0):
@@ -554,23 +571,75 @@ class ClintRecruitmentSystem:
             logger.warning(f"Invalid threshold value: {threshold}")
             print(f"⚠️ Invalid threshold value: {threshold}")
 
+    def _claim_resume(self, resume_filename):
+        """Reserve a resume filename for processing; False if it was already processed"""
+        with self._index_lock:
+            if self._processed_resumes is None:
+                self._processed_resumes = get_processed_resume_names()
+            if resume_filename in self._processed_resumes:
+                return False
+            self._processed_resumes.add(resume_filename)
+            return True
+
+    def _release_resume(self, resume_filename):
+        """Allow a resume that failed to be retried on the next run"""
+        with self._index_lock:
+            if self._processed_resumes is not None:
+                self._processed_resumes.discard(resume_filename)
+
+    def _upsert_candidate(self, candidate_info):
+        """Save one candidate and update the in-memory list in place"""
+        if not save_candidate_to_db(dict(candidate_info)):
+            return False
+        with self._index_lock:
+            email = candidate_info.get("email")
+            position = self._candidate_positions.get(email) if email else None
+            if position is None:
+                if email:
+                    self._candidate_positions[email] = len(self.candidates)
+                self.candidates.append(candidate_info)
+            else:
+                self.candidates[position] = candidate_info
+        return True
+
+    def _move_to_processed(self, resume_path):
+        """Move a resume into the processed folder, returning its new path"""
+        try:
+            filename = os.path.basename(resume_path)
+            destination = os.path.join(PROCESSED_FOLDER, filename)
+            if os.path.exists(destination):
+                timestamp = datetime.now().strftime('%Y%m%d%H%M%S')
+                name, ext = os.path.splitext(filename)
+                destination = os.path.join(PROCESSED_FOLDER, f"{name}_{timestamp}{ext}")
+            shutil.copy2(resume_path, destination)
+            os.remove(resume_path)
+            logger.info(f"Moved resume to processed folder: {destination}")
+            print(f"📁 Moved resume to: {destination}")
+            return destination
+        except Exception as e:
+            logger.error(f"Error moving resume: {str(e)}")
+            print(f"⚠️ Could not move resume file: {str(e)}")
+            return resume_path
+
     def process_resume(self, resume_path):
+        resume_filename = os.path.basename(resume_path)
+        claimed = False
         try:
             if not os.path.exists(resume_path):
                 logger.warning(f"Resume file not found: {resume_path}")
                 print(f"⚠️ Resume file not found: {resume_path}")
                 return False
-            resume_filename = os.path.basename(resume_path)
-            for candidate in self.candidates:
-                if os.path.basename(candidate.get('resume_path', '')) == resume_filename:
-                    logger.info(f"Resume {resume_filename} already processed, skipping...")
-                    print(f"⚠️ Resume {resume_filename} already processed, skipping...")
-                    return False
+            if not self._claim_resume(resume_filename):
+                logger.info(f"Resume {resume_filename} already processed, skipping...")
+                print(f"⚠️ Resume {resume_filename} already processed, skipping...")
+                return False
+            claimed = True
             print(f"📄 Processing resume: {resume_path}")
             resume_text = extract_text_from_resume(resume_path)
             if not resume_text:
                 logger.warning(f"Could not extract text from {resume_path}")
                 print(f"⚠️ Could not extract text from {resume_path}")
+                self._release_resume(resume_filename)
                 return False
             initial_state = RecruitmentState(
                 resume_text=resume_text,
@@ -580,7 +649,6 @@ class ClintRecruitmentSystem:
             raw_state = self.graph.invoke(initial_state)
             result_state = raw_state if isinstance(raw_state, RecruitmentState) else RecruitmentState(**raw_state)
             candidate_info = result_state.candidate.model_dump()
-            candidate_info["resume_path"] = resume_path
 
             # === Add assessment fields ===
             deadline_hours = 24  # or change to your desired number of hours
@@ -595,36 +663,24 @@ class ClintRecruitmentSystem:
                 if isinstance(candidate_info.get(field), dict):
                     candidate_info[field] = json.dumps(candidate_info[field])
 
-            save_candidate_to_db(candidate_info)
-            self.candidates = get_all_candidates_from_db()
-            # Move resume to processed folder
-            try:
-                filename = os.path.basename(resume_path)
-                destination = os.path.join(PROCESSED_FOLDER, filename)
-                if os.path.exists(destination):
-                    timestamp = datetime.now().strftime('%Y%m%d%H%M%S')
-                    name, ext = os.path.splitext(filename)
-                    destination = os.path.join(PROCESSED_FOLDER, f"{name}_{timestamp}{ext}")
-                shutil.copy2(resume_path, destination)
-                os.remove(resume_path)
-                for candidate in self.candidates:
-                    if candidate.get('resume_path') == resume_path:
-                        candidate['resume_path'] = destination
-                        save_candidate_to_db(candidate)
-                logger.info(f"Moved resume to processed folder: {destination}")
-                print(f"📁 Moved resume to: {destination}")
-            except Exception as e:
-                logger.error(f"Error moving resume: {str(e)}")
-                print(f"⚠️ Could not move resume file: {str(e)}")
+            # Move first so the candidate is written once with its final resume path
+            candidate_info["resume_path"] = self._move_to_processed(resume_path)
+            self._upsert_candidate(candidate_info)
             logger.info(f"Resume processing complete: {resume_path}")
             print(f"✅ Resume processing complete: {resume_path}")
             return True
         except Exception as e:
             logger.error(f"Error processing resume: {str(e)}")
             print(f"❌ Error processing resume: {str(e)}")
+            if claimed:
+                self._release_resume(resume_filename)
             return False
 
-    def process_all_resumes(self, resume_folder=RESUME_FOLDER, use_threads=True):
+    def process_all_resumes(self, resume_folder=RESUME_FOLDER, use_threads=True, progress_callback=None):
+        """
+        Score every resume in the folder. LLM calls share the LLM_MAX_CONCURRENCY
+        budget; progress_callback(done, total) is called as each resume finishes.
+        """
         if not os.path.exists(resume_folder):
             logger.warning(f"Folder not found: {resume_folder}")
             print(f"⚠️ Folder not found: {resume_folder}")
@@ -641,17 +697,30 @@ class ClintRecruitmentSystem:
         num_files = len(resume_files)
         logger.info(f"Found {num_files} resume files to process")
         print(f"🔍 Found {num_files} resume files to process")
+        # Derive missing job requirements once, not per resume
+        ensure_job_requirements(self.job_requirements)
+        # Parse all files up front in the extraction pool; workers then hit the text cache
+        resume_extractor.extract_many(resume_files)
         start_time = time.time()
         processed_count = 0
+        done = 0
         if use_threads and num_files > 1:
             with ThreadPoolExecutor(max_workers=min(self.max_workers, num_files)) as executor:
-                results = list(executor.map(self.process_resume, resume_files))
-                processed_count = sum(1 for result in results if result)
+                futures = [executor.submit(self.process_resume, f) for f in resume_files]
+                for future in as_completed(futures):
+                    done += 1
+                    if future.result():
+                        processed_count += 1
+                    if progress_callback:
+                        progress_callback(done, num_files)
         else:
             for resume_file in resume_files:
                 success = self.process_resume(resume_file)
+                done += 1
                 if success:
                     processed_count += 1
+                if progress_callback:
+                    progress_callback(done, num_files)
         elapsed_time = time.time() - start_time
         logger.info(f"Processed {processed_count} out of {num_files} resumes in {elapsed_time:.2f} seconds")
         print(f"🎉 Processed {processed_count} out of {num_files} resumes in {elapsed_time:.2f} seconds")
@@ -761,9 +830,12 @@ def main():
 
 
 
-def run_recruitment_with_invite_link(job_id, job_title, job_desc, invite_link):
+def run_recruitment_with_invite_link(job_id, job_title, job_desc, invite_link, progress_callback=None):
     """
-    Process all resumes and send invite links to shortlisted candidates
+    Process all resumes and send invite links to shortlisted candidates.
+    Resumes are scored concurrently (bounded by MAX_WORKERS and the shared LLM
+    budget); DB writes stay on this thread in one session. progress_callback(done, total)
+    is called as each resume finishes.
     """
     print(f"🤖 Starting AI-powered recruitment screening for job_id={job_id}, title={job_title}")
     print(f"📧 Using invite link: {invite_link}")
@@ -787,7 +859,7 @@ def run_recruitment_with_invite_link(job_id, job_title, job_desc, invite_link):
             ])
             parser = JsonOutputParser()
             skill_chain = prompt | get_llm() | parser
-            skills_result = skill_chain.invoke({"title": job_title, "desc": job_desc})
+            skills_result = invoke_llm(skill_chain, {"title": job_title, "desc": job_desc})
             required_skills = skills_result.get("required_skills", required_skills)[:5]
             preferred_skills = skills_result.get("preferred_skills", preferred_skills)[:5]
             print(f"📋 Extracted skills - Required: {required_skills}, Preferred: {preferred_skills}")
@@ -804,6 +876,7 @@ def run_recruitment_with_invite_link(job_id, job_title, job_desc, invite_link):
         preferred_skills=preferred_skills,
         experience_years=2
     )
+    ensure_job_requirements(recruitment_system.job_requirements)
     
     # Set ATS threshold
     ats_threshold = float(os.getenv("ATS_THRESHOLD", "70"))
@@ -844,100 +917,108 @@ def run_recruitment_with_invite_link(job_id, job_title, job_desc, invite_link):
     processed_count = 0
     shortlisted_count = 0
     
+    def score_resume(resume_path):
+        """Run the LangGraph workflow for one extracted resume (no DB access)"""
+        resume_text = resume_texts.get(resume_path)
+        if not resume_text:
+            return None
+        
+        # Create recruitment state with testlify_link
+        initial_state = RecruitmentState(
+            resume_text=resume_text,
+            job_requirements=recruitment_system.job_requirements,
+            ats_threshold=ats_threshold,
+            testlify_link=invite_link  # Pass the invite link here
+        )
+        result = recruitment_system.graph.invoke(initial_state.model_dump())
+        return result if isinstance(result, RecruitmentState) else RecruitmentState(**result)
+    
     try:
+        # Index this job's candidates once instead of querying per resume
+        job_candidates = session.query(Candidate).filter(Candidate.job_id == job_id).all()
+        by_resume_path = {c.resume_path: c for c in job_candidates if c.resume_path}
+        by_email = {c.email: c for c in job_candidates if c.email}
+        
+        pending = []
         for resume_path in resume_files:
-            try:
-                filename = os.path.basename(resume_path)
-                print(f"\n📄 Processing resume: {filename}")
-                
-                # Check if already processed for this job
-                existing = session.query(Candidate).filter_by(
-                    resume_path=resume_path,
-                    job_id=job_id
-                ).first()
-                
-                if existing and existing.status:
-                    print(f"⚠️  Resume already processed for this job: {filename}")
-                    continue
-                
-                # Extract resume text
-                resume_text = extract_text_from_resume(resume_path)
-                if not resume_text:
-                    print(f"⚠️  Could not extract text from {filename}")
-                    continue
-                
-                # Create recruitment state with testlify_link
-                initial_state = RecruitmentState(
-                    resume_text=resume_text,
-                    job_requirements=recruitment_system.job_requirements,
-                    ats_threshold=ats_threshold,
-                    testlify_link=invite_link  # Pass the invite link here
-                )
-                
-                # Run the LangGraph workflow
-                print(f"🔄 Running AI analysis...")
-                result = recruitment_system.graph.invoke(initial_state.model_dump())
-                final_state = result if isinstance(result, RecruitmentState) else RecruitmentState(**result)
-                
-                # Prepare candidate data
-                candidate_data = {
-                    "name": final_state.candidate.name,
-                    "email": final_state.candidate.email,
-                    "resume_path": resume_path,
-                    "job_id": job_id,  # Use the job_id parameter
-                    "job_title": job_title,
-                    "ats_score": final_state.candidate.ats_score,
-                    "status": final_state.candidate.status,
-                    "score_reasoning": str(final_state.candidate.score_reasoning)[:500],
-                    "assessment_invite_link": invite_link,
-                    "notification_sent": final_state.candidate.notification_sent,
-                    "processed_date": datetime.now()
-                }
-                
-                # Handle email and link fields for shortlisted candidates
-                if final_state.candidate.status == "Shortlisted":
-                    candidate_data.update({
-                        "exam_link_sent": True,
-                        "exam_link_sent_date": datetime.now()
-                    })
-                    shortlisted_count += 1
-                
-                # Save or update candidate
-                if existing:
-                    for key, value in candidate_data.items():
-                        if key != 'id':
-                            setattr(existing, key, value)
-                else:
-                    # Check if candidate exists by email
-                    existing_by_email = session.query(Candidate).filter_by(
-                        email=candidate_data["email"],
-                        job_id=job_id
-                    ).first()
+            existing = by_resume_path.get(resume_path)
+            if existing and existing.status:
+                print(f"⚠️  Resume already processed for this job: {os.path.basename(resume_path)}")
+                continue
+            pending.append(resume_path)
+        
+        total = len(pending)
+        done = 0
+        resume_texts = resume_extractor.extract_many(pending)
+        if total:
+            print(f"🔄 Running AI analysis on {total} resumes...")
+            with ThreadPoolExecutor(max_workers=min(recruitment_system.max_workers, total)) as executor:
+                futures = {executor.submit(score_resume, path): path for path in pending}
+                for future in as_completed(futures):
+                    resume_path = futures[future]
+                    filename = os.path.basename(resume_path)
+                    done += 1
+                    try:
+                        final_state = future.result()
+                        if final_state is None:
+                            print(f"⚠️  Could not extract text from {filename}")
+                            continue
                     
-                    if existing_by_email:
-                        for key, value in candidate_data.items():
-                            if key != 'id':
-                                setattr(existing_by_email, key, value)
-                    else:
-                        candidate = Candidate(**candidate_data)
-                        session.add(candidate)
-                
-                session.commit()
-                processed_count += 1
-                
-                # Print result
-                if final_state.candidate.status == "Shortlisted":
-                    print(f"✅ {candidate_data['name']} - SHORTLISTED (Score: {candidate_data['ats_score']:.1f})")
-                    print(f"   Email sent: {final_state.candidate.notification_sent}")
-                else:
-                    print(f"❌ {candidate_data['name']} - REJECTED (Score: {candidate_data['ats_score']:.1f})")
+                        # Prepare candidate data
+                        candidate_data = {
+                            "name": final_state.candidate.name,
+                            "email": final_state.candidate.email,
+                            "resume_path": resume_path,
+                            "job_id": job_id,  # Use the job_id parameter
+                            "job_title": job_title,
+                            "ats_score": final_state.candidate.ats_score,
+                            "status": final_state.candidate.status,
+                            "score_reasoning": str(final_state.candidate.score_reasoning)[:500],
+                            "assessment_invite_link": invite_link,
+                            "notification_sent": final_state.candidate.notification_sent,
+                            "processed_date": datetime.now()
+                        }
+                    
+                        # Handle email and link fields for shortlisted candidates
+                        is_shortlisted = final_state.candidate.status == "Shortlisted"
+                        if is_shortlisted:
+                            candidate_data.update({
+                                "exam_link_sent": True,
+                                "exam_link_sent_date": datetime.now()
+                            })
+                    
+                        # Upsert by resume path, then by email within this job
+                        candidate = by_resume_path.get(resume_path) or by_email.get(candidate_data["email"])
+                        if candidate:
+                            for key, value in candidate_data.items():
+                                setattr(candidate, key, value)
+                        else:
+                            candidate = Candidate(**candidate_data)
+                            session.add(candidate)
+                    
+                        session.commit()
+                        by_resume_path[resume_path] = candidate
+                        if candidate.email:
+                            by_email[candidate.email] = candidate
+                        processed_count += 1
+                        if is_shortlisted:
+                            shortlisted_count += 1
+                    
+                        # Print result
+                        if is_shortlisted:
+                            print(f"✅ {candidate_data['name']} - SHORTLISTED (Score: {candidate_data['ats_score']:.1f})")
+                            print(f"   Email sent: {final_state.candidate.notification_sent}")
+                        else:
+                            print(f"❌ {candidate_data['name']} - REJECTED (Score: {candidate_data['ats_score']:.1f})")
                 
-            except Exception as e:
-                print(f"❌ Error processing resume {filename}: {str(e)}")
-                import traceback
-                traceback.print_exc()
-                session.rollback()
-                continue
+                    except Exception as e:
+                        print(f"❌ Error processing resume {filename}: {str(e)}")
+                        import traceback
+                        traceback.print_exc()
+                        session.rollback()
+                    finally:
+                        if progress_callback:
+                            progress_callback(done, total)
         
         # Print summary
         print(f"\n" + "="*50)
@@ -1,6 +1,6 @@
 # db.py - Production Ready Database Model with all enhancements
 
-from sqlalchemy import create_engine, Column, Integer, String, Float, Boolean, DateTime, Text, Index, UniqueConstraint
+from sqlalchemy import create_engine, Column, Integer, String, Float, Boolean, DateTime, Text, Index, UniqueConstraint, and_
 from sqlalchemy.orm import declarative_base, sessionmaker
 from sqlalchemy.pool import QueuePool
 from datetime import datetime
@@ -26,6 +26,8 @@ class Candidate(Base):
         Index('idx_status', 'status'),
         Index('idx_exam_completed', 'exam_completed'),
         Index('idx_processed_date', 'processed_date'),
+        Index('idx_interview_session_id', 'interview_session_id'),
+        Index('idx_analysis_status_started', 'interview_ai_analysis_status', 'interview_analysis_started_at'),
         UniqueConstraint('email', 'job_id', name='unique_email_job'),
     )
 
@@ -113,6 +115,7 @@ class Candidate(Base):
 
     # Interview Automation Fields
     interview_kb_id = Column(String(200))  # HeyGen Knowledge Base ID
+    interview_kb_questions = Column(Text)  # JSON [{question, question_type}] asked by the KB
     interview_token = Column(String(200), unique=True)  # Unique interview token
     interview_created_at = Column(DateTime)  # When interview was created
     interview_expires_at = Column(DateTime)  # When interview link expires
@@ -246,6 +249,32 @@ def add_interview_automation_fields():
         }
 
 
+# Interview lifecycle indexes. The background monitors only ever look at open
+# interviews or completed-but-unprocessed analyses, a small slice of the table,
+# so these are partial indexes (SQLite/PostgreSQL) the planner scans instead of
+# the whole table. Keep in sync with migrations/versions/*_interview_lifecycle_indexes.py
+_open_interview = Candidate.interview_completed_at.is_(None)
+_awaiting_analysis = and_(Candidate.interview_completed_at.isnot(None),
+                          Candidate.interview_auto_score_triggered == False)
+_awaiting_score = and_(Candidate.interview_completed_at.isnot(None),
+                       Candidate.interview_ai_score.is_(None))
+
+INTERVIEW_LIFECYCLE_INDEXES = [
+    # Active/stuck/abandoned interview scans
+    Index('idx_interview_active', Candidate.interview_started_at, Candidate.interview_last_activity,
+          sqlite_where=_open_interview, postgresql_where=_open_interview),
+    # Expiry sweep
+    Index('idx_interview_open_expires', Candidate.interview_expires_at,
+          sqlite_where=_open_interview, postgresql_where=_open_interview),
+    # Analysis reconciliation (completed, not yet picked up)
+    Index('idx_analysis_awaiting', Candidate.interview_ai_analysis_status,
+          sqlite_where=_awaiting_analysis, postgresql_where=_awaiting_analysis),
+    # Completed interviews without a score
+    Index('idx_analysis_unscored', Candidate.interview_ai_analysis_status,
+          sqlite_where=_awaiting_score, postgresql_where=_awaiting_score),
+]
+
+
 class PipelineRun(Base):
     """Track pipeline execution history"""
     __tablename__ = 'pipeline_runs'
@@ -287,6 +316,73 @@ class EmailLog(Base):
     )
 
 
+class InterviewEvent(Base):
+    """Append-only log of interview questions, answers and speech segments"""
+    __tablename__ = 'interview_events'
+    
+    id = Column(Integer, primary_key=True)
+    candidate_id = Column(Integer, nullable=False)
+    session_id = Column(String(200))
+    event_type = Column(String(20), nullable=False)  # question/answer/speech
+    source = Column(String(50))  # knowledge_base/voice_transcription/utterance/speech_recognition
+    content = Column(Text)
+    payload = Column(Text)  # JSON metadata sent by the client
+    created_at = Column(DateTime, default=datetime.now, nullable=False)
+    
+    # Indexes
+    __table_args__ = (
+        Index('idx_interview_event_candidate', 'candidate_id', 'id'),
+        Index('idx_interview_event_session', 'session_id'),
+    )
+
+
+class LLMResultCache(Base):
+    """Content-addressed cache of LLM results (resume screening, feedback)"""
+    __tablename__ = 'llm_result_cache'
+    
+    id = Column(Integer, primary_key=True)
+    cache_key = Column(String(64), nullable=False, unique=True)  # SHA-256 of kind/inputs/model/prompt version
+    kind = Column(String(50), nullable=False)  # screening/feedback
+    model = Column(String(100))
+    prompt_version = Column(String(20))
+    result = Column(Text, nullable=False)  # JSON
+    created_at = Column(DateTime, default=datetime.now, nullable=False)
+    expires_at = Column(DateTime)
+    last_used_at = Column(DateTime, default=datetime.now, nullable=False)
+    hit_count = Column(Integer, default=0)
+    
+    # Indexes
+    __table_args__ = (
+        Index('idx_llm_cache_last_used', 'last_used_at'),
+        Index('idx_llm_cache_expires', 'expires_at'),
+    )
+
+
+class AnalysisJob(Base):
+    """Durable interview analysis work queue (one row per candidate, lease-based claiming)"""
+    __tablename__ = 'analysis_jobs'
+
+    id = Column(Integer, primary_key=True)
+    candidate_id = Column(Integer, nullable=False, unique=True)
+    priority = Column(Integer, default=5, nullable=False)  # lower = sooner
+    status = Column(String(20), default='pending', nullable=False)  # pending/leased/done/failed
+    attempts = Column(Integer, default=0, nullable=False)
+    max_attempts = Column(Integer, default=4, nullable=False)
+    next_attempt_at = Column(DateTime, default=datetime.now, nullable=False)
+    lease_owner = Column(String(200))
+    lease_expires_at = Column(DateTime)
+    last_error = Column(Text)
+    rerun_requested = Column(Boolean, default=False, nullable=False)  # re-queued while leased
+    created_at = Column(DateTime, default=datetime.now, nullable=False)
+    updated_at = Column(DateTime, default=datetime.now, nullable=False)
+
+    # Indexes
+    __table_args__ = (
+        Index('idx_analysis_job_claim', 'status', 'priority', 'next_attempt_at'),
+        Index('idx_analysis_job_lease', 'status', 'lease_expires_at'),
+    )
+
+
 # Database configuration with production settings
 def get_database_url():
     """Get database URL from environment or use default SQLite"""
@@ -365,6 +461,34 @@ def add_column_if_not_exists(table_name, column_name, column_type):
         logger.info(f"Added column {column_name} to {table_name}")
 
 
+def create_index_if_not_exists(table_name, index_name, columns):
+    """Create index on existing table if it doesn't exist"""
+    from sqlalchemy import inspect, text
+    
+    inspector = inspect(engine)
+    indexes = [idx['name'] for idx in inspector.get_indexes(table_name)]
+    
+    if index_name not in indexes:
+        with engine.connect() as conn:
+            conn.execute(text(f"CREATE INDEX {index_name} ON {table_name} ({', '.join(columns)})"))
+            conn.commit()
+        logger.info(f"Created index {index_name} on {table_name}")
+
+
+def ensure_interview_token_index():
+    """
+    Fresh databases get interview_token's UNIQUE index from create_all, but the
+    column was added to older databases by ALTER TABLE without one.
+    """
+    from sqlalchemy import inspect
+    
+    inspector = inspect(engine)
+    indexed = [idx['column_names'] for idx in inspector.get_indexes('candidates')]
+    indexed += [uc['column_names'] for uc in inspector.get_unique_constraints('candidates')]
+    if ['interview_token'] not in indexed:
+        create_index_if_not_exists('candidates', 'idx_interview_token', ['interview_token'])
+
+
 def run_migrations():
     """Run database migrations for existing databases"""
     try:
@@ -397,6 +521,7 @@ def run_migrations():
             # ADD THESE MISSING INTERVIEW COLUMNS:
             ('candidates', 'knowledge_base_id', 'VARCHAR(200)'),
             ('candidates', 'interview_kb_id', 'VARCHAR(200)'),
+            ('candidates', 'interview_kb_questions', 'TEXT'),
             ('candidates', 'interview_token', 'VARCHAR(200)'),
             ('candidates', 'interview_created_at', 'DATETIME'),
             ('candidates', 'interview_expires_at', 'DATETIME'),
@@ -412,7 +537,8 @@ def run_migrations():
             ('candidates', 'interview_email_attempts', 'INTEGER DEFAULT 0'),
             ('candidates', 'company_name', 'VARCHAR(200)'),
             ('candidates', 'job_description', 'TEXT'),
-            ('candidates', 'interview_auto_score_triggered', 'BOOLEAN DEFAULT FALSE')
+            ('candidates', 'interview_auto_score_triggered', 'BOOLEAN DEFAULT FALSE'),
+            ('analysis_jobs', 'rerun_requested', 'BOOLEAN DEFAULT FALSE NOT NULL')
         ]
         
         for table, column, col_type in migrations:
@@ -421,6 +547,29 @@ def run_migrations():
             except Exception as e:
                 logger.warning(f"Migration for {table}.{column} failed: {e}")
         
+        # Indexes added after the initial schema
+        indexes = [
+            ('candidates', 'idx_interview_session_id', ['interview_session_id']),
+            ('candidates', 'idx_analysis_status_started', ['interview_ai_analysis_status', 'interview_analysis_started_at']),
+        ]
+        
+        for table, index_name, columns in indexes:
+            try:
+                create_index_if_not_exists(table, index_name, columns)
+            except Exception as e:
+                logger.warning(f"Index {index_name} on {table} failed: {e}")
+        
+        for index in INTERVIEW_LIFECYCLE_INDEXES:
+            try:
+                index.create(engine, checkfirst=True)
+            except Exception as e:
+                logger.warning(f"Index {index.name} failed: {e}")
+        
+        try:
+            ensure_interview_token_index()
+        except Exception as e:
+            logger.warning(f"Interview token index failed: {e}")
+        
         logger.info("Database migrations completed")
         
     except Exception as e:
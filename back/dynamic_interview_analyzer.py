@@ -9,24 +9,116 @@ import re
 import logging
 from datetime import datetime
 from typing import Dict, List, Optional, Any, Tuple
-from dataclasses import dataclass
+from dataclasses import dataclass, asdict
 from enum import Enum
+import os
 import hashlib
-from textblob import TextBlob
-import nltk
 from collections import Counter
+from functools import lru_cache
 import numpy as np
 
-# Download required NLTK data
-try:
-    nltk.download('punkt', quiet=True)
-    nltk.download('stopwords', quiet=True)
-    nltk.download('averaged_perceptron_tagger', quiet=True)
-except:
-    pass
-
 logger = logging.getLogger(__name__)
 
+QUESTION_TYPE_CACHE_SIZE = int(os.getenv('QUESTION_TYPE_CACHE_SIZE', '2048'))
+
+# Sentiment backend: 'lexicon' (built-in, default), 'textblob' (lazy import), or 'off'
+SENTIMENT_BACKEND = os.getenv('INTERVIEW_SENTIMENT_BACKEND', 'lexicon').lower()
+
+# Polarity (-1 to 1) of words common in interview answers, on TextBlob's scale
+_SENTIMENT_LEXICON = {
+    'excellent': 1.0, 'outstanding': 1.0, 'amazing': 0.6, 'awesome': 1.0, 'perfect': 1.0,
+    'best': 1.0, 'great': 0.8, 'fantastic': 0.4, 'wonderful': 1.0, 'love': 0.5, 'loved': 0.7,
+    'enjoy': 0.4, 'enjoyed': 0.5, 'passionate': 0.5, 'excited': 0.4, 'exciting': 0.3,
+    'good': 0.7, 'happy': 0.8, 'glad': 0.5, 'proud': 0.8, 'confident': 0.5, 'successful': 0.75,
+    'successfully': 0.75, 'success': 0.3, 'effective': 0.6, 'efficient': 0.5, 'strong': 0.43,
+    'interesting': 0.5, 'positive': 0.23, 'better': 0.5, 'improved': 0.3, 'helpful': 0.3,
+    'valuable': 0.3, 'rewarding': 0.5, 'motivated': 0.3, 'eager': 0.25, 'easy': 0.43,
+    'clear': 0.1, 'nice': 0.6, 'fun': 0.3, 'well': 0.3, 'right': 0.29, 'solid': 0.2,
+    'bad': -0.7, 'worst': -1.0, 'terrible': -1.0, 'awful': -1.0, 'horrible': -1.0, 'poor': -0.4,
+    'hate': -0.8, 'hated': -0.9, 'difficult': -0.5, 'hard': -0.29, 'frustrating': -0.4,
+    'frustrated': -0.7, 'boring': -1.0, 'annoying': -0.8, 'stressful': -0.5, 'stressed': -0.4,
+    'failed': -0.5, 'failure': -0.32, 'wrong': -0.5, 'problem': -0.1, 'confused': -0.4,
+    'confusing': -0.3, 'unfortunately': -0.5, 'sad': -0.5, 'angry': -0.5, 'worse': -0.4,
+    'negative': -0.3, 'impossible': -0.67, 'unclear': -0.1, 'weak': -0.38, 'struggled': -0.3,
+}
+_SENTIMENT_NEGATORS = {'not', 'no', 'never', "don't", "didn't", "doesn't", "isn't", "wasn't",
+                       "aren't", "weren't", "can't", "cannot", "won't", "wouldn't", "couldn't", "hardly"}
+_SENTIMENT_INTENSIFIERS = {'very': 1.3, 'really': 1.3, 'extremely': 1.5, 'highly': 1.3,
+                           'incredibly': 1.5, 'super': 1.3, 'quite': 1.1, 'so': 1.2}
+_SENTIMENT_WORD_RE = re.compile(r"[a-z']+")
+
+
+@lru_cache(maxsize=4096)
+def lexicon_sentiment(text: str) -> float:
+    """Fast polarity: mean lexicon score of sentiment words, with negation and intensifiers"""
+    scores = []
+    negate = False
+    boost = 1.0
+    for word in _SENTIMENT_WORD_RE.findall(text.lower()):
+        if word in _SENTIMENT_NEGATORS:
+            negate = True
+            continue
+        if word in _SENTIMENT_INTENSIFIERS:
+            boost *= _SENTIMENT_INTENSIFIERS[word]
+            continue
+        polarity = _SENTIMENT_LEXICON.get(word)
+        if polarity is not None:
+            polarity *= boost
+            scores.append(-0.5 * polarity if negate else polarity)
+        negate = False
+        boost = 1.0
+    if not scores:
+        return 0.0
+    return max(-1.0, min(1.0, sum(scores) / len(scores)))
+
+
+@lru_cache(maxsize=4096)
+def textblob_sentiment(text: str) -> float:
+    """TextBlob polarity; imported on first use, falls back to the lexicon when unavailable"""
+    try:
+        from textblob import TextBlob
+    except ImportError:
+        logger.warning("TextBlob not installed, using built-in sentiment lexicon")
+        return lexicon_sentiment(text)
+    try:
+        return TextBlob(text).sentiment.polarity
+    except Exception as e:
+        logger.warning(f"TextBlob sentiment failed: {e}")
+        return 0.0
+
+
+def no_sentiment(text: str) -> float:
+    return 0.0
+
+
+SENTIMENT_BACKENDS = {
+    'lexicon': lexicon_sentiment,
+    'textblob': textblob_sentiment,
+    'off': no_sentiment,
+}
+
+# Overall score weights; the first matching position keyword set wins
+DEFAULT_SCORE_WEIGHTS = {
+    'technical': 0.35,
+    'communication': 0.25,
+    'problem_solving': 0.25,
+    'cultural_fit': 0.15
+}
+POSITION_SCORE_WEIGHTS = [
+    (('senior', 'lead'), {'technical': 0.30, 'communication': 0.30, 'problem_solving': 0.25, 'cultural_fit': 0.15}),
+    (('junior', 'intern'), {'technical': 0.25, 'communication': 0.25, 'problem_solving': 0.20, 'cultural_fit': 0.30}),
+    (('manager',), {'technical': 0.20, 'communication': 0.35, 'problem_solving': 0.30, 'cultural_fit': 0.15}),
+]
+
+
+def score_weights_for_position(position: str) -> Dict[str, float]:
+    position = (position or '').lower()
+    for keywords, weights in POSITION_SCORE_WEIGHTS:
+        if any(keyword in position for keyword in keywords):
+            return weights
+    return DEFAULT_SCORE_WEIGHTS
+
+
 class ResponseQuality(Enum):
     """Quality levels for interview responses"""
     EXCELLENT = "excellent"
@@ -35,7 +127,78 @@ class ResponseQuality(Enum):
     POOR = "poor"
     NO_RESPONSE = "no_response"
 
-@dataclass
+# Words, plus tokens such as "c++", "c#", "ci/cd" and "%"
+_TOKEN_RE = re.compile(r"[a-z0-9]+(?:\+\+|#|/[a-z0-9]+)*|%")
+_INFLECTION_SUFFIXES = ('ments', 'ment', 'ings', 'ing', 'ers', 'er', 'ed', 'es', 's', 'd', 'r')
+
+
+def normalize_question(question: str) -> str:
+    """Lowercase, collapse whitespace and trim surrounding punctuation/quotes"""
+    return ' '.join((question or '').lower().split()).strip(' "\'?.!')
+
+
+def tokenize(text: str) -> List[str]:
+    """Tokenize already-lowercased text"""
+    return _TOKEN_RE.findall(text)
+
+
+@lru_cache(maxsize=8192)
+def _base_forms(token: str) -> Tuple[str, ...]:
+    """The token plus its candidate stems ("leading" -> "lead", "managed" -> "manage")"""
+    forms = [token]
+    for suffix in _INFLECTION_SUFFIXES:
+        if token.endswith(suffix) and len(token) - len(suffix) >= 3:
+            stem = token[:-len(suffix)]
+            forms.append(stem)
+            if stem[-1] == stem[-2]:  # "debugging" -> "debugg" -> "debug"
+                forms.append(stem[:-1])
+    return tuple(forms)
+
+
+class KeywordMatcher:
+    """
+    Multi-pattern keyword matcher over a token stream. Keywords are indexed by
+    their first token, so one pass over the answer finds every keyword of every
+    group. Matches are whole tokens (optionally inflected), so "ai" does not
+    match inside "maintain".
+    """
+
+    def __init__(self, groups: Dict[str, List[str]]):
+        self.groups = list(groups)
+        self._index: Dict[str, List[Tuple[Tuple[str, ...], str, str]]] = {}
+        for group, keywords in groups.items():
+            for keyword in keywords:
+                kw_tokens = tuple(tokenize(keyword.lower()))
+                if kw_tokens:
+                    self._index.setdefault(kw_tokens[0], []).append((kw_tokens, keyword, group))
+
+    def match(self, tokens: List[str]) -> Dict[str, set]:
+        """Distinct keywords found per group"""
+        found = {group: set() for group in self.groups}
+        n = len(tokens)
+        for i, token in enumerate(tokens):
+            for form in _base_forms(token):
+                for kw_tokens, keyword, group in self._index.get(form, ()):
+                    if i + len(kw_tokens) > n:
+                        continue
+                    if all(kw_tokens[j] in _base_forms(tokens[i + j]) for j in range(1, len(kw_tokens))):
+                        found[group].add(keyword)
+        return found
+
+
+@dataclass(slots=True)
+class PreparedAnswer:
+    """An answer lowercased, tokenized and keyword-matched once, shared by all scorers"""
+    text: str
+    lower: str
+    words: List[str]
+    matches: Dict[str, set]
+
+    def count(self, group: str) -> int:
+        return len(self.matches.get(group, ()))
+
+
+@dataclass(slots=True)
 class AnswerMetrics:
     """Metrics for individual answer analysis"""
     word_count: int
@@ -51,13 +214,54 @@ class AnswerMetrics:
     sentiment_score: float
     response_time: float = 0.0
 
+
+@dataclass(slots=True)
+class AnswerAnalysis:
+    """Analysis of one answered question; converted to the dict API only when returned"""
+    question: str
+    answer: str  # truncated excerpt
+    question_type: str
+    metrics: AnswerMetrics
+    quality_scores: Dict[str, float]
+    response_quality: ResponseQuality
+    timestamp: Optional[str] = None
+    response_time: float = 0
+
+    @property
+    def quality_score(self) -> float:
+        return max(self.quality_scores.values())
+
+    def to_dict(self) -> Dict:
+        return {
+            'question': self.question,
+            'answer': self.answer,
+            'question_type': self.question_type,
+            'metrics': asdict(self.metrics),
+            'quality_scores': self.quality_scores,
+            'response_quality': self.response_quality.value,
+            'timestamp': self.timestamp,
+            'response_time': self.response_time
+        }
+
 class DynamicInterviewAnalyzer:
     """
     Real-time interview analyzer that evaluates responses dynamically
     based on actual content, not random scores
     """
     
-    def __init__(self):
+    def __init__(self, sentiment_backend=None):
+        """
+        sentiment_backend: a name from SENTIMENT_BACKENDS or a callable(text) -> polarity;
+        defaults to INTERVIEW_SENTIMENT_BACKEND. Use 'off' for batch re-analysis.
+        """
+        backend = sentiment_backend or SENTIMENT_BACKEND
+        if callable(backend):
+            self.sentiment = backend
+        else:
+            if backend not in SENTIMENT_BACKENDS:
+                logger.warning(f"Unknown sentiment backend '{backend}', using lexicon")
+            self.sentiment = SENTIMENT_BACKENDS.get(backend, lexicon_sentiment)
+        
         # Technical keywords by category
         self.technical_keywords = {
             'programming': ['python', 'java', 'javascript', 'c++', 'sql', 'api', 'database', 
@@ -87,6 +291,22 @@ class DynamicInterviewAnalyzer:
             'time_awareness': ['deadline', 'timeline', 'schedule', 'days', 'weeks', 'months']
         }
         
+        # Phrases used by the structure / relevance / clarity scores
+        self.logical_connectors = ['first', 'second', 'then', 'finally', 'however', 'therefore', 'because']
+        self.relevance_markers = ['example', 'project', 'experience']
+        self.clarity_patterns = ['my approach', 'i believe', 'in my experience', 'i would']
+        
+        # Every keyword list above, matched in a single pass per answer
+        self.keyword_matcher = KeywordMatcher({
+            'technical': [kw for keywords in self.technical_keywords.values() for kw in keywords],
+            'soft_skills': [kw for keywords in self.soft_skills.values() for kw in keywords],
+            'examples': self.behavioral_indicators['specific_examples'],
+            'star': self.behavioral_indicators['star_method'],
+            'connectors': self.logical_connectors,
+            'relevance': self.relevance_markers,
+            'clarity': self.clarity_patterns
+        })
+        
         # Question type patterns
         self.question_patterns = {
             'technical': r'(implement|code|algorithm|technical|programming|design|architecture)',
@@ -95,6 +315,10 @@ class DynamicInterviewAnalyzer:
             'knowledge': r'(what is|explain|define|difference between|how does)',
             'cultural': r'(why|motivation|interest|team|culture|values|goals)'
         }
+        self._compiled_question_patterns = [
+            (q_type, re.compile(pattern)) for q_type, pattern in self.question_patterns.items()
+        ]
+        self._classify_question_memo = lru_cache(maxsize=QUESTION_TYPE_CACHE_SIZE)(self._classify_question)
     
     def analyze_interview(self, qa_pairs: List[Dict], candidate_info: Dict) -> Dict[str, Any]:
         """
@@ -123,7 +347,7 @@ class DynamicInterviewAnalyzer:
             answer_analyses.append(analysis)
         
         # Calculate overall scores
-        scores = self._calculate_overall_scores(answer_analyses, qa_pairs, candidate_info)
+        scores, confidence = self._calculate_overall_scores(answer_analyses, qa_pairs, candidate_info)
         
         # Generate insights
         insights = self._generate_insights(answer_analyses, scores)
@@ -141,17 +365,17 @@ class DynamicInterviewAnalyzer:
             'insights': insights,
             'feedback': feedback,
             'recommendation': recommendation,
-            'answer_analyses': answer_analyses,
+            'answer_analyses': [analysis.to_dict() for analysis in answer_analyses],
             'metadata': {
                 'total_questions': len(qa_pairs),
                 'answered_questions': len(valid_qa_pairs),
                 'analysis_timestamp': datetime.now().isoformat(),
                 'analysis_method': 'dynamic_content_based',
-                'confidence': self._calculate_confidence(answer_analyses)
+                'confidence': confidence
             }
         }
     
-    def _analyze_single_qa(self, qa: Dict, candidate_info: Dict) -> Dict:
+    def _analyze_single_qa(self, qa: Dict, candidate_info: Dict) -> AnswerAnalysis:
         """Analyze a single question-answer pair"""
         question = qa.get('question', '')
         answer = qa.get('answer', '')
@@ -159,8 +383,10 @@ class DynamicInterviewAnalyzer:
         # Extract metrics
         metrics = self._extract_answer_metrics(answer)
         
-        # Determine question type
-        question_type = self._identify_question_type(question)
+        # Determine question type (precomputed at KB creation when known)
+        question_type = qa.get('question_type')
+        if question_type not in QUESTION_TYPES:
+            question_type = self._identify_question_type(question, candidate_info.get('question_types'))
         
         # Calculate quality scores
         quality_scores = self._calculate_quality_scores(answer, question, metrics, question_type)
@@ -168,64 +394,51 @@ class DynamicInterviewAnalyzer:
         # Evaluate response quality
         response_quality = self._evaluate_response_quality(metrics, quality_scores)
         
-        return {
-            'question': question,
-            'answer': answer[:200] + '...' if len(answer) > 200 else answer,
-            'question_type': question_type,
-            'metrics': metrics.__dict__,
-            'quality_scores': quality_scores,
-            'response_quality': response_quality.value,
-            'timestamp': qa.get('timestamp'),
-            'response_time': qa.get('response_time', 0)
-        }
+        return AnswerAnalysis(
+            question=question,
+            answer=answer[:200] + '...' if len(answer) > 200 else answer,
+            question_type=question_type,
+            metrics=metrics,
+            quality_scores=quality_scores,
+            response_quality=response_quality,
+            timestamp=qa.get('timestamp'),
+            response_time=qa.get('response_time', 0)
+        )
     
     def _extract_answer_metrics(self, answer: str) -> AnswerMetrics:
         """Extract detailed metrics from an answer"""
         if not answer:
             return AnswerMetrics(0, 0, 0, 0, 0, 0, 0.0, 0.0, 0.0, 0.0, 0.0)
         
+        prepared = self._prepare_answer(answer)
+        
         # Basic text metrics
-        words = answer.lower().split()
+        words = prepared.words
         sentences = answer.count('.') + answer.count('!') + answer.count('?')
         unique_words = len(set(words))
         
-        # Technical terms count
-        technical_terms = 0
-        for category, keywords in self.technical_keywords.items():
-            for keyword in keywords:
-                if keyword.lower() in answer.lower():
-                    technical_terms += 1
-        
-        # Soft skills count
-        soft_skills = 0
-        for category, keywords in self.soft_skills.items():
-            for keyword in keywords:
-                if keyword.lower() in answer.lower():
-                    soft_skills += 1
-        
-        # Examples and specifics
-        examples = 0
-        for indicator in self.behavioral_indicators['specific_examples']:
-            if indicator.lower() in answer.lower():
-                examples += 1
+        # Keyword counts (distinct keywords per group)
+        technical_terms = prepared.count('technical')
+        soft_skills = prepared.count('soft_skills')
+        examples = prepared.count('examples')
         
         # Structure score (based on STAR method and organization)
-        structure_score = self._calculate_structure_score(answer)
+        structure_score = self._calculate_structure_score(prepared)
         
         # Relevance score (keyword matching and context)
-        relevance_score = self._calculate_relevance_score(answer, technical_terms, soft_skills)
+        relevance_score = self._calculate_relevance_score(prepared, technical_terms, soft_skills)
         
         # Depth score (detail level and elaboration)
         depth_score = self._calculate_depth_score(len(words), sentences, unique_words, examples)
         
         # Clarity score (readability and coherence)
-        clarity_score = self._calculate_clarity_score(answer)
+        clarity_score = self._calculate_clarity_score(prepared)
         
-        # Sentiment analysis
+        # Sentiment analysis (-1 to 1)
         try:
-            blob = TextBlob(answer)
-            sentiment_score = blob.sentiment.polarity  # -1 to 1
-        except:
+            sentiment_score = self.sentiment(answer)
+        except Exception as e:
+            logger.warning(f"Sentiment analysis failed: {e}")
             sentiment_score = 0.0
         
         return AnswerMetrics(
@@ -242,29 +455,33 @@ class DynamicInterviewAnalyzer:
             sentiment_score=sentiment_score
         )
     
-    def _calculate_structure_score(self, answer: str) -> float:
+    def _prepare_answer(self, answer: str) -> PreparedAnswer:
+        """Lowercase, tokenize and keyword-match an answer once"""
+        lower = answer.lower()
+        return PreparedAnswer(
+            text=answer,
+            lower=lower,
+            words=lower.split(),
+            matches=self.keyword_matcher.match(tokenize(lower))
+        )
+    
+    def _calculate_structure_score(self, prepared: PreparedAnswer) -> float:
         """Calculate how well-structured the answer is"""
         score = 50.0  # Base score
         
         # Check for STAR method elements
-        star_elements = 0
-        for element in self.behavioral_indicators['star_method']:
-            if element.lower() in answer.lower():
-                star_elements += 1
-        score += star_elements * 10
+        score += prepared.count('star') * 10
         
         # Check for logical connectors
-        connectors = ['first', 'second', 'then', 'finally', 'however', 'therefore', 'because']
-        connector_count = sum(1 for c in connectors if c in answer.lower())
-        score += min(20, connector_count * 5)
+        score += min(20, prepared.count('connectors') * 5)
         
         # Check for proper paragraphing (if answer is long enough)
-        if len(answer) > 200 and '\n' in answer:
+        if len(prepared.text) > 200 and '\n' in prepared.text:
             score += 10
         
         return min(100, score)
     
-    def _calculate_relevance_score(self, answer: str, technical_terms: int, soft_skills: int) -> float:
+    def _calculate_relevance_score(self, prepared: PreparedAnswer, technical_terms: int, soft_skills: int) -> float:
         """Calculate how relevant the answer is"""
         score = 40.0  # Base score
         
@@ -275,7 +492,7 @@ class DynamicInterviewAnalyzer:
         score += min(20, soft_skills * 4)
         
         # Specific examples boost
-        if any(word in answer.lower() for word in ['example', 'project', 'experience']):
+        if prepared.count('relevance'):
             score += 10
         
         return min(100, score)
@@ -306,8 +523,9 @@ class DynamicInterviewAnalyzer:
         
         return min(100, score)
     
-    def _calculate_clarity_score(self, answer: str) -> float:
+    def _calculate_clarity_score(self, prepared: PreparedAnswer) -> float:
         """Calculate clarity and readability of the answer"""
+        answer = prepared.text
         if not answer:
             return 0.0
         
@@ -323,9 +541,7 @@ class DynamicInterviewAnalyzer:
             score += 10
         
         # Check for clear communication patterns
-        clear_patterns = ['my approach', 'i believe', 'in my experience', 'i would']
-        clarity_count = sum(1 for p in clear_patterns if p in answer.lower())
-        score += min(20, clarity_count * 7)
+        score += min(20, prepared.count('clarity') * 7)
         
         # Penalize for excessive jargon without explanation
         jargon_penalty = 0
@@ -336,16 +552,30 @@ class DynamicInterviewAnalyzer:
         
         return max(0, min(100, score))
     
-    def _identify_question_type(self, question: str) -> str:
-        """Identify the type of question"""
-        question_lower = question.lower()
-        
-        for q_type, pattern in self.question_patterns.items():
-            if re.search(pattern, question_lower):
+    def _identify_question_type(self, question: str, known_types: Optional[Dict[str, str]] = None) -> str:
+        """
+        Identify the type of question. known_types maps normalized question text to
+        types precomputed for the KB; other questions go through the memoized classifier.
+        """
+        normalized = normalize_question(question)
+        if known_types and normalized in known_types:
+            return known_types[normalized]
+        return self._classify_question_memo(normalized)
+    
+    def _classify_question(self, normalized_question: str) -> str:
+        for q_type, pattern in self._compiled_question_patterns:
+            if pattern.search(normalized_question):
                 return q_type
         
         return 'general'
     
+    def classify_questions(self, questions: List[str]) -> List[Dict[str, str]]:
+        """Question types for a fixed question list, to be stored with the KB"""
+        return [
+            {'question': question, 'question_type': self._identify_question_type(question)}
+            for question in questions
+        ]
+    
     def _calculate_quality_scores(self, answer: str, question: str, 
                                  metrics: AnswerMetrics, question_type: str) -> Dict[str, float]:
         """Calculate quality scores based on question type and answer metrics"""
@@ -407,193 +637,18 @@ class DynamicInterviewAnalyzer:
         else:
             return ResponseQuality.POOR
     
-    def _calculate_overall_scores(self, answer_analyses: List[Dict], 
+    def _calculate_overall_scores(self, answer_analyses: List[AnswerAnalysis], 
                                  all_qa_pairs: List[Dict], 
-                                 candidate_info: Dict) -> Dict[str, float]:
-        """Calculate overall interview scores"""
-        
-        # Initialize scores
-        scores = {
-            'technical': 0,
-            'communication': 0,
-            'problem_solving': 0,
-            'cultural_fit': 0,
-            'overall': 0
-        }
-        
-        if not answer_analyses:
-            return scores
-        
-        # Aggregate metrics from all answers
-        total_technical_terms = sum(a['metrics']['technical_terms'] for a in answer_analyses)
-        total_soft_skills = sum(a['metrics']['soft_skills_mentioned'] for a in answer_analyses)
-        total_examples = sum(a['metrics']['examples_provided'] for a in answer_analyses)
-        avg_clarity = np.mean([a['metrics']['clarity_score'] for a in answer_analyses])
-        avg_depth = np.mean([a['metrics']['depth_score'] for a in answer_analyses])
-        avg_structure = np.mean([a['metrics']['structure_score'] for a in answer_analyses])
-        
-        # Calculate completion rate
-        completion_rate = len(answer_analyses) / max(1, len(all_qa_pairs))
-        
-        # Technical score (based on technical knowledge demonstrated)
-        scores['technical'] = self._calculate_technical_score(
-            total_technical_terms, avg_depth, answer_analyses
-        )
-        
-        # Communication score (based on clarity and structure)
-        scores['communication'] = self._calculate_communication_score(
-            avg_clarity, avg_structure, answer_analyses
-        )
-        
-        # Problem-solving score (based on approach and examples)
-        scores['problem_solving'] = self._calculate_problem_solving_score(
-            total_examples, avg_structure, answer_analyses
-        )
-        
-        # Cultural fit score (based on soft skills and sentiment)
-        scores['cultural_fit'] = self._calculate_cultural_fit_score(
-            total_soft_skills, answer_analyses, completion_rate
-        )
-        
-        # Overall score (weighted average)
-        scores['overall'] = self._calculate_weighted_overall_score(scores, candidate_info)
-        
-        # Apply completion rate penalty
-        if completion_rate < 0.5:
-            penalty = (0.5 - completion_rate) * 20
-            for key in scores:
-                scores[key] = max(0, scores[key] - penalty)
-        
-        # Ensure all scores are within bounds
-        for key in scores:
-            scores[key] = round(min(100, max(0, scores[key])), 1)
-        
-        return scores
-    
-    def _calculate_technical_score(self, technical_terms: int, avg_depth: float, 
-                                  analyses: List[Dict]) -> float:
-        """Calculate technical competency score"""
-        score = 20  # Base score for attempting
-        
-        # Technical terminology usage (max 30 points)
-        score += min(30, technical_terms * 3)
-        
-        # Depth of technical responses (max 25 points)
-        score += avg_depth * 0.25
-        
-        # Quality of technical answers specifically
-        technical_answers = [a for a in analyses if a['question_type'] == 'technical']
-        if technical_answers:
-            tech_quality = np.mean([
-                a['quality_scores'].get('technical', 50) 
-                for a in technical_answers
-            ])
-            score += tech_quality * 0.25
-        
-        return score
+                                 candidate_info: Dict) -> Tuple[Dict[str, float], float]:
+        """Overall interview scores and analysis confidence (same vector code as batch re-scoring)"""
+        batch = AnswerMetricsBatch.from_analyses(answer_analyses)
+        row = score_answer_batch(
+            batch, np.array([len(all_qa_pairs)]), [candidate_info.get('position', '')]
+        )[0]
+        scores = {field: float(row[field]) for field in SCORE_FIELDS}
+        return scores, float(row['confidence'])
     
-    def _calculate_communication_score(self, avg_clarity: float, avg_structure: float, 
-                                      analyses: List[Dict]) -> float:
-        """Calculate communication effectiveness score"""
-        score = 20  # Base score
-        
-        # Clarity (max 40 points)
-        score += avg_clarity * 0.4
-        
-        # Structure (max 30 points)
-        score += avg_structure * 0.3
-        
-        # Consistency across answers (max 10 points)
-        if len(analyses) > 1:
-            clarity_variance = np.var([a['metrics']['clarity_score'] for a in analyses])
-            if clarity_variance < 100:  # Consistent clarity
-                score += 10
-            elif clarity_variance < 200:
-                score += 5
-        
-        return score
-    
-    def _calculate_problem_solving_score(self, total_examples: int, avg_structure: float, 
-                                        analyses: List[Dict]) -> float:
-        """Calculate problem-solving ability score"""
-        score = 20  # Base score
-        
-        # Use of examples (max 35 points)
-        score += min(35, total_examples * 7)
-        
-        # Structured approach (max 25 points)
-        score += avg_structure * 0.25
-        
-        # Quality of situational/behavioral answers
-        relevant_answers = [
-            a for a in analyses 
-            if a['question_type'] in ['behavioral', 'situational']
-        ]
-        if relevant_answers:
-            quality = np.mean([
-                max(a['quality_scores'].values()) 
-                for a in relevant_answers
-            ])
-            score += quality * 0.20
-        
-        return score
-    
-    def _calculate_cultural_fit_score(self, soft_skills: int, analyses: List[Dict], 
-                                     completion_rate: float) -> float:
-        """Calculate cultural fit score"""
-        score = 20  # Base score
-        
-        # Soft skills demonstration (max 30 points)
-        score += min(30, soft_skills * 5)
-        
-        # Positive sentiment (max 20 points)
-        sentiments = [a['metrics']['sentiment_score'] for a in analyses]
-        if sentiments:
-            avg_sentiment = np.mean(sentiments)
-            if avg_sentiment > 0:
-                score += avg_sentiment * 20
-        
-        # Engagement (completion rate) (max 30 points)
-        score += completion_rate * 30
-        
-        return score
-    
-    def _calculate_weighted_overall_score(self, scores: Dict[str, float], 
-                                         candidate_info: Dict) -> float:
-        """Calculate weighted overall score based on position requirements"""
-        position = candidate_info.get('position', '').lower()
-        
-        # Default weights
-        weights = {
-            'technical': 0.35,
-            'communication': 0.25,
-            'problem_solving': 0.25,
-            'cultural_fit': 0.15
-        }
-        
-        # Adjust weights based on position
-        if 'senior' in position or 'lead' in position:
-            weights['technical'] = 0.30
-            weights['communication'] = 0.30
-            weights['problem_solving'] = 0.25
-            weights['cultural_fit'] = 0.15
-        elif 'junior' in position or 'intern' in position:
-            weights['technical'] = 0.25
-            weights['communication'] = 0.25
-            weights['problem_solving'] = 0.20
-            weights['cultural_fit'] = 0.30
-        elif 'manager' in position:
-            weights['technical'] = 0.20
-            weights['communication'] = 0.35
-            weights['problem_solving'] = 0.30
-            weights['cultural_fit'] = 0.15
-        
-        # Calculate weighted average
-        overall = sum(scores[key] * weights[key] for key in weights)
-        
-        return overall
-    
-    def _generate_insights(self, analyses: List[Dict], scores: Dict[str, float]) -> Dict:
+    def _generate_insights(self, analyses: List[AnswerAnalysis], scores: Dict[str, float]) -> Dict:
         """Generate actionable insights from the analysis"""
         insights = {
             'strengths': [],
@@ -623,17 +678,17 @@ class DynamicInterviewAnalyzer:
             insights['weaknesses'].append("May not align well with team culture")
         
         # Check for specific patterns
-        total_examples = sum(a['metrics']['examples_provided'] for a in analyses)
+        total_examples = sum(a.metrics.examples_provided for a in analyses)
         if total_examples == 0:
             insights['weaknesses'].append("No specific examples provided")
             insights['recommendations'].append("Follow up with behavioral questions requiring specific examples")
         
         # Response quality analysis
-        poor_responses = [a for a in analyses if a['response_quality'] == 'poor']
+        poor_responses = [a for a in analyses if a.response_quality == ResponseQuality.POOR]
         if len(poor_responses) > len(analyses) * 0.3:
             insights['red_flags'].append("High percentage of poor quality responses")
         
-        no_responses = [a for a in analyses if a['response_quality'] == 'no_response']
+        no_responses = [a for a in analyses if a.response_quality == ResponseQuality.NO_RESPONSE]
         if len(no_responses) > 0:
             insights['red_flags'].append(f"Failed to answer {len(no_responses)} question(s)")
         
@@ -669,12 +724,12 @@ class DynamicInterviewAnalyzer:
         else:
             return "REJECT"
     
-    def _generate_comprehensive_feedback(self, analyses: List[Dict], scores: Dict[str, float], 
+    def _generate_comprehensive_feedback(self, analyses: List[AnswerAnalysis], scores: Dict[str, float], 
                                         insights: Dict, candidate_info: Dict) -> str:
         """Generate detailed feedback report"""
         
         total_questions = len(analyses)
-        avg_word_count = np.mean([a['metrics']['word_count'] for a in analyses]) if analyses else 0
+        avg_word_count = np.mean([a.metrics.word_count for a in analyses]) if analyses else 0
         
         feedback = f"""
 DYNAMIC INTERVIEW ANALYSIS REPORT
@@ -703,7 +758,7 @@ RESPONSE METRICS
 """
         
         # Add response quality distribution
-        quality_dist = Counter(a['response_quality'] for a in analyses)
+        quality_dist = Counter(a.response_quality.value for a in analyses)
         for quality, count in quality_dist.items():
             percentage = (count / total_questions) * 100
             feedback += f"  - {quality.replace('_', ' ').title()}: {count} ({percentage:.0f}%)\n"
@@ -776,43 +831,6 @@ to demonstrate the necessary competencies for success in this role.
         
         return feedback.strip()
     
-    def _calculate_confidence(self, analyses: List[Dict]) -> float:
-        """Calculate confidence level of the analysis"""
-        if not analyses:
-            return 0.0
-        
-        # Factors affecting confidence
-        factors = []
-        
-        # Number of questions answered
-        answer_count = len(analyses)
-        if answer_count >= 10:
-            factors.append(1.0)
-        elif answer_count >= 5:
-            factors.append(0.8)
-        else:
-            factors.append(0.5)
-        
-        # Average response length
-        avg_words = np.mean([a['metrics']['word_count'] for a in analyses])
-        if avg_words >= 50:
-            factors.append(1.0)
-        elif avg_words >= 25:
-            factors.append(0.7)
-        else:
-            factors.append(0.4)
-        
-        # Response quality consistency
-        qualities = [a['response_quality'] for a in analyses]
-        if len(set(qualities)) == 1:  # All same quality
-            factors.append(0.9)
-        elif len(set(qualities)) <= 2:
-            factors.append(0.7)
-        else:
-            factors.append(0.5)
-        
-        return min(1.0, np.mean(factors))
-    
     def _generate_no_response_analysis(self) -> Dict[str, Any]:
         """Generate analysis for interviews with no valid responses"""
         return {
@@ -849,6 +867,336 @@ RECOMMENDATION: Schedule a follow-up interview to properly assess the candidate.
         }
 
 
+QUESTION_TYPES = ['technical', 'behavioral', 'situational', 'knowledge', 'cultural', 'general']
+RESPONSE_QUALITIES = [q.value for q in ResponseQuality]
+SCORE_FIELDS = ['technical', 'communication', 'problem_solving', 'cultural_fit', 'overall']
+# interview_scoring_method of candidates scored by this module
+SCORING_METHOD = 'dynamic_content_analysis'
+
+# One row per answered question
+ANSWER_METRICS_DTYPE = np.dtype([
+    ('interview', np.int32),
+    ('word_count', np.int32),
+    ('sentence_count', np.int32),
+    ('unique_words', np.int32),
+    ('technical_terms', np.int32),
+    ('soft_skills_mentioned', np.int32),
+    ('examples_provided', np.int32),
+    ('structure_score', np.float64),
+    ('relevance_score', np.float64),
+    ('depth_score', np.float64),
+    ('clarity_score', np.float64),
+    ('sentiment_score', np.float64),
+    ('response_time', np.float64),
+    ('question_type', np.int8),
+    ('quality_score', np.float64),
+    ('response_quality', np.int8),
+])
+_METRIC_FIELDS = [f for f in ANSWER_METRICS_DTYPE.names
+                  if f not in ('interview', 'question_type', 'quality_score', 'response_quality')]
+
+# One row per interview
+INTERVIEW_SCORES_DTYPE = np.dtype([(field, np.float64) for field in SCORE_FIELDS] + [
+    ('confidence', np.float64),
+    ('answered', np.int32),
+])
+
+
+class AnswerMetricsBatch:
+    """Columnar AnswerMetrics for many answers across interviews, one NumPy structured array"""
+    __slots__ = ('data',)
+
+    def __init__(self, data: Optional[np.ndarray] = None):
+        self.data = data if data is not None else np.zeros(0, dtype=ANSWER_METRICS_DTYPE)
+
+    @staticmethod
+    def _row(interview: int, analysis: AnswerAnalysis) -> tuple:
+        metrics = analysis.metrics
+        return (interview, *(getattr(metrics, f) for f in _METRIC_FIELDS),
+                QUESTION_TYPES.index(analysis.question_type),
+                analysis.quality_score,
+                RESPONSE_QUALITIES.index(analysis.response_quality.value))
+
+    @classmethod
+    def from_analyses(cls, analyses: List[AnswerAnalysis], interview: int = 0) -> 'AnswerMetricsBatch':
+        return cls(np.array([cls._row(interview, a) for a in analyses], dtype=ANSWER_METRICS_DTYPE))
+
+    @classmethod
+    def from_interviews(cls, interviews: List[List[AnswerAnalysis]]) -> 'AnswerMetricsBatch':
+        return cls(np.array([cls._row(index, a) for index, analyses in enumerate(interviews) for a in analyses],
+                            dtype=ANSWER_METRICS_DTYPE))
+
+    def __len__(self) -> int:
+        return len(self.data)
+
+    def __getitem__(self, field: str) -> np.ndarray:
+        return self.data[field]
+
+    def metrics(self, i: int) -> AnswerMetrics:
+        row = self.data[i]
+        return AnswerMetrics(**{f: row[f].item() for f in _METRIC_FIELDS})
+
+    def to_dicts(self) -> List[Dict]:
+        """Per-answer metrics in the legacy dict shape"""
+        return [asdict(self.metrics(i)) for i in range(len(self.data))]
+
+
+def score_answer_batch(batch: AnswerMetricsBatch, total_questions: np.ndarray, positions: List[str],
+                       weights: Optional[Dict[str, float]] = None) -> np.ndarray:
+    """
+    Interview scores and confidence for every interview in the batch as vector
+    operations. total_questions/positions are per interview; weights override
+    the position-based weights.
+    """
+    n = len(total_questions)
+    result = np.zeros(n, dtype=INTERVIEW_SCORES_DTYPE)
+    if n == 0:
+        return result
+
+    answers = batch.data
+    idx = answers['interview']
+    answered = np.bincount(idx, minlength=n).astype(np.float64)
+    has_answers = answered > 0
+    safe_count = np.maximum(answered, 1)
+
+    def total(field, mask=None):
+        values = answers[field].astype(np.float64)
+        if mask is not None:
+            values = values * mask
+        return np.bincount(idx, weights=values, minlength=n)
+
+    def mean(field):
+        return total(field) / safe_count
+
+    avg_depth = mean('depth_score')
+    avg_clarity = mean('clarity_score')
+    avg_structure = mean('structure_score')
+    avg_sentiment = mean('sentiment_score')
+    avg_words = mean('word_count')
+    clarity_var = total('clarity_score', answers['clarity_score']) / safe_count - avg_clarity ** 2
+    completion = answered / np.maximum(total_questions, 1)
+
+    technical_mask = answers['question_type'] == QUESTION_TYPES.index('technical')
+    scenario_mask = np.isin(answers['question_type'],
+                            [QUESTION_TYPES.index('behavioral'), QUESTION_TYPES.index('situational')])
+    technical_count = np.bincount(idx, weights=technical_mask.astype(np.float64), minlength=n)
+    scenario_count = np.bincount(idx, weights=scenario_mask.astype(np.float64), minlength=n)
+    technical_quality = total('quality_score', technical_mask) / np.maximum(technical_count, 1)
+    scenario_quality = total('quality_score', scenario_mask) / np.maximum(scenario_count, 1)
+
+    # Technical: terminology (max 30), depth (max 25), technical answer quality
+    technical = (20 + np.minimum(30, total('technical_terms') * 3) + avg_depth * 0.25
+                 + np.where(technical_count > 0, technical_quality * 0.25, 0))
+    # Communication: clarity (max 40), structure (max 30), consistency across answers (max 10)
+    communication = (20 + avg_clarity * 0.4 + avg_structure * 0.3
+                     + np.where(answered > 1,
+                                np.where(clarity_var < 100, 10, np.where(clarity_var < 200, 5, 0)), 0))
+    # Problem solving: examples (max 35), structure (max 25), behavioral/situational quality
+    problem_solving = (20 + np.minimum(35, total('examples_provided') * 7) + avg_structure * 0.25
+                       + np.where(scenario_count > 0, scenario_quality * 0.20, 0))
+    # Cultural fit: soft skills (max 30), positive sentiment (max 20), engagement (max 30)
+    cultural_fit = (20 + np.minimum(30, total('soft_skills_mentioned') * 5)
+                    + np.maximum(avg_sentiment, 0) * 20 + completion * 30)
+
+    weight_matrix = np.array([
+        [w['technical'], w['communication'], w['problem_solving'], w['cultural_fit']]
+        for w in (weights or score_weights_for_position(p) for p in positions)
+    ])
+    components = np.stack([technical, communication, problem_solving, cultural_fit], axis=1)
+    overall = (components * weight_matrix).sum(axis=1)
+
+    # Completion rate penalty, then bounds
+    penalty = np.where(completion < 0.5, (0.5 - completion) * 20, 0)
+    for field, values in zip(SCORE_FIELDS, (technical, communication, problem_solving, cultural_fit, overall)):
+        values = np.maximum(0, values - penalty)
+        result[field] = np.where(has_answers, np.round(np.clip(values, 0, 100), 1), 0)
+
+    # Confidence: answer count, response length, spread of response qualities
+    quality_counts = np.zeros((n, len(RESPONSE_QUALITIES)), dtype=np.int32)
+    np.add.at(quality_counts, (idx, answers['response_quality']), 1)
+    distinct_qualities = (quality_counts > 0).sum(axis=1)
+    count_factor = np.select([answered >= 10, answered >= 5], [1.0, 0.8], 0.5)
+    length_factor = np.select([avg_words >= 50, avg_words >= 25], [1.0, 0.7], 0.4)
+    spread_factor = np.select([distinct_qualities == 1, distinct_qualities <= 2], [0.9, 0.7], 0.5)
+    confidence = np.minimum(1.0, (count_factor + length_factor + spread_factor) / 3)
+    result['confidence'] = np.where(has_answers, confidence, 0.0)
+    result['answered'] = answered
+    return result
+
+
+class BatchInterviewScorer:
+    """
+    Re-scores many interviews at once: per-answer text metrics come from
+    DynamicInterviewAnalyzer, aggregation runs through score_answer_batch over
+    all answers of all interviews together.
+    """
+
+    def __init__(self, analyzer: Optional[DynamicInterviewAnalyzer] = None, weights: Optional[Dict] = None):
+        self.analyzer = analyzer or DynamicInterviewAnalyzer()
+        self.weights = weights  # overrides position-based weights when given
+
+    def extract_metrics(self, interviews: List[List[Dict]],
+                        question_types: Optional[List[Optional[Dict[str, str]]]] = None
+                        ) -> Tuple[AnswerMetricsBatch, np.ndarray]:
+        """
+        Columnar metrics for a list of interviews (each a list of Q&A dicts).
+        question_types optionally gives each interview's precomputed KB question types.
+        Returns (answer metrics batch, total_questions per interview).
+        """
+        total_questions = np.array([len(qa_pairs or []) for qa_pairs in interviews], dtype=np.int32)
+        return AnswerMetricsBatch.from_interviews(self.analyze_answers(interviews, question_types)), total_questions
+
+    def analyze_answers(self, interviews: List[List[Dict]],
+                        question_types: Optional[List[Optional[Dict[str, str]]]] = None) -> List[List[AnswerAnalysis]]:
+        """Per-answer analyses of every answered question, one list per interview"""
+        question_types = question_types or [None] * len(interviews)
+        return [
+            [self.analyzer._analyze_single_qa(qa, {'question_types': known}) for qa in (qa_pairs or [])
+             if qa.get('answer') and qa['answer'].strip()]
+            for qa_pairs, known in zip(interviews, question_types)
+        ]
+
+    def describe(self, analyses: List[AnswerAnalysis], row, candidate_info: Dict) -> Tuple[Dict, str]:
+        """Insights and feedback text for one scored interview, as analyze_interview produces them"""
+        if not analyses:
+            no_response = self.analyzer._generate_no_response_analysis()
+            return no_response['insights'], no_response['feedback']
+        scores = {field: float(row[field]) for field in SCORE_FIELDS}
+        insights = self.analyzer._generate_insights(analyses, scores)
+        return insights, self.analyzer._generate_comprehensive_feedback(analyses, scores, insights, candidate_info)
+
+    def score(self, batch: AnswerMetricsBatch, total_questions: np.ndarray, positions: List[str]) -> np.ndarray:
+        return score_answer_batch(batch, total_questions, positions, self.weights)
+
+    def score_interviews(self, interviews: List[List[Dict]], positions: List[str],
+                         question_types: Optional[List[Optional[Dict[str, str]]]] = None) -> np.ndarray:
+        batch, total_questions = self.extract_metrics(interviews, question_types)
+        return self.score(batch, total_questions, positions)
+
+
+def rescore_all_interviews(job_id: Optional[str] = None, weights: Optional[Dict] = None,
+                           sentiment_backend: Optional[str] = None, batch_size: int = 500,
+                           include_other_methods: bool = False) -> int:
+    """
+    Re-score every completed, already analyzed interview with stored Q&A pairs
+    using the batch engine and write scores, insights and feedback back with
+    one executemany UPDATE per batch. Interviews still in progress or waiting
+    for analysis are left to the analysis service, and only interviews scored
+    by this analyzer are touched unless include_other_methods is set (that
+    replaces LLM / production rule scores). Returns the number of candidates updated.
+    """
+    from db import SessionLocal, Candidate
+    from sqlalchemy import update
+    from sqlalchemy.orm import load_only
+
+    scorer = BatchInterviewScorer(DynamicInterviewAnalyzer(sentiment_backend=sentiment_backend), weights)
+    session = SessionLocal()
+    updated = 0
+    last_id = 0
+    try:
+        while True:
+            query = session.query(Candidate).options(
+                load_only(Candidate.id, Candidate.name, Candidate.job_title, Candidate.interview_qa_pairs,
+                          Candidate.interview_kb_questions)
+            ).filter(
+                Candidate.id > last_id,
+                Candidate.interview_qa_pairs.isnot(None),
+                Candidate.interview_completed_at.isnot(None),
+                Candidate.interview_ai_analysis_status == 'completed'
+            )
+            if not include_other_methods:
+                query = query.filter(Candidate.interview_scoring_method == SCORING_METHOD)
+            if job_id:
+                query = query.filter(Candidate.job_id == str(job_id))
+            candidates = query.order_by(Candidate.id).limit(batch_size).all()
+            if not candidates:
+                break
+            last_id = candidates[-1].id
+
+            ids, names, interviews, positions, question_types = [], [], [], [], []
+            for candidate in candidates:
+                try:
+                    qa_pairs = json.loads(candidate.interview_qa_pairs or '[]')
+                except (TypeError, ValueError):
+                    continue
+                if not qa_pairs:
+                    continue
+                ids.append(candidate.id)
+                names.append(candidate.name)
+                interviews.append(qa_pairs)
+                positions.append(candidate.job_title or '')
+                question_types.append(known_question_types(candidate.interview_kb_questions))
+            session.expunge_all()
+            if not ids:
+                continue
+
+            analyses = scorer.analyze_answers(interviews, question_types)
+            total_questions = np.array([len(qa_pairs) for qa_pairs in interviews], dtype=np.int32)
+            scores = scorer.score(AnswerMetricsBatch.from_interviews(analyses), total_questions, positions)
+            rows = []
+            for candidate_id, name, position, answer_analyses, row in zip(ids, names, positions, analyses, scores):
+                insights, feedback = scorer.describe(answer_analyses, row, {'name': name, 'position': position})
+                rows.append(_rescored_row(candidate_id, row, insights, feedback))
+
+            # ORM bulk UPDATE by primary key -> a single executemany
+            session.execute(update(Candidate), rows)
+            session.commit()
+            updated += len(rows)
+            logger.info(f"Re-scored {updated} interviews (last id {last_id})")
+
+        return updated
+    except Exception:
+        session.rollback()
+        raise
+    finally:
+        session.close()
+
+
+def _rescored_row(candidate_id: int, row, insights: Dict, feedback: str) -> Dict:
+    """UPDATE values for one re-scored candidate, matching what integrate_with_backend stores"""
+    return {
+        'id': candidate_id,
+        'interview_ai_score': float(row['overall']),
+        'interview_ai_technical_score': float(row['technical']),
+        'interview_ai_communication_score': float(row['communication']),
+        'interview_ai_problem_solving_score': float(row['problem_solving']),
+        'interview_ai_cultural_fit_score': float(row['cultural_fit']),
+        'interview_confidence_score': float(row['confidence']),
+        'interview_ai_strengths': json.dumps(insights['strengths']),
+        'interview_ai_weaknesses': json.dumps(insights['weaknesses']),
+        'interview_ai_overall_feedback': feedback,
+        'interview_final_status': 'Passed' if row['overall'] >= 60 else 'Failed',
+        'interview_scoring_method': SCORING_METHOD
+    }
+
+
+def known_question_types(kb_questions) -> Dict[str, str]:
+    """normalized question -> type from a stored KB question list (JSON string or list)"""
+    if not kb_questions:
+        return {}
+    if isinstance(kb_questions, str):
+        try:
+            kb_questions = json.loads(kb_questions)
+        except ValueError:
+            return {}
+    return {
+        normalize_question(item['question']): item['question_type']
+        for item in kb_questions
+        if item.get('question') and item.get('question_type') in QUESTION_TYPES
+    }
+
+
+_default_analyzer = None
+
+
+def get_default_analyzer() -> DynamicInterviewAnalyzer:
+    """Shared analyzer so compiled patterns and the question-type memo persist across interviews"""
+    global _default_analyzer
+    if _default_analyzer is None:
+        _default_analyzer = DynamicInterviewAnalyzer()
+    return _default_analyzer
+
+
 def analyze_interview_production(qa_pairs: List[Dict], candidate_info: Dict) -> Dict[str, Any]:
     """
     Production entry point for interview analysis
@@ -860,8 +1208,7 @@ def analyze_interview_production(qa_pairs: List[Dict], candidate_info: Dict) ->
     Returns:
         Complete analysis with scores, insights, and recommendations
     """
-    analyzer = DynamicInterviewAnalyzer()
-    return analyzer.analyze_interview(qa_pairs, candidate_info)
+    return get_default_analyzer().analyze_interview(qa_pairs, candidate_info)
 
 
 # Integration with your backend
@@ -888,7 +1235,8 @@ def integrate_with_backend(candidate_id: int):
             'name': candidate.name,
             'position': candidate.job_title,
             'email': candidate.email,
-            'company': 'ABC D'  # Your company name
+            'company': 'ABC D',  # Your company name
+            'question_types': known_question_types(candidate.interview_kb_questions)
         }
         
         # Perform analysis
@@ -912,7 +1260,7 @@ def integrate_with_backend(candidate_id: int):
         
         # Update confidence and method
         candidate.interview_confidence_score = analysis['metadata']['confidence']
-        candidate.interview_scoring_method = 'dynamic_content_analysis'
+        candidate.interview_scoring_method = SCORING_METHOD
         
         session.commit()
         
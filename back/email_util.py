@@ -1,5 +1,8 @@
 import os
+import time
+import queue
 import smtplib
+import threading
 from email.mime.text import MIMEText
 from email.mime.multipart import MIMEMultipart
 from datetime import datetime
@@ -551,4 +554,66 @@ def send_welcome_email(candidate) -> bool:
         
     except Exception as e:
         logger.error(f"Failed to send welcome email to {candidate.email}: {e}")
-        return False
\ No newline at end of file
+        return False
+
+class EmailOutbox:
+    """
+    Sends emails on a background thread so callers can queue them after
+    their DB commit instead of holding a transaction open across SMTP.
+    send_func(*args) is retried while it returns a falsy result or raises.
+    """
+
+    def __init__(self, max_attempts: int = 3, retry_delay: float = 5.0):
+        self.max_attempts = max_attempts
+        self.retry_delay = retry_delay
+        self._queue = queue.Queue()
+        self._thread = None
+        self._lock = threading.Lock()
+        self.stats = {'queued': 0, 'sent': 0, 'failed': 0}
+
+    def enqueue(self, send_func, *args, description: str = ""):
+        with self._lock:
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(target=self._worker, name="EmailOutbox", daemon=True)
+                self._thread.start()
+            self.stats['queued'] += 1
+        self._queue.put((send_func, args, description or send_func.__name__))
+
+    def _worker(self):
+        while True:
+            send_func, args, description = self._queue.get()
+            try:
+                for attempt in range(1, self.max_attempts + 1):
+                    try:
+                        if send_func(*args):
+                            self.stats['sent'] += 1
+                            break
+                    except Exception as e:
+                        logger.warning(f"Email '{description}' attempt {attempt} failed: {e}")
+                    if attempt < self.max_attempts:
+                        time.sleep(self.retry_delay * attempt)
+                else:
+                    self.stats['failed'] += 1
+                    logger.error(f"Giving up on email '{description}' after {self.max_attempts} attempts")
+            finally:
+                self._queue.task_done()
+
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        """Block until every queued email has been handled (for CLI runs that exit afterwards)"""
+        deadline = time.monotonic() + timeout if timeout is not None else None
+        with self._queue.all_tasks_done:
+            while self._queue.unfinished_tasks:
+                remaining = deadline - time.monotonic() if deadline is not None else None
+                if remaining is not None and remaining <= 0:
+                    return False
+                self._queue.all_tasks_done.wait(remaining)
+        return True
+
+    def pending(self) -> int:
+        return self._queue.unfinished_tasks
+
+
+email_outbox = EmailOutbox(
+    max_attempts=int(os.getenv("EMAIL_SEND_ATTEMPTS", "3")),
+    retry_delay=float(os.getenv("EMAIL_RETRY_DELAY_SECONDS", "5"))
+)
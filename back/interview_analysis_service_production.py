@@ -6,14 +6,20 @@ import traceback
 from datetime import datetime, timedelta
 from typing import Dict, List, Optional, Any, Tuple
 import threading
-from concurrent.futures import ThreadPoolExecutor, as_completed
+import itertools
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass
 from enum import Enum
-import queue
 import os
 import re
+import socket
 
 from db import SessionLocal, Candidate
+from analysis_job_queue import AnalysisJobQueue
+from background_scheduler import scheduler
+from interview_event_log import materialize_interview_views
+from dynamic_interview_analyzer import QUESTION_TYPES, known_question_types, normalize_question
+from cache_invalidation import invalidate_candidate
 from sqlalchemy.exc import SQLAlchemyError
 from flask_caching import Cache
 
@@ -34,6 +40,7 @@ class AnalysisTask:
     retry_count: int = 0
     max_retries: int = 3
     created_at: datetime = None
+    job: Any = None  # leased AnalysisJob row
     
     def __post_init__(self):
         if self.created_at is None:
@@ -44,22 +51,29 @@ class ProductionInterviewAnalysisService:
     
     def __init__(self, cache: Cache = None, max_workers: int = 4):
         self.cache = cache
-        self.executor = ThreadPoolExecutor(max_workers=max_workers)
-        self.analysis_queue = queue.PriorityQueue()
         self.is_running = False
-        self.monitor_thread = None
-        self.worker_threads = []
-        self.failed_analyses = {}
-        self.completed_analyses = set()
         self._lock = threading.Lock()
+        self._work_available = threading.Event()
+        self.dispatcher_thread = None
+        self._in_flight = 0
+        self._claim_ids = itertools.count(1)
+        self._openai_client = None
+        self.worker_id = f"{socket.gethostname()}:{os.getpid()}"
         
         # Configuration
         self.config = {
-            'monitor_interval': int(os.getenv('ANALYSIS_MONITOR_INTERVAL', '30')),
+            # Completions are pushed through notify_interview_completed; polling only reconciles
+            'monitor_interval': int(os.getenv('ANALYSIS_MONITOR_INTERVAL', '300')),
             'max_retries': int(os.getenv('ANALYSIS_MAX_RETRIES', '3')),
             'retry_delay': int(os.getenv('ANALYSIS_RETRY_DELAY', '300')),
+            'max_retry_delay': int(os.getenv('ANALYSIS_MAX_RETRY_DELAY', '3600')),
+            'lease_seconds': int(os.getenv('ANALYSIS_LEASE_SECONDS', '900')),
+            'queue_poll_interval': float(os.getenv('ANALYSIS_QUEUE_POLL_INTERVAL', '5')),
+            'job_retention_hours': int(os.getenv('ANALYSIS_JOB_RETENTION_HOURS', '168')),
             'stale_threshold': int(os.getenv('ANALYSIS_STALE_THRESHOLD', '3600')),
             'batch_size': int(os.getenv('ANALYSIS_BATCH_SIZE', '10')),
+            'max_workers': int(os.getenv('ANALYSIS_MAX_WORKERS', str(max_workers))),
+            'ai_max_concurrency': int(os.getenv('ANALYSIS_AI_MAX_CONCURRENCY', '4')),
             'min_questions': int(os.getenv('MIN_INTERVIEW_QUESTIONS', '5')),
             'min_valid_answers': int(os.getenv('MIN_VALID_ANSWERS', '5')),
             'min_answer_length': int(os.getenv('MIN_ANSWER_LENGTH', '30')),
@@ -67,6 +81,25 @@ class ProductionInterviewAnalysisService:
             'validity_threshold': float(os.getenv('VALIDITY_THRESHOLD', '0.7'))
         }
         
+        self.config['max_workers'] = max(1, self.config['max_workers'])
+        
+        # Analyses run on the executor; it only starts threads as due jobs are dispatched
+        self.executor = ThreadPoolExecutor(
+            max_workers=self.config['max_workers'],
+            thread_name_prefix="AnalysisWorker"
+        )
+        # Bounds in-flight OpenAI requests independently of the worker count
+        self._ai_semaphore = threading.BoundedSemaphore(self.config['ai_max_concurrency'])
+        
+        # Shared across backend processes through the analysis_jobs table
+        self.job_queue = AnalysisJobQueue(
+            lease_seconds=self.config['lease_seconds'],
+            max_attempts=self.config['max_retries'] + 1,
+            retry_base_delay=self.config['retry_delay'],
+            retry_max_delay=self.config['max_retry_delay'],
+            retention_hours=self.config['job_retention_hours']
+        )
+        
         # Invalid response patterns - CRITICAL FOR YOUR ISSUE
         self.invalid_patterns = [
             'INIT_INTERVIEW', 'TEST', 'TEST_RESPONSE', 'undefined', 'null',
@@ -100,88 +133,140 @@ class ProductionInterviewAnalysisService:
             
         self.is_running = True
         
-        # Start monitor thread
-        self.monitor_thread = threading.Thread(
-            target=self._monitor_loop,
-            name="AnalysisMonitor",
+        # Reconciliation runs on the shared background scheduler
+        scheduler.register('analysis_reconcile', self._reconcile,
+                           interval=self.config['monitor_interval'], run_immediately=True)
+        scheduler.start()
+        
+        self.dispatcher_thread = threading.Thread(
+            target=self._dispatch_loop,
+            name="AnalysisDispatcher",
             daemon=True
         )
-        self.monitor_thread.start()
-        
-        # Start worker threads
-        for i in range(2):
-            worker = threading.Thread(
-                target=self._worker_loop,
-                name=f"AnalysisWorker-{i}",
-                daemon=True
-            )
-            worker.start()
-            self.worker_threads.append(worker)
+        self.dispatcher_thread.start()
             
-        logger.info(f"Interview Analysis Service started with {len(self.worker_threads)} workers")
+        logger.info(f"Interview Analysis Service started (up to {self.config['max_workers']} concurrent analyses)")
     
     def stop(self):
         """Stop the analysis service gracefully"""
         logger.info("Stopping Interview Analysis Service...")
         self.is_running = False
-        
-        if self.monitor_thread:
-            self.monitor_thread.join(timeout=5)
+        self._work_available.set()
+        scheduler.unregister('analysis_reconcile')
             
-        for worker in self.worker_threads:
-            worker.join(timeout=5)
+        if self.dispatcher_thread:
+            self.dispatcher_thread.join(timeout=5)
             
         self.executor.shutdown(wait=True)
         logger.info("Interview Analysis Service stopped")
     
-    def _monitor_loop(self):
-        """Monitor for interviews needing analysis"""
+    def _reconcile(self, ctx=None):
+        """Low-frequency reconciliation for completions that were never notified"""
+        self._check_pending_interviews()
+        self._check_stale_analyses()
+        self.job_queue.sweep()
+    
+    def queue_analysis(self, candidate_id: int, priority: int = 5) -> bool:
+        """Queue a candidate unless it is already queued or its analysis already finished"""
+        return self._enqueue(candidate_id, priority=priority)
+    
+    def notify_interview_completed(self, candidate_id: int) -> bool:
+        """
+        Queue analysis for an interview that just finished. Call after the
+        completion is committed; a finished earlier analysis is re-opened since
+        the interview data changed.
+        """
+        try:
+            queued = self._enqueue(candidate_id, priority=1, force=True)
+            if queued:
+                logger.info(f"Queued analysis for completed interview of candidate {candidate_id}")
+            return queued
+        except Exception as e:
+            # The reconciliation sweep still picks the interview up
+            logger.error(f"Failed to queue analysis for candidate {candidate_id}: {e}")
+            return False
+    
+    def _dispatch_loop(self):
+        """
+        Claim due jobs and hand them to the executor while it has free slots, so
+        concurrency follows the backlog up to max_workers. Wakes on local
+        enqueues and finished analyses, otherwise polls for work queued by
+        other processes.
+        """
         while self.is_running:
             try:
-                self._check_pending_interviews()
-                self._check_stale_analyses()
-                self._retry_failed_analyses()
+                self._work_available.clear()
+                while self.is_running:
+                    with self._lock:
+                        if self._in_flight >= self.config['max_workers']:
+                            break
+                    owner = f"{self.worker_id}:{next(self._claim_ids)}"
+                    task = self._claim_task(owner)
+                    if task is None:
+                        break
+                    with self._lock:
+                        self._in_flight += 1
+                    self.executor.submit(self._run_task, task, owner)
             except Exception as e:
-                logger.error(f"Monitor loop error: {e}", exc_info=True)
+                logger.error(f"Dispatch loop error: {e}", exc_info=True)
             
-            time.sleep(self.config['monitor_interval'])
+            self._work_available.wait(timeout=self.config['queue_poll_interval'])
     
-    def _worker_loop(self):
-        """Process analysis tasks from queue"""
-        while self.is_running:
-            try:
-                priority, task = self.analysis_queue.get(timeout=5)
-                if task:
-                    self._process_analysis_task(task)
-            except queue.Empty:
-                continue
-            except Exception as e:
-                logger.error(f"Worker loop error: {e}", exc_info=True)
+    def _run_task(self, task: AnalysisTask, owner: str):
+        try:
+            self._process_analysis_task(task, owner)
+        except Exception as e:
+            logger.error(f"Analysis task error for candidate {task.candidate_id}: {e}", exc_info=True)
+        finally:
+            with self._lock:
+                self._in_flight -= 1
+            self._work_available.set()
+    
+    def _claim_task(self, owner: str) -> Optional[AnalysisTask]:
+        job = self.job_queue.claim(owner)
+        if job is None:
+            return None
+        return AnalysisTask(
+            candidate_id=job.candidate_id,
+            priority=job.priority,
+            retry_count=job.attempts - 1,
+            max_retries=job.max_attempts - 1,
+            created_at=job.created_at,
+            job=job
+        )
+    
+    def _enqueue(self, candidate_id: int, priority: int, force: bool = False) -> bool:
+        queued = self.job_queue.enqueue(candidate_id, priority=priority, force=force)
+        if queued:
+            self._work_available.set()
+        return queued
     
     def _check_pending_interviews(self):
-        """Check for interviews that need analysis"""
+        """Queue completed interviews that have not been picked up, with one batched update"""
         session = SessionLocal()
         try:
-            candidates = session.query(Candidate).filter(
+            rows = session.query(Candidate.id, Candidate.interview_completed_at).filter(
                 Candidate.interview_completed_at.isnot(None),
                 Candidate.interview_ai_analysis_status.is_(None) | 
-                (Candidate.interview_ai_analysis_status == AnalysisStatus.PENDING.value),
+                Candidate.interview_ai_analysis_status.in_([
+                    AnalysisStatus.PENDING.value, AnalysisStatus.RETRY.value
+                ]),
                 Candidate.interview_auto_score_triggered == False
             ).limit(self.config['batch_size']).all()
             
-            for candidate in candidates:
-                if candidate.id in self.completed_analyses:
-                    continue
-                    
-                candidate.interview_auto_score_triggered = True
+            if not rows:
+                return
+            
+            # These candidates still need analysis, so re-open jobs that already finished
+            queued_ids = [row.id for row in rows
+                          if self._enqueue(row.id, self._calculate_priority(row.interview_completed_at), force=True)]
+            if queued_ids:
+                session.query(Candidate).filter(
+                    Candidate.id.in_(queued_ids)
+                ).update({Candidate.interview_auto_score_triggered: True}, synchronize_session=False)
                 session.commit()
-                
-                task = AnalysisTask(
-                    candidate_id=candidate.id,
-                    priority=self._calculate_priority(candidate)
-                )
-                self.analysis_queue.put((task.priority, task))
-                logger.info(f"Queued analysis for candidate {candidate.id} ({candidate.name})")
+            
+            logger.info(f"Reconciliation queued {len(queued_ids)} of {len(rows)} un-notified interviews")
                 
         except SQLAlchemyError as e:
             logger.error(f"Database error in pending check: {e}")
@@ -190,72 +275,59 @@ class ProductionInterviewAnalysisService:
             session.close()
     
     def _check_stale_analyses(self):
-        """Check for analyses stuck in processing"""
+        """Flag analyses stuck in processing for retry (single indexed UPDATE)"""
         session = SessionLocal()
         try:
             stale_time = datetime.now() - timedelta(seconds=self.config['stale_threshold'])
             
-            stale_candidates = session.query(Candidate).filter(
+            stale_count = session.query(Candidate).filter(
                 Candidate.interview_ai_analysis_status == AnalysisStatus.PROCESSING.value,
                 Candidate.interview_analysis_started_at < stale_time
-            ).all()
+            ).update({
+                Candidate.interview_ai_analysis_status: AnalysisStatus.RETRY.value,
+                Candidate.interview_auto_score_triggered: False
+            }, synchronize_session=False)
+            session.commit()
             
-            for candidate in stale_candidates:
-                logger.warning(f"Found stale analysis for candidate {candidate.id}")
-                candidate.interview_ai_analysis_status = AnalysisStatus.RETRY.value
-                candidate.interview_auto_score_triggered = False
-                session.commit()
+            if stale_count:
+                logger.warning(f"Flagged {stale_count} stale analyses for retry")
                 
         except SQLAlchemyError as e:
             logger.error(f"Database error in stale check: {e}")
+            session.rollback()
         finally:
             session.close()
     
-    def _retry_failed_analyses(self):
-        """Retry failed analyses after delay"""
-        current_time = datetime.now()
-        
-        with self._lock:
-            retry_candidates = []
-            for candidate_id, failure_info in list(self.failed_analyses.items()):
-                if current_time - failure_info['failed_at'] > timedelta(seconds=self.config['retry_delay']):
-                    if failure_info['retry_count'] < self.config['max_retries']:
-                        retry_candidates.append(candidate_id)
-                        del self.failed_analyses[candidate_id]
-            
-        for candidate_id in retry_candidates:
-            task = AnalysisTask(
-                candidate_id=candidate_id,
-                priority=1,
-                retry_count=self.failed_analyses.get(candidate_id, {}).get('retry_count', 0) + 1
-            )
-            self.analysis_queue.put((task.priority, task))
-            logger.info(f"Retrying analysis for candidate {candidate_id}")
-    
-    def _calculate_priority(self, candidate) -> int:
-        """Calculate task priority (lower = higher priority)"""
+    def _calculate_priority(self, completed_at: Optional[datetime]) -> int:
+        """Calculate task priority from the completion time (lower = higher priority)"""
         priority = 5
-        if candidate.interview_completed_at:
-            hours_ago = (datetime.now() - candidate.interview_completed_at).total_seconds() / 3600
+        if completed_at:
+            # Some completion paths store timezone-aware UTC timestamps
+            if completed_at.tzinfo is not None:
+                completed_at = completed_at.astimezone().replace(tzinfo=None)
+            hours_ago = (datetime.now() - completed_at).total_seconds() / 3600
             if hours_ago < 1:
                 priority = 1
             elif hours_ago < 6:
                 priority = 3
         return priority
     
-    def _process_analysis_task(self, task: AnalysisTask):
+    def _process_analysis_task(self, task: AnalysisTask, owner: str):
         """Process a single analysis task"""
-        logger.info(f"Processing analysis for candidate {task.candidate_id}")
+        logger.info(f"Processing analysis for candidate {task.candidate_id} (attempt {task.retry_count + 1})")
         
         session = SessionLocal()
+        candidate = None
         try:
             candidate = session.query(Candidate).filter_by(id=task.candidate_id).first()
             
             if not candidate:
                 logger.error(f"Candidate {task.candidate_id} not found")
+                self.job_queue.complete(task.job.id, owner)
                 return
             
-            # Update status
+            # Update status (and persist Q&A views from the event log)
+            materialize_interview_views(session, candidate)
             candidate.interview_ai_analysis_status = AnalysisStatus.PROCESSING.value
             candidate.interview_analysis_started_at = datetime.now()
             session.commit()
@@ -265,9 +337,7 @@ class ProductionInterviewAnalysisService:
             
             if analysis_result:
                 self._save_analysis_results(candidate, analysis_result, session)
-                
-                with self._lock:
-                    self.completed_analyses.add(task.candidate_id)
+                self.job_queue.complete(task.job.id, owner)
                 
                 self._send_realtime_update(task.candidate_id, analysis_result)
                 
@@ -278,16 +348,16 @@ class ProductionInterviewAnalysisService:
         except Exception as e:
             logger.error(f"Analysis failed for candidate {task.candidate_id}: {e}", exc_info=True)
             
+            session.rollback()
             if candidate:
-                candidate.interview_ai_analysis_status = AnalysisStatus.FAILED.value
+                # FAILED only once the job has no attempts left; otherwise the queue retries it
+                exhausted = task.job.attempts >= task.job.max_attempts
+                candidate.interview_ai_analysis_status = (
+                    AnalysisStatus.FAILED.value if exhausted else AnalysisStatus.RETRY.value
+                )
                 session.commit()
             
-            with self._lock:
-                self.failed_analyses[task.candidate_id] = {
-                    'failed_at': datetime.now(),
-                    'retry_count': task.retry_count,
-                    'error': str(e)
-                }
+            self.job_queue.fail(task.job, owner, str(e))
         finally:
             session.close()
     
@@ -383,6 +453,7 @@ class ProductionInterviewAnalysisService:
         try:
             # Parse Q&A data
             qa_pairs = self._parse_qa_data_safely(candidate)
+            self._apply_kb_question_types(qa_pairs, candidate)
             
             logger.info(f"Analyzing {len(qa_pairs)} Q&A pairs for candidate {candidate.id}")
             
@@ -411,6 +482,17 @@ class ProductionInterviewAnalysisService:
             logger.error(f"Analysis error: {e}", exc_info=True)
             return self._generate_error_result(str(e))
     
+    def _apply_kb_question_types(self, qa_pairs: List[Dict], candidate):
+        """Tag Q&A pairs with the question types stored when the candidate's KB was created"""
+        known_types = known_question_types(getattr(candidate, 'interview_kb_questions', None))
+        if not known_types:
+            return
+        for qa in qa_pairs:
+            if qa.get('question_type') not in QUESTION_TYPES:
+                question_type = known_types.get(normalize_question(qa.get('question', '')))
+                if question_type:
+                    qa['question_type'] = question_type
+    
     def _parse_qa_data_safely(self, candidate) -> List[Dict]:
         """Safely parse Q&A data from multiple sources"""
         qa_pairs = []
@@ -456,11 +538,17 @@ class ProductionInterviewAnalysisService:
         """Check if AI analysis is available"""
         return bool(os.getenv('OPENAI_API_KEY') or os.getenv('ANTHROPIC_API_KEY'))
     
+    def _get_openai_client(self):
+        """Shared OpenAI client (thread-safe, reuses its HTTP connection pool)"""
+        with self._lock:
+            if self._openai_client is None:
+                from openai import OpenAI
+                self._openai_client = OpenAI(api_key=os.getenv('OPENAI_API_KEY'))
+            return self._openai_client
+    
     def _analyze_with_ai_production(self, qa_pairs: List[Dict], candidate) -> Dict[str, Any]:
         """Production AI analysis with OpenAI"""
-        import openai
-        
-        openai.api_key = os.getenv('OPENAI_API_KEY')
+        client = self._get_openai_client()
         
         qa_text = self._format_qa_for_ai(qa_pairs)
         prompt = self._create_ai_prompt(qa_text, candidate)
@@ -468,16 +556,18 @@ class ProductionInterviewAnalysisService:
         try:
             for attempt in range(3):
                 try:
-                    response = openai.ChatCompletion.create(
-                        model="gpt-3.5-turbo",
-                        messages=[
-                            {"role": "system", "content": self._get_system_prompt()},
-                            {"role": "user", "content": prompt}
-                        ],
-                        temperature=0.3,
-                        max_tokens=1500,
-                        timeout=30
-                    )
+                    # Only the request holds a slot; backoff sleeps below do not
+                    with self._ai_semaphore:
+                        response = client.chat.completions.create(
+                            model="gpt-3.5-turbo",
+                            messages=[
+                                {"role": "system", "content": self._get_system_prompt()},
+                                {"role": "user", "content": prompt}
+                            ],
+                            temperature=0.3,
+                            max_tokens=1500,
+                            timeout=30
+                        )
                     
                     content = response.choices[0].message.content
                     result = self._parse_ai_response(content)
@@ -535,6 +625,14 @@ class ProductionInterviewAnalysisService:
         
         for qa in qa_pairs:
             if qa.get('answer'):
+                question_type = qa.get('question_type')
+                if question_type in QUESTION_TYPES:
+                    # Type stored with the KB
+                    if question_type == 'technical':
+                        technical_questions_answered += 1
+                    elif question_type in ('behavioral', 'situational'):
+                        behavioral_questions_answered += 1
+                    continue
                 question_lower = qa.get('question', '').lower()
                 if any(kw in question_lower for kw in ['technical', 'code', 'implement', 'design']):
                     technical_questions_answered += 1
@@ -852,10 +950,8 @@ Please schedule a new interview with the candidate.
             
             logger.info(f"Saved analysis results for candidate {candidate.id}: Score={results['overall_score']}, Status={candidate.interview_final_status}")
             
-            # Clear caches
-            if self.cache:
-                self.cache.delete(f"candidate_{candidate.id}")
-                self.cache.delete("interview_results")
+            # Clear cached views for this candidate only
+            invalidate_candidate(candidate.id, candidate.job_id)
                 
         except Exception as e:
             logger.error(f"Error saving analysis results: {e}")
@@ -990,11 +1086,8 @@ Always respond with valid JSON format as requested."""
     def analyze_single_interview(self, candidate_id: int) -> bool:
         """Manually trigger analysis for a specific candidate"""
         try:
-            task = AnalysisTask(
-                candidate_id=candidate_id,
-                priority=0
-            )
-            self.analysis_queue.put((task.priority, task))
+            if not self._enqueue(candidate_id, priority=0, force=True):
+                return False
             logger.info(f"Manually queued analysis for candidate {candidate_id}")
             return True
             
@@ -1007,12 +1100,19 @@ Always respond with valid JSON format as requested."""
         with self._lock:
             stats = {
                 'is_running': self.is_running,
-                'queue_size': self.analysis_queue.qsize(),
-                'completed_analyses': len(self.completed_analyses),
-                'failed_analyses': len(self.failed_analyses),
-                'worker_threads': len([t for t in self.worker_threads if t.is_alive()]),
+                'worker_id': self.worker_id,
+                'active_analyses': self._in_flight,
+                'max_workers': self.config['max_workers'],
                 'config': self.config
             }
+        try:
+            job_counts = self.job_queue.stats()
+            stats['queue_size'] = job_counts['pending'] + job_counts['leased']
+            stats['completed_analyses'] = job_counts['done']
+            stats['failed_analyses'] = job_counts['failed']
+            stats['jobs'] = job_counts
+        except Exception as e:
+            logger.warning(f"Could not read analysis queue stats: {e}")
         return stats
 
 # Initialize service
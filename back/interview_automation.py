@@ -1,12 +1,11 @@
 # interview_automation.py - Add this file to your backend folder
 import os
-import time
-import threading
 import logging
 from datetime import datetime, timedelta
 import requests
 import json
 from db import Candidate, SessionLocal
+from background_scheduler import scheduler
 from email_util import send_email
 import uuid
 from sqlalchemy import and_, or_
@@ -29,28 +28,22 @@ class InterviewAutomationSystem:
             return
             
         self.is_running = True
-        self.thread = threading.Thread(target=self._run_loop, daemon=True)
-        self.thread.start()
+        # HeyGen, BambooHR and SMTP calls per candidate: keep them off the shared tick
+        scheduler.register('interview_automation', self._run_once,
+                           interval=self.check_interval, run_immediately=True, own_thread=True)
+        scheduler.start()
         logger.info("Interview automation system started")
         
     def stop(self):
         """Stop the automation system"""
         self.is_running = False
-        if hasattr(self, 'thread'):
-            self.thread.join()
+        scheduler.unregister('interview_automation')
         logger.info("Interview automation system stopped")
         
-    def _run_loop(self):
-        """Main loop that runs every 30 minutes"""
-        while self.is_running:
-            try:
-                logger.info("🔄 Running interview automation check...")
-                self._process_candidates()
-            except Exception as e:
-                logger.error(f"Error in interview automation loop: {e}", exc_info=True)
-            
-            # Wait for 30 minutes
-            time.sleep(self.check_interval)
+    def _run_once(self, ctx=None):
+        """Scheduled every check_interval (30 minutes) on the background scheduler"""
+        logger.info("🔄 Running interview automation check...")
+        self._process_candidates()
     
     def _process_candidates(self):
         """Process candidates who passed assessment but don't have interview links"""
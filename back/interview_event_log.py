@@ -0,0 +1,212 @@
+# interview_event_log.py - Append-only Q&A event log with on-demand materialization
+
+import json
+import logging
+from datetime import datetime
+from typing import Dict, List, Optional, Set, Tuple
+
+from db import InterviewEvent
+
+logger = logging.getLogger(__name__)
+
+# Event types
+QUESTION = 'question'
+ANSWER = 'answer'
+SPEECH = 'speech'
+
+# Event sources
+SOURCE_KB = 'knowledge_base'
+SOURCE_VOICE = 'voice_transcription'
+SOURCE_UTTERANCE = 'utterance'
+SOURCE_SPEECH = 'speech_recognition'
+
+
+def append_event(session, candidate_id: int, session_id: Optional[str], event_type: str,
+                 content: str, source: Optional[str] = None, metadata: Optional[Dict] = None,
+                 timestamp: Optional[datetime] = None) -> InterviewEvent:
+    """Insert a single interview event (no read of previous events, no commit)"""
+    event = InterviewEvent(
+        candidate_id=candidate_id,
+        session_id=session_id,
+        event_type=event_type,
+        source=source,
+        content=content,
+        payload=json.dumps(metadata) if metadata else None,
+        created_at=timestamp or datetime.now()
+    )
+    session.add(event)
+    return event
+
+
+def load_events(session, candidate_id: int) -> List[InterviewEvent]:
+    """Load all events for a candidate in insertion order"""
+    return session.query(InterviewEvent).filter(
+        InterviewEvent.candidate_id == candidate_id
+    ).order_by(InterviewEvent.id).all()
+
+
+def candidates_with_questions(session, candidate_ids: List[int]) -> Set[int]:
+    """Ids among candidate_ids that have at least one question event (single query)"""
+    if not candidate_ids:
+        return set()
+    rows = session.query(InterviewEvent.candidate_id).filter(
+        InterviewEvent.candidate_id.in_(candidate_ids),
+        InterviewEvent.event_type == QUESTION
+    ).distinct().all()
+    return {row[0] for row in rows}
+
+
+def build_views(events: List[InterviewEvent]) -> Tuple[List[Dict], List[Dict], str]:
+    """Replay events into the legacy (qa_pairs, conversation, transcript) shapes"""
+    qa_pairs, conversation, transcript_parts = _replay(events)
+    return qa_pairs, conversation, ''.join(transcript_parts)
+
+
+def _replay(events: List[InterviewEvent]) -> Tuple[List[Dict], List[Dict], List[str]]:
+    """build_views, keeping the transcript as one text chunk per event"""
+    qa_pairs = []
+    conversation = []
+    transcript_parts = []
+
+    for event in events:
+        timestamp = event.created_at or datetime.now()
+        metadata = json.loads(event.payload) if event.payload else {}
+
+        if event.event_type == QUESTION:
+            qa_pairs.append({
+                'id': f"q_{len(qa_pairs) + 1}_{int(timestamp.timestamp())}",
+                'question': event.content,
+                'answer': None,
+                'timestamp': timestamp.isoformat(),
+                'source': event.source or SOURCE_KB,
+                'is_transcribed': False,
+                'metadata': metadata
+            })
+            conversation.append({
+                'type': 'question',
+                'speaker': 'Avatar',
+                'content': event.content,
+                'timestamp': timestamp.isoformat(),
+                'source': event.source or SOURCE_KB
+            })
+            transcript_parts.append(f"\n[{timestamp.strftime('%H:%M:%S')}] Avatar (KB): {event.content}\n")
+
+        elif event.event_type == ANSWER:
+            # Attach to the most recent unanswered question
+            for qa in reversed(qa_pairs):
+                if qa.get('question') and not qa.get('answer'):
+                    qa['answer'] = event.content
+                    if event.source == SOURCE_UTTERANCE:
+                        qa['answer_confidence'] = metadata.get('confidence', 0)
+                        qa['answer_timestamp'] = metadata.get('timestamp')
+                        qa['answer_duration_ms'] = metadata.get('duration')
+                    else:
+                        qa['answer_timestamp'] = timestamp.isoformat()
+                        qa['answer_source'] = SOURCE_VOICE
+                        qa['is_answer_transcribed'] = True
+                        qa['answer_metadata'] = metadata
+                    break
+
+            # Utterances only fill the Q&A pair, as the legacy endpoint did
+            if event.source != SOURCE_UTTERANCE:
+                conversation.append({
+                    'type': 'answer',
+                    'speaker': 'Candidate',
+                    'content': event.content,
+                    'timestamp': timestamp.isoformat(),
+                    'source': SOURCE_VOICE
+                })
+                transcript_parts.append(f"[{timestamp.strftime('%H:%M:%S')}] Candidate (Voice): {event.content}\n")
+
+        elif event.event_type == SPEECH:
+            transcript_parts.append(f"\n[Candidate]: {event.content}\n")
+
+    return qa_pairs, conversation, transcript_parts
+
+
+def _parse_timestamp(value) -> Optional[datetime]:
+    try:
+        parsed = datetime.fromisoformat(str(value).replace('Z', '+00:00'))
+    except (TypeError, ValueError):
+        return None
+    return parsed.astimezone().replace(tzinfo=None) if parsed.tzinfo else parsed
+
+
+def _load_json_list(value) -> List[Dict]:
+    try:
+        items = json.loads(value or '[]')
+    except (TypeError, ValueError):
+        return []
+    return items if isinstance(items, list) else []
+
+
+def _legacy_entries(existing: List[Dict], built: List[Dict], first_event_at: datetime, text_key: str) -> List[Dict]:
+    """Entries written by the pre-event-log code path: older than the first event and not rebuilt from it"""
+    built_keys = {(entry.get(text_key), entry.get('timestamp')) for entry in built}
+    legacy = []
+    for entry in existing:
+        if not isinstance(entry, dict) or (entry.get(text_key), entry.get('timestamp')) in built_keys:
+            continue
+        timestamp = _parse_timestamp(entry.get('timestamp'))
+        if timestamp is None or timestamp < first_event_at:
+            legacy.append(entry)
+    return legacy
+
+
+def _merge_transcript(existing: str, parts: List[str], completed: bool) -> str:
+    """
+    Replace the event-built tail of the stored transcript, keeping any text
+    written before the event log (legacy prefix). A transcript that was not
+    built from events - e.g. the full one posted on completion - is kept.
+    """
+    built = ''.join(parts)
+    if not existing:
+        return built
+    # The stored value ends with the transcript of an earlier materialization
+    prefix_length = len(built)
+    for part in reversed(parts):
+        if prefix_length and existing.endswith(built[:prefix_length]):
+            return existing[:len(existing) - prefix_length] + built
+        prefix_length -= len(part)
+    return existing if completed else existing + built
+
+
+def materialize_interview_views(session, candidate) -> bool:
+    """
+    Rebuild interview_qa_pairs / interview_conversation / interview_transcript
+    on the candidate from the event log. Does not commit - callers that commit
+    persist the views (session end), read-only callers just get fresh data.
+
+    Only the views the events produce are written. Pairs and conversation
+    entries recorded before the first event (in-flight legacy interviews)
+    are kept ahead of the rebuilt ones, and a transcript posted on
+    completion is not overwritten.
+    Returns False (and leaves the candidate untouched) when no events exist.
+    """
+    # Pending inserts must be visible (sessions run with autoflush=False)
+    session.flush()
+    events = load_events(session, candidate.id)
+    if not events:
+        return False
+
+    qa_pairs, conversation, transcript_parts = _replay(events)
+    first_event_at = events[0].created_at or datetime.now()
+
+    if qa_pairs:
+        qa_pairs = _legacy_entries(_load_json_list(candidate.interview_qa_pairs), qa_pairs,
+                                   first_event_at, 'question') + qa_pairs
+        candidate.interview_qa_pairs = json.dumps(qa_pairs)
+        candidate.interview_total_questions = len(qa_pairs)
+        candidate.interview_answered_questions = sum(1 for qa in qa_pairs if qa.get('answer'))
+
+    if conversation:
+        conversation = _legacy_entries(_load_json_list(candidate.interview_conversation), conversation,
+                                       first_event_at, 'content') + conversation
+        candidate.interview_conversation = json.dumps(conversation)
+
+    if transcript_parts:
+        candidate.interview_transcript = _merge_transcript(
+            candidate.interview_transcript or '', transcript_parts, candidate.interview_completed_at is not None)
+
+    logger.debug(f"Materialized {len(events)} interview events for candidate {candidate.id}")
+    return True
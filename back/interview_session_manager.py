@@ -16,6 +16,7 @@ from dataclasses import dataclass, asdict
 
 from sqlalchemy.orm import Session
 from db import SessionLocal, Candidate
+from resume_text_extractor import resume_extractor
 import boto3  # For S3 storage
 from openai import OpenAI  # For AI analysis
 
@@ -797,29 +798,8 @@ def generate_interview_questions(resume_content: str, job_description: str, job_
 
 def extract_resume_content(resume_path: str) -> str:
     """Extract text content from resume file"""
-    try:
-        import PyPDF2
-        from docx import Document
-        
-        file_ext = os.path.splitext(resume_path)[1].lower()
-        
-        if file_ext == '.pdf':
-            with open(resume_path, 'rb') as file:
-                pdf_reader = PyPDF2.PdfReader(file)
-                text = ""
-                for page in pdf_reader.pages:
-                    text += page.extract_text() + "\n"
-                return text
-                
-        elif file_ext in ['.docx', '.doc']:
-            doc = Document(resume_path)
-            return "\n".join([paragraph.text for paragraph in doc.paragraphs])
-            
-        else:
-            # Try to read as text
-            with open(resume_path, 'r', encoding='utf-8') as file:
-                return file.read()
-                
-    except Exception as e:
-        logger.error(f"Error extracting resume content: {e}")
-        return "Resume content could not be extracted"
\ No newline at end of file
+    text = resume_extractor.extract(resume_path)
+    if not text:
+        logger.error(f"Error extracting resume content: no text from {resume_path}")
+        return "Resume content could not be extracted"
+    return text
\ No newline at end of file
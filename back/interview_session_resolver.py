@@ -0,0 +1,155 @@
+# interview_session_resolver.py - Shared session_id -> candidate resolution with LRU/TTL cache
+
+import os
+import time
+import logging
+import threading
+from collections import OrderedDict
+from typing import Optional
+
+from db import Candidate, SessionLocal
+
+logger = logging.getLogger(__name__)
+
+
+class SessionCandidateCache:
+    """Thread-safe bounded LRU cache of session_id -> candidate_id with per-entry TTL"""
+
+    def __init__(self, max_size: int = 2048, ttl: int = 1800):
+        self.max_size = max_size
+        self.ttl = ttl
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, session_id: str) -> Optional[int]:
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(session_id)
+            if entry is None:
+                self.misses += 1
+                return None
+            candidate_id, expires_at = entry
+            if expires_at < now:
+                del self._entries[session_id]
+                self.misses += 1
+                return None
+            self._entries.move_to_end(session_id)
+            self.hits += 1
+            return candidate_id
+
+    def set(self, session_id: str, candidate_id: int):
+        with self._lock:
+            self._entries[session_id] = (candidate_id, time.monotonic() + self.ttl)
+            self._entries.move_to_end(session_id)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    def invalidate(self, session_id: str):
+        with self._lock:
+            self._entries.pop(session_id, None)
+
+    def invalidate_candidate(self, candidate_id: int):
+        with self._lock:
+            for key in [k for k, (cid, _) in self._entries.items() if cid == candidate_id]:
+                del self._entries[key]
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                'size': len(self._entries),
+                'max_size': self.max_size,
+                'ttl': self.ttl,
+                'hits': self.hits,
+                'misses': self.misses
+            }
+
+
+session_cache = SessionCandidateCache(
+    max_size=int(os.getenv('SESSION_CACHE_SIZE', '2048')),
+    ttl=int(os.getenv('SESSION_CACHE_TTL', '1800'))
+)
+
+
+def _lookup_candidate_id(session, session_id: str) -> Optional[int]:
+    """Uncached lookup chain: session column, then session_id parsing, then token"""
+    row = session.query(Candidate.id).filter(
+        Candidate.interview_session_id == session_id
+    ).first()
+    if row:
+        return row[0]
+
+    # Fallback 1: session ids look like "<prefix>_<candidate_id>_..."
+    if '_' in session_id:
+        parts = session_id.split('_')
+        if len(parts) >= 2 and parts[1].isdigit():
+            row = session.query(Candidate.id).filter(Candidate.id == int(parts[1])).first()
+            if row:
+                return row[0]
+
+    # Fallback 2: session id embeds the interview token
+    if 'token' in session_id:
+        token = session_id.split('token_')[-1]
+        row = session.query(Candidate.id).filter(Candidate.interview_token == token).first()
+        if row:
+            return row[0]
+
+    return None
+
+
+def resolve_candidate(session, session_id: str):
+    """
+    Resolve an interview session_id to its Candidate in the given DB session.
+    Cached sessions cost a single primary-key load; misses run the lookup chain once.
+    Records session_id on the candidate when it was found through a fallback
+    (callers that commit persist it).
+    """
+    if not session_id:
+        return None
+
+    candidate_id = session_cache.get(session_id)
+    if candidate_id is not None:
+        candidate = session.get(Candidate, candidate_id)
+        if candidate:
+            return candidate
+        session_cache.invalidate(session_id)
+
+    candidate_id = _lookup_candidate_id(session, session_id)
+    if candidate_id is None:
+        return None
+
+    candidate = session.get(Candidate, candidate_id)
+    if candidate and not candidate.interview_session_id:
+        candidate.interview_session_id = session_id
+
+    session_cache.set(session_id, candidate_id)
+    return candidate
+
+
+def resolve_candidate_id(session_id: str) -> Optional[int]:
+    """Resolve a session_id to a candidate id, opening a DB session only on cache misses"""
+    if not session_id:
+        return None
+
+    candidate_id = session_cache.get(session_id)
+    if candidate_id is not None:
+        return candidate_id
+
+    db = SessionLocal()
+    try:
+        candidate = resolve_candidate(db, session_id)
+        if not candidate:
+            return None
+        db.commit()
+        return candidate.id
+    finally:
+        db.close()
+
+
+def invalidate_session(session_id: Optional[str] = None, candidate_id: Optional[int] = None):
+    """Drop cached mappings when a session ends"""
+    if session_id:
+        session_cache.invalidate(session_id)
+    if candidate_id is not None:
+        session_cache.invalidate_candidate(candidate_id)
@@ -2,13 +2,15 @@ import asyncio
 import json
 import logging
 from pathlib import Path
-from playwright.async_api import async_playwright, TimeoutError as PlaywrightTimeout
+from playwright.async_api import TimeoutError as PlaywrightTimeout
 import time
 from difflib import SequenceMatcher
 from datetime import datetime
 import re
 import openai
 
+from browser_sessions import browser_sessions, ainput, run_blocking, TESTLIFY_DOMAIN
+
 
 
 # OpenAI Configuration
@@ -37,7 +39,8 @@ async def get_gpt_test_suggestions(job_title, job_desc=""):
     """
     
     try:
-        response = openai.ChatCompletion.create(
+        response = await run_blocking(
+            openai.ChatCompletion.create,
             model="gpt-3.5-turbo",
             messages=[{"role": "user", "content": prompt}],
             max_tokens=150,
@@ -59,7 +62,8 @@ async def get_gpt_test_suggestions(job_title, job_desc=""):
             # Simpler prompt as fallback
             simple_prompt = f"List 5 core skills for {job_title} job. One skill per line, 1-2 words only."
             
-            response = openai.ChatCompletion.create(
+            response = await run_blocking(
+                openai.ChatCompletion.create,
                 model="gpt-3.5-turbo",
                 messages=[{"role": "user", "content": simple_prompt}],
                 max_tokens=100,
@@ -77,7 +81,7 @@ async def get_gpt_test_suggestions(job_title, job_desc=""):
             logging.error("GPT completely failed. Asking user for input.")
             print("\n⚠️  Could not get test suggestions from AI.")
             print("Please enter 3-5 test names to search for (comma separated):")
-            user_input = input("Tests: ").strip()
+            user_input = (await ainput("Tests: ")).strip()
             
             if user_input:
                 suggestions = [t.strip() for t in user_input.split(',')]
@@ -144,7 +148,8 @@ async def select_best_test_with_gpt(page, search_term, job_title, job_desc=""):
     """
     
     try:
-        response = openai.ChatCompletion.create(
+        response = await run_blocking(
+            openai.ChatCompletion.create,
             model="gpt-3.5-turbo",
             messages=[{"role": "user", "content": prompt}],
             max_tokens=10,
@@ -466,20 +471,10 @@ async def automate_testlify_robust(job_title, job_desc=""):
     logging.info(f"Suggested role: {suggested_role}")
     logging.info(f"Tests to add: {tests}")
     
-    async with async_playwright() as playwright:
-        # Browser context with anti-detection
-        context = await playwright.chromium.launch_persistent_context(
-            user_data_dir=USER_DATA_DIR,
-            headless=False,
-            viewport={'width': 1280, 'height': 900},
-            args=[
-                '--disable-blink-features=AutomationControlled',
-                '--disable-dev-shm-usage',
-                '--no-sandbox'
-            ]
-        )
-        
-        page = context.pages[0] if context.pages else await context.new_page()
+    # Shared browser (launched with the anti-detection args), with the saved Testlify login
+    async with browser_sessions.session(TESTLIFY_DOMAIN, headless=False,
+                                        viewport={'width': 1280, 'height': 900}) as (context, logged_in):
+        page = await context.new_page()
         
         try:
             # Navigate to assessments
@@ -489,8 +484,9 @@ async def automate_testlify_robust(job_title, job_desc=""):
             # Check for login
             if await page.query_selector("input[type='email']"):
                 print("⚠️  Please log in manually...")
-                input("Press ENTER after logging in: ")
+                await ainput("Press ENTER after logging in: ")
                 await page.wait_for_load_state("networkidle")
+            await browser_sessions.save_state(context, TESTLIFY_DOMAIN)
             
             # Click Create Assessment button
             create_btn = await page.wait_for_selector("button:has-text('Create assessment')", timeout=10000)
@@ -507,7 +503,7 @@ async def automate_testlify_robust(job_title, job_desc=""):
                 print("1. Click on the job role dropdown")
                 print("2. Type and select your desired role")
                 print("3. Press ENTER when done")
-                input("Press ENTER to continue: ")
+                await ainput("Press ENTER to continue: ")
                 selected_role = job_title
             
             # Ensure assessment name is filled
@@ -617,10 +613,8 @@ async def automate_testlify_robust(job_title, job_desc=""):
             
         finally:
             await asyncio.sleep(2)
-            await context.close()
 
 # Configuration
-USER_DATA_DIR = r"D:\interview link\testlify_browser_profile"
 OUTPUT_DIR = "assessment_links"
 
 def create_programming_assessment(job_title, job_desc=""):
@@ -630,7 +624,7 @@ def create_programming_assessment(job_title, job_desc=""):
         level=logging.INFO,
         format='%(asctime)s - %(levelname)s - %(message)s'
     )
-    return asyncio.run(automate_testlify_robust(job_title, job_desc))
+    return browser_sessions.run(automate_testlify_robust(job_title, job_desc))
 
 def run_recruitment_with_invite_link(job_title, job_desc=""):
     """Main function that creates assessment and returns invite link"""
@@ -642,7 +636,7 @@ def run_recruitment_with_invite_link(job_title, job_desc=""):
     print(f"🚀 Starting recruitment process for: {job_title}")
     
     # Create the assessment
-    assessment_data = asyncio.run(automate_testlify_robust(job_title, job_desc))
+    assessment_data = browser_sessions.run(automate_testlify_robust(job_title, job_desc))
     
     if assessment_data and assessment_data.get('candidate_invite_link'):
         invite_link = assessment_data['candidate_invite_link']
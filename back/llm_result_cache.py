@@ -0,0 +1,125 @@
+# llm_result_cache.py - Persistent content-addressed cache of LLM results
+
+import os
+import json
+import hashlib
+import logging
+from datetime import datetime, timedelta
+from typing import Dict, Optional
+
+from sqlalchemy.exc import IntegrityError
+
+from db import LLMResultCache, SessionLocal
+
+logger = logging.getLogger(__name__)
+
+LLM_CACHE_ENABLED = os.getenv('LLM_CACHE_ENABLED', 'true').lower() == 'true'
+LLM_CACHE_TTL_DAYS = int(os.getenv('LLM_CACHE_TTL_DAYS', '30'))
+LLM_CACHE_MAX_ENTRIES = int(os.getenv('LLM_CACHE_MAX_ENTRIES', '10000'))
+
+
+def sha256_text(text: str) -> str:
+    return hashlib.sha256((text or '').encode('utf-8')).hexdigest()
+
+
+def sha256_json(data) -> str:
+    """Stable hash of a JSON-serializable value (key order independent)"""
+    return sha256_text(json.dumps(data, sort_keys=True, default=str))
+
+
+def make_cache_key(kind: str, model: str, prompt_version: str, *parts) -> str:
+    """Key for one LLM result: what was asked (kind + prompt version), of which model, on which inputs"""
+    return sha256_json([kind, model, prompt_version, *parts])
+
+
+def get_cached_result(cache_key: str) -> Optional[Dict]:
+    """Return the cached result for a key, or None when missing or expired"""
+    if not LLM_CACHE_ENABLED:
+        return None
+
+    session = SessionLocal()
+    try:
+        entry = session.query(LLMResultCache).filter(LLMResultCache.cache_key == cache_key).first()
+        if not entry:
+            return None
+
+        now = datetime.now()
+        if entry.expires_at and entry.expires_at < now:
+            session.delete(entry)
+            session.commit()
+            return None
+
+        entry.last_used_at = now
+        entry.hit_count = (entry.hit_count or 0) + 1
+        session.commit()
+        return json.loads(entry.result)
+    except Exception as e:
+        session.rollback()
+        logger.warning(f"LLM cache lookup failed: {e}")
+        return None
+    finally:
+        session.close()
+
+
+def store_result(cache_key: str, kind: str, result: Dict, model: str = None, prompt_version: str = None):
+    """Insert or refresh a cached result, then evict down to LLM_CACHE_MAX_ENTRIES"""
+    if not LLM_CACHE_ENABLED:
+        return
+
+    session = SessionLocal()
+    try:
+        now = datetime.now()
+        expires_at = now + timedelta(days=LLM_CACHE_TTL_DAYS) if LLM_CACHE_TTL_DAYS > 0 else None
+        entry = session.query(LLMResultCache).filter(LLMResultCache.cache_key == cache_key).first()
+        if entry is None:
+            entry = LLMResultCache(cache_key=cache_key, kind=kind, hit_count=0)
+            session.add(entry)
+        entry.model = model
+        entry.prompt_version = prompt_version
+        entry.result = json.dumps(result, default=str)
+        entry.created_at = now
+        entry.last_used_at = now
+        entry.expires_at = expires_at
+        session.commit()
+
+        _evict(session, now)
+    except IntegrityError:
+        # Another worker stored the same key first - its result is equivalent
+        session.rollback()
+    except Exception as e:
+        session.rollback()
+        logger.warning(f"LLM cache store failed: {e}")
+    finally:
+        session.close()
+
+
+def _evict(session, now: datetime):
+    """Drop expired entries, then the least recently used ones beyond the size limit"""
+    session.query(LLMResultCache).filter(
+        LLMResultCache.expires_at.isnot(None),
+        LLMResultCache.expires_at < now
+    ).delete(synchronize_session=False)
+
+    overflow = session.query(LLMResultCache).count() - LLM_CACHE_MAX_ENTRIES
+    if overflow > 0:
+        stale_ids = [row[0] for row in session.query(LLMResultCache.id)
+                     .order_by(LLMResultCache.last_used_at)
+                     .limit(overflow).all()]
+        session.query(LLMResultCache).filter(
+            LLMResultCache.id.in_(stale_ids)
+        ).delete(synchronize_session=False)
+        logger.info(f"Evicted {len(stale_ids)} least recently used LLM cache entries")
+    session.commit()
+
+
+def get_cache_stats() -> Dict:
+    session = SessionLocal()
+    try:
+        return {
+            'enabled': LLM_CACHE_ENABLED,
+            'entries': session.query(LLMResultCache).count(),
+            'max_entries': LLM_CACHE_MAX_ENTRIES,
+            'ttl_days': LLM_CACHE_TTL_DAYS
+        }
+    finally:
+        session.close()
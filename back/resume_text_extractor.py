@@ -0,0 +1,236 @@
+# resume_text_extractor.py - Shared resume text extraction with a process pool and on-disk text cache
+
+import os
+import hashlib
+import logging
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Dict, Iterable, Optional
+
+logger = logging.getLogger(__name__)
+
+# === Parsers (module level so they can run in worker processes) ===
+
+def _extract_pdf(path: str) -> str:
+    """Try PyPDF2, then pdfplumber, then pymupdf; first non-empty result wins"""
+    try:
+        import PyPDF2
+        with open(path, 'rb') as file:
+            pages = [page.extract_text() or "" for page in PyPDF2.PdfReader(file).pages]
+        text = "\n".join(pages).strip()
+        if text:
+            return text
+    except Exception as e:
+        logger.warning(f"PyPDF2 extraction failed for {path}: {e}")
+
+    try:
+        import pdfplumber
+        with pdfplumber.open(path) as pdf:
+            pages = [page.extract_text() or "" for page in pdf.pages]
+        text = "\n".join(p for p in pages if p).strip()
+        if text:
+            return text
+    except Exception as e:
+        logger.warning(f"pdfplumber extraction failed for {path}: {e}")
+
+    try:
+        import fitz  # pymupdf
+        with fitz.open(path) as doc:
+            text = "\n".join(page.get_text() for page in doc).strip()
+        if text:
+            return text
+    except Exception as e:
+        logger.warning(f"pymupdf extraction failed for {path}: {e}")
+
+    return ""
+
+
+def _extract_docx(path: str) -> str:
+    """Paragraphs plus table cells via python-docx, falling back to docx2txt"""
+    try:
+        from docx import Document
+        doc = Document(path)
+        parts = [para.text for para in doc.paragraphs if para.text.strip()]
+        for table in doc.tables:
+            for row in table.rows:
+                parts.extend(cell.text.strip() for cell in row.cells if cell.text.strip())
+        return "\n".join(parts).strip()
+    except Exception as e:
+        logger.warning(f"python-docx extraction failed for {path}: {e}")
+
+    try:
+        import docx2txt
+        return (docx2txt.process(path) or "").strip()
+    except Exception as e:
+        logger.warning(f"docx2txt extraction failed for {path}: {e}")
+        return ""
+
+
+def _extract_txt(path: str) -> str:
+    try:
+        with open(path, 'r', encoding='utf-8') as file:
+            return file.read().strip()
+    except UnicodeDecodeError:
+        with open(path, 'r', encoding='latin-1') as file:
+            return file.read().strip()
+
+
+def extract_file(path: str) -> str:
+    """Parse one resume file (no caching); runs inside pool workers"""
+    file_ext = os.path.splitext(path)[1].lower()
+    try:
+        if file_ext == '.pdf':
+            return _extract_pdf(path)
+        if file_ext in ('.docx', '.doc'):
+            return _extract_docx(path)
+        if file_ext == '.txt':
+            return _extract_txt(path)
+        logger.warning(f"Unsupported file format for {path}")
+    except Exception as e:
+        logger.error(f"Error extracting text from {path}: {e}")
+    return ""
+
+
+class ResumeTextExtractor:
+    """
+    Extracts resume text in a process pool and caches it on disk under the
+    SHA-256 of the file contents. A (mtime, size) index avoids re-hashing files
+    that have not changed since they were last seen.
+    """
+
+    def __init__(self, cache_dir: str, max_workers: int = 2):
+        self.cache_dir = cache_dir
+        self.max_workers = max_workers
+        self._pool = None
+        self._pool_lock = threading.Lock()
+        self._digests: Dict[str, tuple] = {}  # path -> (mtime, size, sha256)
+        self._digests_lock = threading.Lock()
+        os.makedirs(cache_dir, exist_ok=True)
+
+    def _file_digest(self, path: str) -> Optional[str]:
+        try:
+            stat = os.stat(path)
+        except OSError:
+            return None
+        with self._digests_lock:
+            known = self._digests.get(path)
+        if known and known[0] == stat.st_mtime and known[1] == stat.st_size:
+            return known[2]
+
+        sha = hashlib.sha256()
+        with open(path, 'rb') as file:
+            for chunk in iter(lambda: file.read(1024 * 1024), b''):
+                sha.update(chunk)
+        digest = sha.hexdigest()
+        with self._digests_lock:
+            self._digests[path] = (stat.st_mtime, stat.st_size, digest)
+        return digest
+
+    def _cache_path(self, digest: str) -> str:
+        return os.path.join(self.cache_dir, f"{digest}.txt")
+
+    def _read_cached(self, digest: str) -> Optional[str]:
+        try:
+            with open(self._cache_path(digest), 'r', encoding='utf-8') as file:
+                return file.read()
+        except FileNotFoundError:
+            return None
+        except Exception as e:
+            logger.warning(f"Could not read cached resume text {digest}: {e}")
+            return None
+
+    def _write_cached(self, digest: str, text: str):
+        # Write-then-rename so concurrent readers never see a partial file
+        target = self._cache_path(digest)
+        tmp = f"{target}.{os.getpid()}.{threading.get_ident()}.tmp"
+        try:
+            with open(tmp, 'w', encoding='utf-8') as file:
+                file.write(text)
+            os.replace(tmp, target)
+        except Exception as e:
+            logger.warning(f"Could not cache resume text {digest}: {e}")
+            if os.path.exists(tmp):
+                os.remove(tmp)
+
+    def _get_pool(self):
+        with self._pool_lock:
+            if self._pool is None:
+                self._pool = ProcessPoolExecutor(max_workers=self.max_workers)
+            return self._pool
+
+    def _reset_pool(self):
+        with self._pool_lock:
+            if self._pool is not None:
+                self._pool.shutdown(wait=False)
+            self._pool = None
+
+    def extract(self, path: str) -> str:
+        """Extract a single resume (cached)"""
+        return self.extract_many([path]).get(path, "")
+
+    def extract_many(self, paths: Iterable[str]) -> Dict[str, str]:
+        """
+        Extract many resumes at once. Cached files are served from disk; the
+        rest are parsed in parallel worker processes. Returns {path: text}
+        ("" for missing or unreadable files).
+        """
+        results = {}
+        to_parse = {}  # digest -> path (identical files are parsed once)
+        digest_of = {}
+
+        for path in dict.fromkeys(paths):
+            if not path or not os.path.exists(path):
+                results[path] = ""
+                continue
+            try:
+                digest = self._file_digest(path)
+            except Exception as e:
+                logger.error(f"Could not hash resume {path}: {e}")
+                digest = None
+            if digest is None:
+                results[path] = ""
+                continue
+            digest_of[path] = digest
+            cached = self._read_cached(digest)
+            if cached is not None:
+                results[path] = cached
+            else:
+                to_parse.setdefault(digest, path)
+
+        if to_parse:
+            parsed = self._parse(list(to_parse.values()))
+            for digest, path in to_parse.items():
+                text = parsed.get(path, "")
+                # Failures are not cached so a fixed parser/library can retry them
+                if text:
+                    self._write_cached(digest, text)
+            for path, digest in digest_of.items():
+                if path not in results:
+                    results[path] = parsed.get(to_parse[digest], "")
+
+        return results
+
+    def _parse(self, paths) -> Dict[str, str]:
+        # Even single files go to the pool so parsing never holds the GIL on request threads
+        if self.max_workers <= 1:
+            return {path: extract_file(path) for path in paths}
+        try:
+            pool = self._get_pool()
+            return dict(zip(paths, pool.map(extract_file, paths)))
+        except BrokenProcessPool as e:
+            logger.error(f"Resume extraction pool broke, parsing inline: {e}")
+            self._reset_pool()
+        except Exception as e:
+            logger.error(f"Resume extraction pool failed, parsing inline: {e}")
+        return {path: extract_file(path) for path in paths}
+
+    def shutdown(self):
+        self._reset_pool()
+
+
+resume_extractor = ResumeTextExtractor(
+    cache_dir=os.getenv('RESUME_TEXT_CACHE_DIR',
+                        os.path.join(os.path.dirname(os.path.abspath(__file__)), 'resume_text_cache')),
+    max_workers=int(os.getenv('RESUME_EXTRACTION_WORKERS', str(min(4, os.cpu_count() or 1))))
+)
@@ -5,13 +5,16 @@ import os
 import re
 import logging
 from pathlib import Path
-from typing import List, Dict, Optional
-from playwright.async_api import async_playwright, Page, BrowserContext
+from typing import Callable, List, Dict, Optional
+from playwright.async_api import Page, BrowserContext, TimeoutError as PlaywrightTimeout, Error as PlaywrightError
 import json
 from datetime import datetime
 import sys
 import httpx
 
+from browser_sessions import browser_sessions, ainput
+from bamboohr_api import applicant_api, is_current
+
 print("🚀 BambooHR Resume Scraper starting...")
 
 # Configuration - OPTIMIZED TIMEOUTS
@@ -20,6 +23,9 @@ CONFIG = {
     'RETRY_DELAY': 1.0,    # 1 second between retries
     'MAX_RETRIES': 3,      # Retry navigation up to 3 times
     'MIN_PDF_SIZE': 1000,
+    'SETTLE_TIMEOUT': 5000,  # Max wait for network idle / content selectors instead of fixed sleeps
+    'DOWNLOAD_CONCURRENCY': int(os.getenv('SCRAPER_DOWNLOAD_CONCURRENCY', '4')),  # Candidate pages downloading in parallel
+    'USE_API': os.getenv('SCRAPER_USE_API', '1') != '0',  # List applicants/resumes via the BambooHR API before the browser
     'HEADLESS': False,     # Set to True for production
     'USER_AGENT': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36'
 }
@@ -34,6 +40,9 @@ TOFA_API_KEY = "67593101297393632845404167993723"
 BAMBOOHR_DOMAIN = "https://greenoceanpm.bamboohr.com"
 DOWNLOAD_DIR = os.path.abspath("resumes")
 
+# Elements whose presence means the job page's candidate list has rendered
+CANDIDATE_LIST_READY_SELECTOR = "table, .candidate, #candidateList, [data-testid*='candidate'], a[href*='/hiring/candidates/']"
+
 # Setup logging
 # Set to DEBUG for more detailed output during troubleshooting
 DEBUG_MODE = True  # Set to False for production
@@ -133,6 +142,24 @@ async def safe_goto(page: Page, url: str, wait_until: str = "domcontentloaded",
     
     return False
 
+async def wait_for_settle(page: Page, selector: Optional[str] = None, timeout: Optional[int] = None) -> bool:
+    """Wait until selector is attached (if given) or the network goes idle, instead of sleeping a fixed time."""
+    timeout = timeout or CONFIG['SETTLE_TIMEOUT']
+    try:
+        if selector:
+            await page.wait_for_selector(selector, state="attached", timeout=timeout)
+        else:
+            await page.wait_for_load_state("networkidle", timeout=timeout)
+        return True
+    except PlaywrightTimeout:
+        logger.debug(f"Page did not settle within {timeout}ms, continuing...")
+        return False
+
+async def bamboohr_session_valid(context: BrowserContext) -> bool:
+    """Cheap check of a restored session: /home answers 200 instead of redirecting to login."""
+    response = await context.request.get(f"{BAMBOOHR_DOMAIN}/home", max_redirects=0, timeout=10000)
+    return response.status == 200
+
 async def auto_login(page: Page, domain: str) -> bool:
     """Automatic login with 2FA support - OPTIMIZED."""
     try:
@@ -316,20 +343,10 @@ async def get_candidates_for_job(page: Page, job_id: str) -> List[Dict[str, str]
             logger.error(f"Failed to navigate to job page")
             return []
         
-        # Wait for page to stabilize and any dynamic content to load
+        # Wait for dynamic content: network idle, then elements that indicate the list rendered
         logger.info("→ Waiting for dynamic content to load...")
-        await page.wait_for_timeout(3000)
-        
-        # Wait for network to be idle (no requests for 500ms)
-        try:
-            await page.wait_for_load_state("networkidle", timeout=5000)
-        except:
-            logger.debug("Network idle timeout, continuing...")
-        
-        # Try waiting for specific elements that might indicate the page is loaded
-        try:
-            await page.wait_for_selector("table, .candidate, #candidateList, [data-testid*='candidate']", timeout=5000)
-        except:
+        await wait_for_settle(page)
+        if not await wait_for_settle(page, CANDIDATE_LIST_READY_SELECTOR):
             logger.info("No immediate candidate elements found, continuing...")
         
         # Debug: Log page info
@@ -389,7 +406,7 @@ async def get_candidates_for_job(page: Page, job_id: str) -> List[Dict[str, str]
                     await tab_elements[0].click()
                     logger.info(f"✅ Clicked tab: {tab_selector}")
                     tab_clicked = True
-                    await page.wait_for_timeout(2000)  # Wait for content to load
+                    await wait_for_settle(page)  # Wait for the tab's content requests to finish
                     break
             except Exception as e:
                 logger.debug(f"Failed to click {tab_selector}: {e}")
@@ -635,7 +652,7 @@ async def get_candidates_for_job(page: Page, job_id: str) -> List[Dict[str, str]
         return []
 
 async def download_resume(context: BrowserContext, page: Page, candidate: Dict[str, str], job_id: str, is_first: bool = False) -> bool:
-    """Download resume PDF for a specific candidate."""
+    """Download resume PDF for a specific candidate. Safe to run concurrently on separate pages of one context."""
     try:
         logger.info(f"   → Processing {candidate['name']} ({candidate['id']})")
         
@@ -643,14 +660,9 @@ async def download_resume(context: BrowserContext, page: Page, candidate: Dict[s
         if not await safe_goto(page, candidate['url'], "domcontentloaded"):
             logger.error(f"Failed to navigate to candidate page")
             return False
-            
-        await page.wait_for_timeout(2000)  # Give more time for page to load
         
         # Wait for any dynamic content
-        try:
-            await page.wait_for_load_state("networkidle", timeout=3000)
-        except:
-            pass
+        await wait_for_settle(page)
         
         # Check if we need to click any tabs first
         logger.debug("      Checking for tabs that might contain resume...")
@@ -674,7 +686,7 @@ async def download_resume(context: BrowserContext, page: Page, candidate: Dict[s
                     logger.debug(f"      Found tab: {tab_selector}")
                     await page.click(tab_selector)
                     tab_clicked = True
-                    await page.wait_for_timeout(1000)  # Wait for tab content to load
+                    await wait_for_settle(page)  # Wait for tab content to load
                     break
             except:
                 continue
@@ -833,15 +845,11 @@ async def download_resume(context: BrowserContext, page: Page, candidate: Dict[s
                     if await page.locator(selector).count() > 0:
                         logger.debug(f"      Found clickable element: {selector}")
                         
-                        # Set up download listener
-                        download_promise = page.wait_for_event("download", timeout=5000)
-                        
-                        # Click the element
-                        await page.click(selector)
-                        
-                        # Wait for download to start
+                        # Listen for the download before clicking so a fast response is not missed
                         try:
-                            download = await download_promise
+                            async with page.expect_download(timeout=CONFIG['SETTLE_TIMEOUT']) as download_info:
+                                await page.click(selector)
+                            download = await download_info.value
                             
                             # Save the downloaded file
                             safe_name = sanitize_filename(candidate["name"])
@@ -853,7 +861,7 @@ async def download_resume(context: BrowserContext, page: Page, candidate: Dict[s
                             logger.info(f"      ✅ Downloaded via click: {filename}")
                             return True
                             
-                        except asyncio.TimeoutError:
+                        except PlaywrightTimeout:
                             logger.debug(f"      No download triggered by {selector}")
                             continue
                 except:
@@ -971,14 +979,13 @@ async def download_resume(context: BrowserContext, page: Page, candidate: Dict[s
             # Try alternative download method
             logger.info("      Trying alternative download via browser...")
             try:
-                # Set up download listener
-                download_promise = page.wait_for_event("download", timeout=5000)
-                
-                # Navigate to download URL
-                await page.goto(pdf_url)
-                
-                # Wait for download
-                download = await download_promise
+                # Navigating to a file URL starts a download and aborts the navigation itself
+                async with page.expect_download(timeout=CONFIG['SETTLE_TIMEOUT']) as download_info:
+                    try:
+                        await page.goto(pdf_url)
+                    except PlaywrightError:
+                        pass
+                download = await download_info.value
                 
                 # Save the downloaded file
                 safe_name = sanitize_filename(candidate["name"])
@@ -1031,27 +1038,136 @@ async def download_resume(context: BrowserContext, page: Page, candidate: Dict[s
         
         return False
 
-async def save_candidate_metadata(candidates: List[Dict], job_id: str):
-    """Save candidate metadata to JSON file."""
+async def download_resumes(context: BrowserContext, candidates: List[Dict[str, str]], job_id: str,
+                           concurrency: Optional[int] = None,
+                           progress_callback: Optional[Callable[[int, int, Dict[str, str], bool], None]] = None) -> List[Dict[str, str]]:
+    """
+    Download resumes for all candidates across up to `concurrency` pages of the
+    same authenticated context. Pages are reused between candidates; the
+    semaphore bounds how many candidate pages are open at once.
+    progress_callback(done, total, candidate, success) is called as each
+    candidate finishes and the outcome is recorded in candidate['downloaded'].
+    Returns the candidates whose download failed.
+    """
+    concurrency = max(1, concurrency or CONFIG['DOWNLOAD_CONCURRENCY'])
+    total = len(candidates)
+    semaphore = asyncio.Semaphore(concurrency)
+    idle_pages: List[Page] = []
+    opened_pages: List[Page] = []
+    failed_downloads: List[Dict[str, str]] = []
+    done = 0
+
+    async def process(index: int, candidate: Dict[str, str]):
+        nonlocal done
+        async with semaphore:
+            if idle_pages:
+                page = idle_pages.pop()
+            else:
+                page = await context.new_page()
+                opened_pages.append(page)
+            try:
+                success = await download_resume(context, page, candidate, job_id, is_first=(index == 0))
+            except Exception as e:
+                logger.error(f"      ❌ Unexpected error downloading resume for {candidate['name']}: {e}")
+                success = False
+            finally:
+                idle_pages.append(page)
+        candidate["downloaded"] = success
+
+        done += 1
+        if not success:
+            failed_downloads.append(candidate)
+        logger.info(f"[{done}/{total}] {'✅' if success else '❌'} {candidate['name']} ({candidate['id']})")
+        if progress_callback:
+            try:
+                progress_callback(done, total, candidate, success)
+            except Exception as e:
+                logger.debug(f"Progress callback failed: {e}")
+
+    logger.info(f"📥 Starting download of {total} resumes across {min(concurrency, total)} pages...")
+    try:
+        await asyncio.gather(*(process(i, candidate) for i, candidate in enumerate(candidates)))
+    finally:
+        for page in opened_pages:
+            try:
+                await page.close()
+            except Exception:
+                pass
+
+    return failed_downloads
+
+def _metadata_path(job_id: str) -> Path:
+    return Path(DOWNLOAD_DIR) / f"job_{job_id}_metadata.json"
+
+def _load_metadata(job_id: str) -> Dict:
     try:
+        with open(_metadata_path(job_id), encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+def load_job_state(job_id: str) -> Dict[str, Dict]:
+    """Applicants seen in earlier runs of this job: id -> metadata entry (last_seen, fingerprint, downloaded...)."""
+    return {str(c["id"]): c for c in _load_metadata(job_id).get("candidates", []) if c.get("id")}
+
+def job_high_water_mark(job_id: str) -> Optional[datetime]:
+    """Start time of the last completed scrape of this job, usable as scrape_job(since=...)."""
+    mark = _load_metadata(job_id).get("high_water_mark")
+    return datetime.fromisoformat(mark) if mark else None
+
+async def save_candidate_metadata(candidates: List[Dict], job_id: str, seen_ids: List[str] = (),
+                                  run_started: Optional[datetime] = None):
+    """
+    Merge this run's candidates into the job's metadata file, keeping applicants seen in earlier runs.
+    run_started becomes the new high-water mark; None keeps the previous one (run not finished yet).
+    """
+    try:
+        now = datetime.now().isoformat()
+        previous_metadata = _load_metadata(job_id)
+        state = {str(c["id"]): c for c in previous_metadata.get("candidates", []) if c.get("id")}
+        for candidate_id in seen_ids:
+            if candidate_id in state:
+                state[candidate_id]["last_seen"] = now
+        for candidate in candidates:
+            previous = state.get(str(candidate["id"]), {})
+            entry = {**previous, **candidate, "last_seen": now}
+            if candidate.get("downloaded") is False:
+                entry["attempts"] = previous.get("attempts", 0) + 1
+            elif candidate.get("downloaded"):
+                entry["attempts"] = 0
+            state[str(candidate["id"])] = entry
+        
         metadata = {
             "job_id": job_id,
-            "scraped_at": datetime.now().isoformat(),
-            "total_candidates": len(candidates),
-            "candidates": candidates
+            "scraped_at": now,
+            "high_water_mark": run_started.isoformat() if run_started else previous_metadata.get("high_water_mark"),
+            "total_candidates": len(state),
+            "candidates": list(state.values())
         }
         
-        metadata_path = Path(DOWNLOAD_DIR) / f"job_{job_id}_metadata.json"
-        with open(metadata_path, "w", encoding="utf-8") as f:
+        metadata_path = _metadata_path(job_id)
+        tmp_path = metadata_path.with_suffix(".tmp")
+        with open(tmp_path, "w", encoding="utf-8") as f:
             json.dump(metadata, f, indent=2, ensure_ascii=False)
+        os.replace(tmp_path, metadata_path)
         
         logger.info(f"📄 Saved metadata to {metadata_path}")
         
     except Exception as e:
         logger.error(f"Error saving metadata: {e}")
 
-async def scrape_job(job_id: str, use_manual_login: bool = False):
-    """Main function to scrape resumes for a specific job."""
+async def scrape_job(job_id: str, use_manual_login: bool = False, concurrency: Optional[int] = None,
+                     progress_callback: Optional[Callable[[int, int, Dict[str, str], bool], None]] = None,
+                     since: Optional[datetime] = None, incremental: bool = True):
+    """
+    Main function to scrape resumes for a specific job.
+    
+    With incremental=True only applicants that are new or changed since the
+    previous run (per the job's metadata file) are downloaded. `since` limits
+    the API listing to applications newer than that time (see
+    job_high_water_mark); the browser fallback cannot filter by date and
+    relies on the known-applicant set only.
+    """
     if not validate_job_id(job_id):
         logger.error("❌ Invalid job ID")
         return
@@ -1062,65 +1178,93 @@ async def scrape_job(job_id: str, use_manual_login: bool = False):
     logger.info(f"📁 Download directory: {DOWNLOAD_DIR}")
     logger.info(f"🐛 Debug mode: {'ON' if DEBUG_MODE else 'OFF'}")
     
-    async with async_playwright() as playwright:
+    run_started = datetime.now()
+    known = load_job_state(job_id) if incremental else {}
+    if known:
+        logger.info(f"🔁 Incremental run: {len(known)} applicants known from earlier runs")
+    
+    # API first: list applicants and download resumes over HTTP; the browser only handles what is left
+    api_fallback = None
+    if CONFIG['USE_API'] and applicant_api.configured:
+        loop = asyncio.get_running_loop()
+        api_result = await loop.run_in_executor(
+            None, lambda: applicant_api.fetch_job_resumes(job_id, DOWNLOAD_DIR, CONFIG['MIN_PDF_SIZE'], progress_callback,
+                                                          known=known, since=since))
+        if api_result is not None:
+            api_candidates, api_failed, unchanged_ids = api_result
+            logger.info(f"✅ API downloaded {len(api_candidates) - len(api_failed)}/{len(api_candidates)} new or changed resumes "
+                        f"for job {job_id} ({len(unchanged_ids)} unchanged)")
+            # Record the API outcome now so a failed login or browser error below does not lose it;
+            # the high-water mark only moves once the browser fallback has finished
+            await save_candidate_metadata(api_candidates, job_id, unchanged_ids,
+                                          None if api_failed else run_started)
+            if not api_failed:
+                return
+            logger.info(f"→ Falling back to the browser for {len(api_failed)} candidates without an API resume")
+            for candidate in api_failed:
+                candidate.setdefault("url", f"{BAMBOOHR_DOMAIN}/hiring/candidates/{candidate['id']}")
+            api_fallback = api_failed
+    
+    # Context from the shared browser pool, pre-loaded with the last saved login if still valid
+    async with browser_sessions.session(
+        BAMBOOHR_DOMAIN,
+        headless=CONFIG['HEADLESS'],
+        validate=bamboohr_session_valid,
+        user_agent=CONFIG['USER_AGENT'],
+        viewport={'width': 1920, 'height': 1080},
+        accept_downloads=True
+    ) as (context, logged_in):
         try:
-            # Launch browser
-            browser = await playwright.chromium.launch(
-                headless=CONFIG['HEADLESS'],
-                args=['--no-sandbox', '--disable-setuid-sandbox']
-            )
-            
-            # Create context
-            context = await browser.new_context(
-                user_agent=CONFIG['USER_AGENT'],
-                viewport={'width': 1920, 'height': 1080},
-                accept_downloads=True
-            )
-            
             page = await context.new_page()
             
             # Enable console logging for debugging
             page.on("console", lambda msg: logger.debug(f"Browser console: {msg.text}"))
             
-            # Login (automatic or manual)
-            if use_manual_login:
-                logger.info("🔐 Manual login mode")
-                login_url = f"{BAMBOOHR_DOMAIN}/login.php"
-                await page.goto(login_url, wait_until="domcontentloaded")
-                logger.info("→ Please complete login and 2FA in the browser...")
-                input("   👉 Press ENTER after login completion: ")
-                login_success = True
+            if logged_in:
+                logger.info("🔓 Reusing saved BambooHR session, skipping login")
             else:
-                # Automatic login
-                login_success = await auto_login(page, BAMBOOHR_DOMAIN)
-                
-            if not login_success:
-                logger.error("❌ Login failed")
-                # Offer manual login as fallback
-                retry = input("\n🔄 Would you like to try manual login? (y/n): ").lower()
-                if retry == 'y':
-                    logger.info("🔐 Switching to manual login...")
+                # Login (automatic or manual)
+                if use_manual_login:
+                    logger.info("🔐 Manual login mode")
                     login_url = f"{BAMBOOHR_DOMAIN}/login.php"
                     await page.goto(login_url, wait_until="domcontentloaded")
                     logger.info("→ Please complete login and 2FA in the browser...")
-                    input("   👉 Press ENTER after login completion: ")
+                    await ainput("   👉 Press ENTER after login completion: ")
                     login_success = True
                 else:
-                    return
-            
-            # Handle trust device page if needed
-            current_url = page.url.lower()
-            if "trusted_browser" in current_url or "trust" in current_url:
-                await handle_trust_device(page)
+                    # Automatic login
+                    login_success = await auto_login(page, BAMBOOHR_DOMAIN)
+                
+                if not login_success:
+                    logger.error("❌ Login failed")
+                    # Offer manual login as fallback
+                    retry = (await ainput("\n🔄 Would you like to try manual login? (y/n): ")).lower()
+                    if retry == 'y':
+                        logger.info("🔐 Switching to manual login...")
+                        login_url = f"{BAMBOOHR_DOMAIN}/login.php"
+                        await page.goto(login_url, wait_until="domcontentloaded")
+                        logger.info("→ Please complete login and 2FA in the browser...")
+                        await ainput("   👉 Press ENTER after login completion: ")
+                        login_success = True
+                    else:
+                        return
+            
+                # Handle trust device page if needed
+                current_url = page.url.lower()
+                if "trusted_browser" in current_url or "trust" in current_url:
+                    await handle_trust_device(page)
             
-            # IMPORTANT: Wait after login/trust handling before navigation
-            logger.info("→ Waiting for session to stabilize...")
-            await page.wait_for_timeout(3000)  # Give the session time to fully establish
+                # IMPORTANT: Wait after login/trust handling before navigation
+                logger.info("→ Waiting for session to stabilize...")
+                await wait_for_settle(page)  # Let the post-login redirects and cookie requests finish
             
-            # Try to go to home page first (helps establish session)
-            logger.info("→ Navigating to home page first...")
-            if await safe_goto(page, f"{BAMBOOHR_DOMAIN}/home", "domcontentloaded"):
-                await page.wait_for_timeout(1000)
+                # Try to go to home page first (helps establish session)
+                logger.info("→ Navigating to home page first...")
+                if await safe_goto(page, f"{BAMBOOHR_DOMAIN}/home", "domcontentloaded"):
+                    await wait_for_settle(page)
+                
+                # Persist the authenticated session so the next run skips login and 2FA
+                await browser_sessions.save_state(context, BAMBOOHR_DOMAIN)
             
             # Now navigate to hiring section
             logger.info("→ Navigating to hiring section...")
@@ -1129,8 +1273,9 @@ async def scrape_job(job_id: str, use_manual_login: bool = False):
                 # Try direct navigation to job page as fallback
                 logger.info("→ Trying direct navigation to job page...")
             
-            # Get candidates
-            candidates = await get_candidates_for_job(page, job_id)
+            # Get candidates (already known when falling back from the API)
+            candidates = api_fallback or await get_candidates_for_job(page, job_id)
+            seen_ids = []
             
             if not candidates:
                 logger.warning("⚠️ No candidates found for this job ID")
@@ -1139,12 +1284,12 @@ async def scrape_job(job_id: str, use_manual_login: bool = False):
                 
                 # Offer manual inspection
                 if not CONFIG['HEADLESS']:
-                    manual_check = input("\n🔍 Would you like to manually inspect the page? (y/n): ").lower()
+                    manual_check = (await ainput("\n🔍 Would you like to manually inspect the page? (y/n): ")).lower()
                     if manual_check == 'y':
                         logger.info("→ Browser is open. Please check if you can see candidates on the page.")
                         logger.info("   - Try clicking on any tabs or filters")
                         logger.info("   - Look for 'Candidates', 'Applications', or 'Active' tabs")
-                        input("   👉 Press ENTER when ready to continue (or Ctrl+C to exit): ")
+                        await ainput("   👉 Press ENTER when ready to continue (or Ctrl+C to exit): ")
                         
                         # Try searching for candidates again
                         logger.info("→ Retrying candidate search...")
@@ -1158,26 +1303,28 @@ async def scrape_job(job_id: str, use_manual_login: bool = False):
                 if not candidates:
                     return
             
-            # Save metadata
-            await save_candidate_metadata(candidates, job_id)
-            
-            # Download resumes
-            logger.info(f"📥 Starting download of {len(candidates)} resumes...")
-            successful_downloads = 0
-            failed_downloads = []
+            # Skip applicants already downloaded in earlier runs
+            if not api_fallback and known:
+                seen_ids = [c['id'] for c in candidates if is_current(known.get(c['id']))]
+                candidates = [c for c in candidates if not is_current(known.get(c['id']))]
+                logger.info(f"🔁 {len(seen_ids)} applicants unchanged, {len(candidates)} new to download")
+                if not candidates:
+                    await save_candidate_metadata([], job_id, seen_ids, run_started)
+                    return
             
-            for i, candidate in enumerate(candidates, 1):
-                logger.info(f"\n[{i}/{len(candidates)}] Processing {candidate['name']}")
-                
-                success = await download_resume(context, page, candidate, job_id, is_first=(i==1))
-                if success:
-                    successful_downloads += 1
-                else:
-                    failed_downloads.append(candidate)
-                
-                # Small delay between downloads
-                if i < len(candidates):
-                    await page.wait_for_timeout(int(CONFIG['RETRY_DELAY'] * 1000))
+            # Download resumes on parallel pages sharing this session
+            failed_downloads = await download_resumes(context, candidates, job_id,
+                                                      concurrency=concurrency,
+                                                      progress_callback=progress_callback)
+            successful_downloads = len(candidates) - len(failed_downloads)
+            
+            # Save metadata (download outcome included, so failures are retried next run)
+            if api_fallback:
+                # The API save already counted these attempts; merge in what the browser recovered
+                await save_candidate_metadata([c for c in candidates if c.get("downloaded")], job_id,
+                                              run_started=run_started)
+            else:
+                await save_candidate_metadata(candidates, job_id, seen_ids, run_started)
             
             # Summary
             logger.info("\n" + "="*50)
@@ -1198,7 +1345,7 @@ async def scrape_job(job_id: str, use_manual_login: bool = False):
                 # If all downloads failed, offer manual inspection
                 if successful_downloads == 0 and not CONFIG['HEADLESS']:
                     logger.info("\n⚠️  All downloads failed. This might be a selector issue.")
-                    inspect = input("\n🔍 Would you like to manually inspect a candidate page? (y/n): ").lower()
+                    inspect = (await ainput("\n🔍 Would you like to manually inspect a candidate page? (y/n): ")).lower()
                     if inspect == 'y':
                         # Navigate to first candidate
                         first_candidate = candidates[0]
@@ -1211,10 +1358,10 @@ async def scrape_job(job_id: str, use_manual_login: bool = False):
                         logger.info("   - Document tabs or sections")
                         logger.info("   - Right-click on any resume link and check the URL")
                         
-                        input("\n👉 Press ENTER when you've identified how to download resumes: ")
+                        await ainput("\n👉 Press ENTER when you've identified how to download resumes: ")
                         
                         # Ask for selector hint
-                        hint = input("\n💡 If you found a pattern, describe it (or press ENTER to skip): ").strip()
+                        hint = (await ainput("\n💡 If you found a pattern, describe it (or press ENTER to skip): ")).strip()
                         if hint:
                             logger.info(f"User hint: {hint}")
                             logger.info("Please update the download_selectors in the script with this information.")
@@ -1238,12 +1385,6 @@ async def scrape_job(job_id: str, use_manual_login: bool = False):
             except:
                 pass
             raise
-        finally:
-            try:
-                await browser.close()
-                logger.info("Browser closed")
-            except:
-                pass
 
 def main():
     """Entry point for the script."""
@@ -1255,7 +1396,9 @@ def main():
     print("   - Tab clicking for hidden content")
     print("   - Iframe support for embedded content")
     print("   - JavaScript-based download detection")
+    print("   - BambooHR API listing and resume downloads (browser as fallback)")
     print("   - Alternative download methods")
+    print(f"   - Parallel downloads ({CONFIG['DOWNLOAD_CONCURRENCY']} pages, SCRAPER_DOWNLOAD_CONCURRENCY)")
     print("   - HTML export for first candidate")
     print("   - Manual inspection mode for debugging")
     print("   - Screenshots on failures")
@@ -0,0 +1,179 @@
+# speech_segment_buffer.py - In-process buffering of speech recognition segments
+
+import os
+import time
+import logging
+import threading
+from datetime import datetime
+from typing import Dict, List
+
+from db import SessionLocal
+from interview_event_log import append_event, SPEECH, SOURCE_SPEECH
+from interview_session_resolver import resolve_candidate
+
+logger = logging.getLogger(__name__)
+
+
+class SpeechSegmentBuffer:
+    """
+    Coalesces speech segments per interview session and writes them in one
+    transaction. Interim (non-final) results are revisions of the utterance in
+    progress, so only the latest pending interim segment is kept; a final
+    segment supersedes it, so at most one interim segment is pending per
+    session. A session is flushed when a final segment arrives or after
+    flush_interval seconds.
+    """
+
+    def __init__(self, flush_interval: float = 5.0):
+        self.flush_interval = flush_interval
+        self._pending: Dict[str, List[Dict]] = {}
+        self._first_buffered_at: Dict[str, float] = {}
+        self._segment_counts: Dict[str, int] = {}
+        self._lock = threading.Lock()
+        self._flusher = None
+        self.stats = {'segments_received': 0, 'segments_written': 0, 'flushes': 0}
+
+    def add(self, session_id: str, segments: List[Dict]) -> Dict:
+        """Buffer segments for a session, flushing immediately when required"""
+        normalized = []
+        with self._lock:
+            pending = self._pending.setdefault(session_id, [])
+            count = self._segment_counts.get(session_id, 0)
+
+            for segment in segments:
+                segment_data = {
+                    'id': f"seg_{count}_{int(time.time())}",
+                    'text': segment.get('text', ''),
+                    'confidence': segment.get('confidence', 0),
+                    'is_final': bool(segment.get('is_final', False)),
+                    'timestamp': segment.get('timestamp', datetime.now().isoformat()),
+                    'duration_ms': segment.get('duration', 0)
+                }
+                count += 1
+
+                # Drop the interim result this segment revises
+                if pending and not pending[-1]['is_final']:
+                    pending.pop()
+                pending.append(segment_data)
+                normalized.append(segment_data)
+
+            self._segment_counts[session_id] = count
+            self._first_buffered_at.setdefault(session_id, time.monotonic())
+            self.stats['segments_received'] += len(normalized)
+
+            flush_now = any(s['is_final'] for s in normalized)
+
+        self._ensure_flusher()
+
+        written = self.flush(session_id) if flush_now else 0
+        return {
+            'segment_ids': [s['id'] for s in normalized],
+            'total_segments': count,
+            'flushed': flush_now,
+            'written': written
+        }
+
+    def drain(self, session_id: str) -> List[Dict]:
+        """Remove and return the pending segments for a session"""
+        with self._lock:
+            self._first_buffered_at.pop(session_id, None)
+            return self._pending.pop(session_id, [])
+
+    def write_segments(self, db, candidate, session_id: str, segments: List[Dict]) -> int:
+        """Write drained segments into an open DB session (no commit)"""
+        written = 0
+        for segment in segments:
+            if segment['is_final'] and segment['text']:
+                append_event(db, candidate.id, session_id, SPEECH, segment['text'],
+                             source=SOURCE_SPEECH, metadata={
+                                 'segment_id': segment['id'],
+                                 'confidence': segment['confidence'],
+                                 'timestamp': segment['timestamp'],
+                                 'duration_ms': segment['duration_ms']
+                             })
+                written += 1
+        if segments:
+            candidate.interview_last_activity = datetime.now()
+        return written
+
+    def flush_into(self, db, candidate, session_id: str) -> int:
+        """Flush a completed session's pending segments into the caller's DB session and forget it"""
+        segments = self.drain(session_id)
+        with self._lock:
+            self._segment_counts.pop(session_id, None)
+        written = self.write_segments(db, candidate, session_id, segments)
+        self._record_flush(written)
+        return written
+
+    def flush(self, session_id: str) -> int:
+        """Flush a session's pending segments in a single transaction"""
+        segments = self.drain(session_id)
+        if not segments:
+            return 0
+
+        db = SessionLocal()
+        try:
+            candidate = resolve_candidate(db, session_id)
+            if not candidate:
+                logger.warning(f"Dropping {len(segments)} speech segments for unknown session {session_id}")
+                return 0
+            written = self.write_segments(db, candidate, session_id, segments)
+            db.commit()
+            self._record_flush(written)
+            return written
+        except Exception as e:
+            db.rollback()
+            logger.error(f"Speech segment flush failed for {session_id}: {e}")
+            return 0
+        finally:
+            db.close()
+
+    def flush_due(self):
+        """Flush every session whose oldest buffered segment exceeded flush_interval"""
+        now = time.monotonic()
+        with self._lock:
+            due = [sid for sid, started in self._first_buffered_at.items()
+                   if now - started >= self.flush_interval]
+        for session_id in due:
+            self.flush(session_id)
+
+    def end_session(self, session_id: str):
+        """Flush and forget a finished session"""
+        self.flush(session_id)
+        with self._lock:
+            self._segment_counts.pop(session_id, None)
+
+    def get_stats(self) -> Dict:
+        with self._lock:
+            return {
+                **self.stats,
+                'buffered_sessions': len(self._pending),
+                'buffered_segments': sum(len(p) for p in self._pending.values())
+            }
+
+    def _record_flush(self, written: int):
+        with self._lock:
+            self.stats['flushes'] += 1
+            self.stats['segments_written'] += written
+
+    def _ensure_flusher(self):
+        if self._flusher and self._flusher.is_alive():
+            return
+        with self._lock:
+            if self._flusher and self._flusher.is_alive():
+                return
+            self._flusher = threading.Thread(target=self._flush_loop, name="SpeechSegmentFlusher", daemon=True)
+            self._flusher.start()
+
+    def _flush_loop(self):
+        while True:
+            time.sleep(self.flush_interval / 2)
+            try:
+                self.flush_due()
+            except Exception as e:
+                logger.error(f"Speech segment flusher error: {e}")
+
+
+speech_buffer = SpeechSegmentBuffer(
+    flush_interval=float(os.getenv('SPEECH_BUFFER_FLUSH_INTERVAL', '5'))
+)
@@ -2,14 +2,14 @@ import asyncio
 import json
 import logging
 from pathlib import Path
-from playwright.async_api import async_playwright
 import re
 from datetime import datetime
 import time
 
+from browser_sessions import browser_sessions, ainput, TESTLIFY_DOMAIN
+
 # Configuration
 import os
-USER_DATA_DIR = r"D:\interview link\testlify_browser_profile"
 OUTPUT_DIR = "assessment_links"
 
 logging.basicConfig(
@@ -24,14 +24,9 @@ async def extract_invite_link_from_assessment(assessment_name):
     Navigate to specific assessment and extract the public invite link using multiple advanced methods
     """
     
-    async with async_playwright() as playwright:
-        context = await playwright.chromium.launch_persistent_context(
-            user_data_dir=USER_DATA_DIR,
-            headless=False,
-            viewport={'width': 1280, 'height': 900}
-        )
-        
-        page = context.pages[0] if context.pages else await context.new_page()
+    async with browser_sessions.session(TESTLIFY_DOMAIN, headless=False,
+                                        viewport={'width': 1280, 'height': 900}) as (context, logged_in):
+        page = await context.new_page()
         
         try:
             # Step 1: Navigate to assessments list
@@ -42,8 +37,9 @@ async def extract_invite_link_from_assessment(assessment_name):
             # Check if login needed
             if await page.query_selector("input[type='email']"):
                 print("⚠️ Please log in manually...")
-                input("Press ENTER after logging in: ")
+                await ainput("Press ENTER after logging in: ")
                 await page.wait_for_load_state("networkidle")
+            await browser_sessions.save_state(context, TESTLIFY_DOMAIN)
             
             # Step 2: Find and click on the specific assessment
             logging.info(f"Looking for assessment: {assessment_name}")
@@ -538,8 +534,6 @@ async def extract_invite_link_from_assessment(assessment_name):
             logging.error(f"Error: {e}")
             await page.screenshot(path="error_screenshot.png")
             return None
-        finally:
-            await context.close()
 
 async def main():
     """Main function to run the extraction"""
@@ -571,8 +565,7 @@ def get_invite_link(assessment_name):
     Synchronous wrapper for extracting invite link for automation/pipelines.
     Usage: link = get_invite_link("Data Scientist")
     """
-    import asyncio
-    return asyncio.run(extract_invite_link_from_assessment(assessment_name))
+    return browser_sessions.run(extract_invite_link_from_assessment(assessment_name))
 
 
 
@@ -3,19 +3,25 @@
 import asyncio
 import json
 import logging
+import os
+import time
+import uuid
 from pathlib import Path
-from playwright.async_api import async_playwright
 import re
 from datetime import datetime, timedelta
+from types import SimpleNamespace
 from typing import Dict, List, Optional
 from db import Candidate, SessionLocal
-from email_util import send_interview_link_email, send_rejection_email
+from email_util import send_interview_link_email, send_rejection_email, email_outbox
+from cache_invalidation import invalidate_job
 from sqlalchemy import and_
+from browser_sessions import browser_sessions, ainput, TESTLIFY_DOMAIN
 
-# Same user data directory
-USER_DATA_DIR = r"D:\interview link\testlify_browser_profile"
 OUTPUT_DIR = "assessment_results"
 
+# Candidates per IN (...) lookup and per committed update batch
+BULK_CHUNK_SIZE = int(os.getenv("TESTLIFY_BULK_CHUNK_SIZE", "500"))
+
 logging.basicConfig(
     level=logging.INFO,
     format='%(asctime)s - %(levelname)s - %(message)s'
@@ -30,13 +36,9 @@ class FixedTestlifyScraper:
     
     async def scrape_assessment_scores(self, assessment_name: str) -> List[Dict]:
         """Main scraping method - focuses on TOTAL scores only"""
-        async with async_playwright() as playwright:
-            context = await playwright.chromium.launch_persistent_context(
-                user_data_dir=USER_DATA_DIR,
-                headless=False,
-                viewport={'width': 1400, 'height': 1000}
-            )
-            page = context.pages[0] if context.pages else await context.new_page()
+        async with browser_sessions.session(TESTLIFY_DOMAIN, headless=False,
+                                            viewport={'width': 1400, 'height': 1000}) as (context, logged_in):
+            page = await context.new_page()
             
             try:
                 # Navigate to assessment
@@ -62,8 +64,6 @@ class FixedTestlifyScraper:
                 logging.error(f"Scraping error: {e}")
                 await page.screenshot(path="scraping_error.png")
                 return []
-            finally:
-                await context.close()
     
     async def _navigate_to_assessment(self, page, assessment_name: str) -> bool:
         """Navigate to the specific assessment"""
@@ -74,8 +74,9 @@ class FixedTestlifyScraper:
         # Check login
         if await page.query_selector("input[type='email']"):
             print("⚠️ Please log in manually...")
-            input("Press ENTER after logging in: ")
+            await ainput("Press ENTER after logging in: ")
             await page.wait_for_load_state("networkidle")
+        await browser_sessions.save_state(page.context, TESTLIFY_DOMAIN)
         
         # Find assessment
         logging.info(f"Looking for assessment: {assessment_name}")
@@ -377,101 +378,130 @@ class FixedTestlifyScraper:
             logging.error(f"Error saving results: {e}")
     
     async def _process_candidates(self, candidates_data: List[Dict]):
-        """Process candidates with total scores"""
-        try:
-            processed_count = 0
-            interview_count = 0
-            rejection_count = 0
+        """Process candidates with total scores: bulk-load, update in committed chunks, then queue emails"""
+        scored = {}
+        for candidate_data in candidates_data:
+            email = candidate_data.get('email')
+            if email and candidate_data.get('percentage') is not None:
+                scored.setdefault(email, candidate_data['percentage'])  # first row wins, one email per candidate
+        if not scored:
+            return
+        
+        processed_count = 0
+        interview_count = 0
+        rejection_count = 0
+        affected_jobs = set()
+        
+        # One IN (...) query per chunk (a single round trip for typical result tables)
+        emails = list(scored)
+        candidates_by_email = {}
+        for i in range(0, len(emails), BULK_CHUNK_SIZE):
+            rows = self.session.query(Candidate).filter(
+                Candidate.email.in_(emails[i:i + BULK_CHUNK_SIZE])
+            ).order_by(Candidate.id).all()
+            for candidate in rows:
+                candidates_by_email.setdefault(candidate.email, candidate)
+        
+        for email in emails:
+            if email not in candidates_by_email:
+                logging.warning(f"⚠️ Candidate {email} not found in database")
+        
+        matched = [(email, candidates_by_email[email]) for email in emails if email in candidates_by_email]
+        for i in range(0, len(matched), BULK_CHUNK_SIZE):
+            chunk = matched[i:i + BULK_CHUNK_SIZE]
+            outgoing = []
+            try:
+                for email, candidate in chunk:
+                    percentage = scored[email]
+                    self._apply_total_score(candidate, percentage)
+                    # Snapshot before commit: committed instances expire and would reload one by one
+                    outgoing.append((self._email_snapshot(candidate), percentage))
+                    affected_jobs.add(candidate.job_id)
+                self.session.commit()
+            except Exception as e:
+                logging.error(f"Error processing candidates: {e}")
+                self.session.rollback()
+                continue
             
-            for candidate_data in candidates_data:
-                email = candidate_data.get('email')
-                percentage = candidate_data.get('percentage')
-                
-                if not email or percentage is None:
-                    continue
-                
-                # Find candidate in database
-                candidate = self.session.query(Candidate).filter_by(email=email).first()
-                if not candidate:
-                    logging.warning(f"⚠️ Candidate {email} not found in database")
-                    continue
-                
-                # Update exam completion
-                candidate.exam_completed = True
-                candidate.exam_completed_date = datetime.now()
-                candidate.exam_percentage = percentage
-                
-                # Add performance feedback based on total score
-                if percentage >= 90:
-                    feedback = "Outstanding performance! Exceptional technical knowledge demonstrated."
-                elif percentage >= 80:
-                    feedback = "Excellent performance! Strong technical competence shown."
-                elif percentage >= 70:
-                    feedback = "Good performance! Solid understanding of key concepts."
-                elif percentage >= 60:
-                    feedback = "Fair performance. Shows potential with room for improvement."
-                elif percentage >= 50:
-                    feedback = "Below average performance. Significant areas for improvement identified."
-                else:
-                    feedback = "Performance indicates substantial opportunities for growth in fundamental areas."
-                
-                candidate.exam_feedback = feedback
-                
-                # Determine next steps based on score threshold (70%)
-                if percentage >= 70:  # Pass threshold
-                    candidate.final_status = 'Interview Scheduled'
-                    candidate.interview_scheduled = True
-                    candidate.interview_date = datetime.now() + timedelta(days=3)
-                    
-                    # Generate unique interview token for secure interview links
-                    import uuid
-                    interview_token = str(uuid.uuid4())
-                    candidate.interview_token = interview_token
-                    candidate.interview_created_at = datetime.now()
-                    candidate.interview_expires_at = datetime.now() + timedelta(days=7)
-                    
-                    # Generate the secure interview link
-                    import os
-                    base_url = os.getenv('FRONTEND_URL', 'http://127.0.0.1:5000')
-                    interview_link = f"{base_url}/secure-interview/{interview_token}"
-                    candidate.interview_link = interview_link
-                    
-                    # Generate knowledge base ID for AI interview
-                    import time
-                    candidate.knowledge_base_id = f"kb_{candidate.id}_{int(time.time())}"
-                    
-                    try:
-                        # Send interview email with the secure link
-                        interview_link = send_interview_link_email(candidate)
-                        interview_count += 1
-                        logging.info(f"✅ Interview scheduled: {email} ({percentage:.1f}%) - Link: {interview_link}")
-                    except Exception as e:
-                        logging.error(f"❌ Failed to send interview email to {email}: {e}")
-                        # Still mark as scheduled even if email fails
-                        interview_count += 1
-                        logging.info(f"✅ Interview scheduled (email failed): {email} ({percentage:.1f}%) - Link: {interview_link}")
-                else:
-                    candidate.final_status = 'Rejected After Exam'
-                    try:
-                        send_rejection_email(candidate)
-                        rejection_count += 1
-                        logging.info(f"❌ Rejection sent: {email} ({percentage:.1f}%)")
-                    except Exception as e:
-                        logging.error(f"❌ Failed to send rejection email to {email}: {e}")
-                
+            # Emails go out only after the chunk's rows are committed, on the outbox thread
+            for candidate, percentage in outgoing:
                 processed_count += 1
+                if percentage >= 70:
+                    interview_count += 1
+                    email_outbox.enqueue(send_interview_link_email, candidate,
+                                         description=f"interview link to {candidate.email}")
+                    logging.info(f"✅ Interview scheduled: {candidate.email} ({percentage:.1f}%) - Link: {candidate.interview_link}")
+                else:
+                    rejection_count += 1
+                    email_outbox.enqueue(send_rejection_email, candidate,
+                                         description=f"rejection to {candidate.email}")
+                    logging.info(f"❌ Rejection queued: {candidate.email} ({percentage:.1f}%)")
+        
+        # Drop cached views only for the jobs whose candidates changed
+        for job_id in affected_jobs:
+            invalidate_job(job_id)
+        
+        # Print summary
+        logging.info(f"\n📊 Processing Summary:")
+        logging.info(f"   • Total processed: {processed_count}")
+        logging.info(f"   • Interviews scheduled: {interview_count}")
+        logging.info(f"   • Rejections queued: {rejection_count}")
+    
+    def _apply_total_score(self, candidate: Candidate, percentage: float):
+        """Record the exam result and the next step (interview at 70%+, otherwise rejection)"""
+        now = datetime.now()
+        candidate.exam_completed = True
+        candidate.exam_completed_date = now
+        candidate.exam_percentage = percentage
+        
+        # Add performance feedback based on total score
+        if percentage >= 90:
+            feedback = "Outstanding performance! Exceptional technical knowledge demonstrated."
+        elif percentage >= 80:
+            feedback = "Excellent performance! Strong technical competence shown."
+        elif percentage >= 70:
+            feedback = "Good performance! Solid understanding of key concepts."
+        elif percentage >= 60:
+            feedback = "Fair performance. Shows potential with room for improvement."
+        elif percentage >= 50:
+            feedback = "Below average performance. Significant areas for improvement identified."
+        else:
+            feedback = "Performance indicates substantial opportunities for growth in fundamental areas."
+        
+        candidate.exam_feedback = feedback
+        
+        # Determine next steps based on score threshold (70%)
+        if percentage >= 70:  # Pass threshold
+            candidate.final_status = 'Interview Scheduled'
+            candidate.interview_scheduled = True
+            candidate.interview_date = now + timedelta(days=3)
             
-            self.session.commit()
+            # Generate unique interview token for secure interview links
+            interview_token = str(uuid.uuid4())
+            candidate.interview_token = interview_token
+            candidate.interview_created_at = now
+            candidate.interview_expires_at = now + timedelta(days=7)
             
-            # Print summary
-            logging.info(f"\n📊 Processing Summary:")
-            logging.info(f"   • Total processed: {processed_count}")
-            logging.info(f"   • Interviews scheduled: {interview_count}")
-            logging.info(f"   • Rejections sent: {rejection_count}")
+            # Generate the secure interview link
+            base_url = os.getenv('FRONTEND_URL', 'http://127.0.0.1:5000')
+            candidate.interview_link = f"{base_url}/secure-interview/{interview_token}"
             
-        except Exception as e:
-            logging.error(f"Error processing candidates: {e}")
-            self.session.rollback()
+            # Generate knowledge base ID for AI interview
+            candidate.knowledge_base_id = f"kb_{candidate.id}_{int(time.time())}"
+        else:
+            candidate.final_status = 'Rejected After Exam'
+    
+    @staticmethod
+    def _email_snapshot(candidate: Candidate) -> SimpleNamespace:
+        """Plain copy of the fields the email templates read, safe to use from the outbox thread"""
+        return SimpleNamespace(
+            email=candidate.email,
+            name=candidate.name,
+            job_title=candidate.job_title,
+            interview_link=candidate.interview_link,
+            interview_date=candidate.interview_date,
+            interview_time_slot=getattr(candidate, 'interview_time_slot', 'TBD')
+        )
 
 
 # Main functions
@@ -568,4 +598,6 @@ async def main():
 
 
 if __name__ == "__main__":
-    asyncio.run(main())
\ No newline at end of file
+    asyncio.run(main())
+    # Let queued interview/rejection emails go out before the process exits
+    email_outbox.flush()
\ No newline at end of file
@@ -0,0 +1,27 @@
+# conftest.py - Point db.py at a throwaway SQLite database before any backend module imports it
+
+import os
+import sys
+import tempfile
+
+import pytest
+
+BACK_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BACK_DIR)
+
+_db_dir = tempfile.mkdtemp(prefix="hr_tests_")
+os.environ["DATABASE_URL"] = f"sqlite:///{os.path.join(_db_dir, 'test.db')}"
+
+from db import Base, SessionLocal, engine  # noqa: E402
+
+
+@pytest.fixture
+def session():
+    """A session on freshly created tables, dropped again after the test"""
+    Base.metadata.create_all(engine)
+    db_session = SessionLocal()
+    try:
+        yield db_session
+    finally:
+        db_session.close()
+        Base.metadata.drop_all(engine)
@@ -0,0 +1,111 @@
+from datetime import datetime, timedelta
+
+import pytest
+
+from analysis_job_queue import AnalysisJobQueue, JOB_DONE, JOB_FAILED, JOB_LEASED, JOB_PENDING
+from db import AnalysisJob
+
+
+@pytest.fixture
+def queue(session):
+    return AnalysisJobQueue(lease_seconds=60, max_attempts=2, retry_base_delay=300)
+
+
+def job_for(session, candidate_id):
+    session.expire_all()
+    return session.query(AnalysisJob).filter_by(candidate_id=candidate_id).one()
+
+
+def test_enqueue_is_an_upsert_keeping_the_best_priority(session, queue):
+    assert queue.enqueue(1, priority=5)
+    assert queue.enqueue(1, priority=1)
+    assert queue.enqueue(1, priority=3)
+
+    assert session.query(AnalysisJob).count() == 1
+    assert job_for(session, 1).priority == 1
+
+
+def test_claim_leases_the_most_urgent_job_once(session, queue):
+    queue.enqueue(1, priority=5)
+    queue.enqueue(2, priority=1)
+
+    job = queue.claim("worker-a")
+    assert job.candidate_id == 2
+    assert job.status == JOB_LEASED and job.lease_owner == "worker-a" and job.attempts == 1
+
+    assert queue.claim("worker-b").candidate_id == 1
+    assert queue.claim("worker-c") is None
+
+
+def test_finished_jobs_reopen_only_with_force(session, queue):
+    queue.enqueue(1)
+    job = queue.claim("worker-a")
+    assert queue.complete(job.id, "worker-a")
+    assert job_for(session, 1).status == JOB_DONE
+
+    assert queue.enqueue(1) is False
+    assert queue.enqueue(1, force=True) is True
+    reopened = job_for(session, 1)
+    assert (reopened.status, reopened.attempts) == (JOB_PENDING, 0)
+
+
+def test_force_enqueue_while_leased_runs_the_job_again(session, queue):
+    queue.enqueue(1)
+    job = queue.claim("worker-a")
+
+    assert queue.enqueue(1) is True
+    assert job_for(session, 1).rerun_requested is False
+    assert queue.enqueue(1, force=True) is True
+    assert job_for(session, 1).status == JOB_LEASED
+
+    assert queue.complete(job.id, "worker-a")
+    requeued = job_for(session, 1)
+    assert (requeued.status, requeued.attempts, requeued.rerun_requested) == (JOB_PENDING, 0, False)
+
+    rerun = queue.claim("worker-b")
+    assert rerun.id == job.id
+    assert queue.complete(rerun.id, "worker-b")
+    assert job_for(session, 1).status == JOB_DONE
+
+
+def test_fail_retries_with_backoff_then_marks_failed(session, queue):
+    queue.enqueue(1)
+    job = queue.claim("worker-a")
+    assert queue.fail(job, "worker-a", "boom")
+
+    retry = job_for(session, 1)
+    assert retry.status == JOB_PENDING and retry.last_error == "boom"
+    assert retry.next_attempt_at > datetime.now() + timedelta(seconds=250)
+    assert queue.claim("worker-b") is None  # still backing off
+
+    retry.next_attempt_at = datetime.now() - timedelta(seconds=1)
+    session.commit()
+    job = queue.claim("worker-b")
+    assert job.attempts == 2
+    assert queue.fail(job, "worker-b", "boom again")
+    assert job_for(session, 1).status == JOB_FAILED
+
+
+def test_expired_lease_is_reclaimed_and_old_owner_loses_it(session, queue):
+    queue.enqueue(1)
+    stale = queue.claim("worker-a")
+    leased = job_for(session, 1)
+    leased.lease_expires_at = datetime.now() - timedelta(seconds=1)
+    session.commit()
+
+    job = queue.claim("worker-b")
+    assert job.id == stale.id and job.lease_owner == "worker-b" and job.attempts == 2
+    assert queue.complete(stale.id, "worker-a") is False
+    assert queue.complete(job.id, "worker-b") is True
+
+
+def test_sweep_fails_exhausted_expired_leases(session, queue):
+    queue.enqueue(1)
+    queue.claim("worker-a")
+    job = job_for(session, 1)
+    job.attempts = job.max_attempts
+    job.lease_expires_at = datetime.now() - timedelta(seconds=1)
+    session.commit()
+
+    assert queue.sweep() == {'exhausted': 1, 'purged': 0}
+    assert job_for(session, 1).status == JOB_FAILED
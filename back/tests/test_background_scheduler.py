@@ -0,0 +1,55 @@
+import threading
+import time
+
+import pytest
+
+from background_scheduler import BackgroundScheduler
+
+
+@pytest.fixture
+def scheduler():
+    """A scheduler whose ticks are driven by the test instead of its thread"""
+    instance = BackgroundScheduler(tick_interval=30)
+    instance.is_running = True
+    return instance
+
+
+def test_shared_query_loads_once_per_tick(scheduler):
+    loads = []
+    seen = []
+    scheduler.register_query('rows', lambda session: loads.append(1) or [1, 2, 3])
+    scheduler.register('a', lambda ctx: seen.append(('a', ctx.query('rows'))), interval=30, run_immediately=True)
+    scheduler.register('b', lambda ctx: seen.append(('b', ctx.query('rows'))), interval=60, run_immediately=True)
+
+    now = time.monotonic()
+    scheduler._run_due_jobs(now)
+    assert len(loads) == 1
+    assert seen == [('a', [1, 2, 3]), ('b', [1, 2, 3])]
+
+    # Next tick: only 'a' is due, and the query is loaded again for the new tick
+    scheduler._run_due_jobs(now + 30)
+    assert len(loads) == 2
+    assert [name for name, _ in seen] == ['a', 'b', 'a']
+    assert scheduler.get_stats()['queries']['rows']['loads'] == 2
+
+
+def test_own_thread_job_does_not_hold_up_the_tick(scheduler):
+    release = threading.Event()
+    started = []
+    tick_jobs = []
+    scheduler.register('slow', lambda ctx: started.append(1) or release.wait(5), interval=30,
+                       run_immediately=True, own_thread=True)
+    scheduler.register('fast', lambda ctx: tick_jobs.append(1), interval=30, run_immediately=True)
+
+    now = time.monotonic()
+    scheduler._run_due_jobs(now)
+    assert tick_jobs == [1]
+
+    # Still running on the next tick: the slow job is skipped, the tick goes on
+    scheduler._run_due_jobs(now + 30)
+    assert tick_jobs == [1, 1]
+    assert len(started) == 1
+
+    release.set()
+    scheduler._jobs['slow'].thread.join(5)
+    assert scheduler.get_stats()['jobs']['slow']['runs'] == 1
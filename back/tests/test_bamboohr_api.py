@@ -0,0 +1,81 @@
+import json
+from datetime import datetime
+
+from bamboohr_api import (BambooHRApplicantClient, MAX_RESUME_ATTEMPTS, application_fingerprint, is_current)
+
+
+def test_fingerprint_ignores_key_order_and_tracks_changes():
+    application = {"id": 1, "status": {"label": "New"}, "applicant": {"firstName": "Ada"}}
+    reordered = {"applicant": {"firstName": "Ada"}, "status": {"label": "New"}, "id": 1}
+    assert application_fingerprint(application) == application_fingerprint(reordered)
+    assert application_fingerprint(application) != application_fingerprint({**application, "status": {"label": "Hired"}})
+
+
+def test_is_current():
+    assert not is_current(None)
+    assert not is_current({"downloaded": False, "attempts": 1})
+    assert is_current({"downloaded": True})
+    assert is_current({"downloaded": False, "attempts": MAX_RESUME_ATTEMPTS})
+    # A changed application is downloaded again even if it was done before
+    assert is_current({"downloaded": True, "fingerprint": "a"}, "a")
+    assert not is_current({"downloaded": True, "fingerprint": "a"}, "b")
+
+
+def test_fetch_job_resumes_skips_unchanged_applicants(monkeypatch, tmp_path):
+    monkeypatch.setenv("BAMBOOHR_API_KEY", "key")
+    monkeypatch.setenv("BAMBOOHR_SUBDOMAIN", "example")
+    client = BambooHRApplicantClient(max_workers=2)
+    applications = [{"id": 1, "applicant": {"firstName": "Ada"}}, {"id": 2, "applicant": {"firstName": "Bob"}}]
+    monkeypatch.setattr(client, "list_applications", lambda job_id, since=None: applications)
+    fetched = []
+
+    def fake_fetch(job_id, application, download_dir, min_size, known=None):
+        fetched.append(application["id"])
+        return {"id": str(application["id"]), "name": "x", "downloaded": False}, False
+
+    monkeypatch.setattr(client, "_fetch_resume", fake_fetch)
+    known = {"1": {"downloaded": True, "fingerprint": application_fingerprint(applications[0])}}
+
+    candidates, failed, unchanged = client.fetch_job_resumes("9", str(tmp_path), known=known)
+
+    assert fetched == [2]
+    assert unchanged == ["1"]
+    assert [c["id"] for c in failed] == ["2"]
+
+
+class FakeResponse:
+    def __init__(self, body, status_code=200):
+        self.body = body
+        self.status_code = status_code
+        self.headers = {"ETag": '"v1"'}
+
+    def raise_for_status(self):
+        pass
+
+    def json(self):
+        return self.body
+
+
+def test_cache_keeps_only_the_latest_listing_pages(monkeypatch, tmp_path):
+    monkeypatch.setenv("BAMBOOHR_API_KEY", "key")
+    monkeypatch.setenv("BAMBOOHR_SUBDOMAIN", "example")
+    cache_path = tmp_path / "http_cache.json"
+    cache_path.write_text(json.dumps({"https://old/applications/7": {"etag": '"x"', "body": {"email": "a@b.c"}}}))
+    client = BambooHRApplicantClient(cache_path=str(cache_path))
+
+    class FakeSession:
+        def get(self, url, headers=None, timeout=None):
+            if "applications/" in url:
+                return FakeResponse({"resumeFileId": None})
+            return FakeResponse({"applications": [{"id": 1}], "paginationComplete": True})
+
+    client._session = FakeSession()
+    client.list_applications("9")
+    client.get_application(1)
+    first_page = next(iter(client._cache))
+    assert list(client._cache) == [first_page] and "jobId=9" in first_page
+
+    client.list_applications("9", since=datetime(2026, 1, 1))
+    client._save_cache()
+    saved = json.loads(cache_path.read_text())
+    assert len(saved) == 1 and first_page not in saved and "newSince" in next(iter(saved))
@@ -0,0 +1,98 @@
+import json
+from datetime import datetime
+
+import numpy as np
+import pytest
+
+from db import Candidate
+from dynamic_interview_analyzer import (BatchInterviewScorer, DynamicInterviewAnalyzer, SCORE_FIELDS,
+                                        SCORING_METHOD, rescore_all_interviews)
+
+INTERVIEWS = [
+    [
+        {'question': 'Tell me about a time you resolved a conflict in your team.',
+         'answer': 'In my last role two developers disagreed on the API design. I set up a meeting, '
+                   'we listed the trade-offs, and for example we agreed on a versioned REST endpoint. '
+                   'As a result the release shipped on time and the team communicated better.'},
+        {'question': 'How would you design a scalable database schema?',
+         'answer': 'I would start with normalized tables, add indexes for the hot queries, and use '
+                   'caching with Redis. Then I would partition large tables and monitor performance.'},
+        {'question': 'Why do you want this job?', 'answer': ''},
+    ],
+    [
+        {'question': 'Describe your experience with Python.', 'answer': 'Good.'},
+    ],
+    [
+        {'question': 'What is your greatest strength?', 'answer': None},
+    ],
+]
+POSITIONS = ['Software Engineer', 'Sales Manager', 'Designer']
+
+
+@pytest.fixture(scope='module')
+def analyzer():
+    return DynamicInterviewAnalyzer(sentiment_backend='lexicon')
+
+
+def test_batch_scores_match_single_interview_analysis(analyzer):
+    batch = BatchInterviewScorer(analyzer).score_interviews(INTERVIEWS, POSITIONS)
+
+    for qa_pairs, position, row in zip(INTERVIEWS, POSITIONS, batch):
+        single = analyzer.analyze_interview(qa_pairs, {'position': position})
+        for field in SCORE_FIELDS:
+            assert row[field] == pytest.approx(single['scores'][field])
+        assert row['confidence'] == pytest.approx(single['metadata']['confidence'])
+
+
+def add_interview(session, name, completed=True, status='completed', method=SCORING_METHOD, **fields):
+    candidate = Candidate(job_id='1', job_title='Software Engineer', name=name, email=f'{name}@example.com',
+                          interview_qa_pairs=json.dumps(INTERVIEWS[0]), interview_ai_analysis_status=status,
+                          interview_completed_at=datetime.now() if completed else None,
+                          interview_scoring_method=method, **fields)
+    session.add(candidate)
+    return candidate
+
+
+def test_rescore_only_touches_completed_analyzed_interviews(session):
+    analyzed = add_interview(session, 'analyzed')
+    in_progress = add_interview(session, 'in_progress', completed=False)
+    pending = add_interview(session, 'pending', status='pending')
+    session.commit()
+
+    assert rescore_all_interviews(sentiment_backend='lexicon') == 1
+    session.expire_all()
+    assert analyzed.interview_ai_score is not None
+    assert in_progress.interview_ai_score is None
+    assert pending.interview_ai_score is None
+    assert np.isfinite(analyzed.interview_ai_score)
+
+
+def test_rescore_keeps_other_scoring_methods_unless_opted_in(session):
+    llm_scored = add_interview(session, 'llm', method='ai-gpt3.5', interview_ai_score=91.0,
+                               interview_final_status='Passed', interview_ai_overall_feedback='LLM feedback')
+    session.commit()
+
+    assert rescore_all_interviews(sentiment_backend='lexicon') == 0
+    session.expire_all()
+    assert (llm_scored.interview_ai_score, llm_scored.interview_scoring_method) == (91.0, 'ai-gpt3.5')
+    assert llm_scored.interview_final_status == 'Passed'
+    assert llm_scored.interview_ai_overall_feedback == 'LLM feedback'
+
+    assert rescore_all_interviews(sentiment_backend='lexicon', include_other_methods=True) == 1
+    session.expire_all()
+    assert llm_scored.interview_scoring_method == SCORING_METHOD
+    assert llm_scored.interview_ai_overall_feedback != 'LLM feedback'
+
+
+def test_rescore_rewrites_insights_and_feedback_with_the_scores(session, analyzer):
+    candidate = add_interview(session, 'Ada', interview_ai_strengths='["stale"]',
+                              interview_ai_overall_feedback='stale feedback')
+    session.commit()
+
+    rescore_all_interviews(sentiment_backend='lexicon')
+    session.expire_all()
+    single = analyzer.analyze_interview(INTERVIEWS[0], {'name': 'Ada', 'position': 'Software Engineer'})
+    assert candidate.interview_ai_score == pytest.approx(single['scores']['overall'])
+    assert json.loads(candidate.interview_ai_strengths) == single['insights']['strengths']
+    assert json.loads(candidate.interview_ai_weaknesses) == single['insights']['weaknesses']
+    assert 'Candidate: Ada' in candidate.interview_ai_overall_feedback
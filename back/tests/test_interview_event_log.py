@@ -0,0 +1,99 @@
+import json
+from datetime import datetime, timedelta
+
+from db import Candidate
+from interview_event_log import (append_event, build_views, candidates_with_questions, load_events,
+                                 materialize_interview_views, QUESTION, ANSWER, SPEECH, SOURCE_UTTERANCE)
+
+T0 = datetime(2025, 1, 6, 10, 0, 0)
+
+
+def make_candidate(session, **fields):
+    candidate = Candidate(job_id="1", job_title="Engineer", name="Ada", email="ada@example.com", **fields)
+    session.add(candidate)
+    session.flush()
+    return candidate
+
+
+def test_build_views_pairs_answers_with_latest_question(session):
+    candidate = make_candidate(session)
+    append_event(session, candidate.id, "s1", QUESTION, "Q1", timestamp=T0)
+    append_event(session, candidate.id, "s1", ANSWER, "A1", timestamp=T0 + timedelta(seconds=5))
+    append_event(session, candidate.id, "s1", QUESTION, "Q2", timestamp=T0 + timedelta(seconds=10))
+    append_event(session, candidate.id, "s1", ANSWER, "A2", source=SOURCE_UTTERANCE,
+                 metadata={"confidence": 0.9}, timestamp=T0 + timedelta(seconds=15))
+    append_event(session, candidate.id, "s1", SPEECH, "thinking aloud", timestamp=T0 + timedelta(seconds=20))
+    session.flush()
+
+    qa_pairs, conversation, transcript = build_views(load_events(session, candidate.id))
+
+    assert [(qa["question"], qa["answer"]) for qa in qa_pairs] == [("Q1", "A1"), ("Q2", "A2")]
+    assert qa_pairs[1]["answer_confidence"] == 0.9
+    # Utterance answers only fill the pair
+    assert [entry["content"] for entry in conversation] == ["Q1", "A1", "Q2"]
+    assert "Avatar (KB): Q1" in transcript and "[Candidate]: thinking aloud" in transcript
+
+
+def test_materialize_without_events_leaves_candidate_untouched(session):
+    candidate = make_candidate(session, interview_qa_pairs='[{"question": "legacy"}]')
+    assert materialize_interview_views(session, candidate) is False
+    assert candidate.interview_qa_pairs == '[{"question": "legacy"}]'
+
+
+def test_materialize_sees_unflushed_events_and_sets_counts(session):
+    candidate = make_candidate(session)
+    append_event(session, candidate.id, "s1", QUESTION, "Q1", timestamp=T0)
+    append_event(session, candidate.id, "s1", ANSWER, "A1", timestamp=T0 + timedelta(seconds=5))
+    append_event(session, candidate.id, "s1", QUESTION, "Q2", timestamp=T0 + timedelta(seconds=10))
+
+    assert materialize_interview_views(session, candidate) is True
+    assert len(json.loads(candidate.interview_qa_pairs)) == 2
+    assert candidate.interview_total_questions == 2
+    assert candidate.interview_answered_questions == 1
+    assert candidates_with_questions(session, [candidate.id, candidate.id + 1]) == {candidate.id}
+
+
+def test_materialize_keeps_legacy_pairs_recorded_before_the_first_event(session):
+    legacy_pair = {"question": "Legacy Q", "answer": "Legacy A", "timestamp": (T0 - timedelta(minutes=1)).isoformat()}
+    legacy_entry = {"type": "question", "content": "Legacy Q", "timestamp": legacy_pair["timestamp"]}
+    candidate = make_candidate(session, interview_qa_pairs=json.dumps([legacy_pair]),
+                               interview_conversation=json.dumps([legacy_entry]),
+                               interview_transcript="legacy transcript\n")
+    append_event(session, candidate.id, "s1", QUESTION, "Q1", timestamp=T0)
+
+    materialize_interview_views(session, candidate)
+    append_event(session, candidate.id, "s1", ANSWER, "A1", timestamp=T0 + timedelta(seconds=5))
+    materialize_interview_views(session, candidate)
+
+    qa_pairs = json.loads(candidate.interview_qa_pairs)
+    assert [(qa["question"], qa["answer"]) for qa in qa_pairs] == [("Legacy Q", "Legacy A"), ("Q1", "A1")]
+    assert [entry["content"] for entry in json.loads(candidate.interview_conversation)] == ["Legacy Q", "Q1", "A1"]
+    assert candidate.interview_total_questions == 2
+    # Legacy prefix is kept once and the event-built tail is replaced, not appended again
+    assert candidate.interview_transcript.startswith("legacy transcript\n")
+    assert candidate.interview_transcript.count("Q1") == 1
+    assert "Candidate (Voice): A1" in candidate.interview_transcript
+
+
+def test_materialize_preserves_transcript_posted_on_completion(session):
+    candidate = make_candidate(session)
+    append_event(session, candidate.id, "s1", QUESTION, "Q1", timestamp=T0)
+    materialize_interview_views(session, candidate)
+
+    candidate.interview_completed_at = T0 + timedelta(minutes=30)
+    candidate.interview_transcript = "Full transcript posted by the interview client"
+    materialize_interview_views(session, candidate)
+
+    assert candidate.interview_transcript == "Full transcript posted by the interview client"
+
+
+def test_materialize_only_writes_views_the_events_produce(session):
+    candidate = make_candidate(session, interview_qa_pairs='[{"question": "Legacy Q"}]',
+                               interview_conversation='[{"content": "Legacy Q"}]')
+    append_event(session, candidate.id, "s1", SPEECH, "hello", timestamp=T0)
+
+    materialize_interview_views(session, candidate)
+
+    assert candidate.interview_qa_pairs == '[{"question": "Legacy Q"}]'
+    assert candidate.interview_conversation == '[{"content": "Legacy Q"}]'
+    assert "[Candidate]: hello" in candidate.interview_transcript
@@ -0,0 +1,90 @@
+import pytest
+
+import interview_session_resolver
+from db import Candidate
+from interview_session_resolver import SessionCandidateCache, invalidate_session, resolve_candidate, session_cache
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    fake = FakeClock()
+    monkeypatch.setattr(interview_session_resolver.time, "monotonic", fake)
+    return fake
+
+
+@pytest.fixture(autouse=True)
+def empty_shared_cache():
+    session_cache._entries.clear()
+    yield
+    session_cache._entries.clear()
+
+
+def test_cache_entries_expire_after_ttl(clock):
+    cache = SessionCandidateCache(ttl=60)
+    cache.set("s1", 7)
+    clock.now += 59
+    assert cache.get("s1") == 7
+    clock.now += 2
+    assert cache.get("s1") is None
+    assert cache.stats()["size"] == 0
+    assert (cache.hits, cache.misses) == (1, 1)
+
+
+def test_cache_evicts_least_recently_used(clock):
+    cache = SessionCandidateCache(max_size=2)
+    cache.set("s1", 1)
+    cache.set("s2", 2)
+    cache.get("s1")
+    cache.set("s3", 3)
+    assert cache.get("s2") is None
+    assert cache.get("s1") == 1 and cache.get("s3") == 3
+
+
+def test_invalidate_by_session_and_candidate(clock):
+    cache = SessionCandidateCache()
+    cache.set("s1", 1)
+    cache.set("s2", 1)
+    cache.set("s3", 2)
+    cache.invalidate("s3")
+    assert cache.get("s3") is None
+    cache.invalidate_candidate(1)
+    assert cache.get("s1") is None and cache.get("s2") is None
+
+
+def make_candidate(session, **fields):
+    candidate = Candidate(job_id="1", job_title="Engineer", name="Ada", email="ada@example.com", **fields)
+    session.add(candidate)
+    session.flush()
+    return candidate
+
+
+def test_resolve_candidate_caches_fallback_lookup(session):
+    candidate = make_candidate(session, interview_token="abc")
+    session_id = "interview_token_abc"
+
+    assert resolve_candidate(session, session_id) is candidate
+    assert candidate.interview_session_id == session_id
+    assert session_cache.get(session_id) == candidate.id
+
+
+def test_resolve_candidate_drops_stale_cache_entry(session):
+    candidate = make_candidate(session, interview_session_id="s1")
+    session_cache.set("s1", candidate.id + 100)
+
+    assert resolve_candidate(session, "s1") is candidate
+    assert session_cache.get("s1") == candidate.id
+
+
+def test_invalidate_session_on_session_end(session):
+    candidate = make_candidate(session, interview_session_id="s1")
+    resolve_candidate(session, "s1")
+    invalidate_session(candidate_id=candidate.id)
+    assert session_cache.get("s1") is None
@@ -0,0 +1,49 @@
+import asyncio
+from datetime import datetime
+
+import pytest
+
+pytest.importorskip("playwright")
+pytest.importorskip("httpx")
+
+import scraper  # noqa: E402
+from bamboohr_api import MAX_RESUME_ATTEMPTS, is_current  # noqa: E402
+
+
+@pytest.fixture(autouse=True)
+def download_dir(monkeypatch, tmp_path):
+    monkeypatch.setattr(scraper, "DOWNLOAD_DIR", str(tmp_path))
+    return tmp_path
+
+
+def save(candidates, seen_ids=(), run_started=None):
+    asyncio.run(scraper.save_candidate_metadata(candidates, "42", seen_ids, run_started))
+
+
+def test_save_merges_with_earlier_runs():
+    first_run = datetime(2025, 1, 1, 9, 0)
+    save([{"id": "1", "name": "Ada", "downloaded": True}, {"id": "2", "name": "Bob", "downloaded": False}],
+         run_started=first_run)
+    save([{"id": "3", "name": "Cy", "downloaded": True}], seen_ids=["1"], run_started=datetime(2025, 1, 2, 9, 0))
+
+    state = scraper.load_job_state("42")
+    assert set(state) == {"1", "2", "3"}
+    assert state["1"]["name"] == "Ada" and is_current(state["1"])
+    assert state["2"]["attempts"] == 1 and not is_current(state["2"])
+    assert scraper.job_high_water_mark("42") == datetime(2025, 1, 2, 9, 0)
+
+
+def test_failed_downloads_count_attempts_until_skipped():
+    for _ in range(MAX_RESUME_ATTEMPTS):
+        save([{"id": "2", "name": "Bob", "downloaded": False}], run_started=datetime.now())
+    assert is_current(scraper.load_job_state("42")["2"])
+
+    save([{"id": "2", "name": "Bob", "downloaded": True}], run_started=datetime.now())
+    assert scraper.load_job_state("42")["2"]["attempts"] == 0
+
+
+def test_unfinished_run_keeps_the_high_water_mark():
+    mark = datetime(2025, 1, 1, 9, 0)
+    save([{"id": "1", "name": "Ada", "downloaded": True}], run_started=mark)
+    save([{"id": "2", "name": "Bob", "downloaded": False}], run_started=None)
+    assert scraper.job_high_water_mark("42") == mark
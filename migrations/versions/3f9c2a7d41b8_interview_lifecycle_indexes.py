@@ -0,0 +1,73 @@
+"""Interview lifecycle indexes
+
+Partial indexes for the background monitors' hot predicates (open interviews,
+completed-but-unprocessed analyses), the stale-analysis composite index and an
+interview_token index for databases where the column was added by ALTER TABLE.
+Partial predicates apply on SQLite and PostgreSQL; other dialects get plain
+indexes on the same columns.
+
+Revision ID: 3f9c2a7d41b8
+Revises:
+Create Date: 2026-10-17 09:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '3f9c2a7d41b8'
+down_revision: Union[str, None] = None
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+_completed_at = sa.column('interview_completed_at', sa.DateTime)
+_open_interview = _completed_at.is_(None)
+_awaiting_analysis = sa.and_(_completed_at.isnot(None),
+                             sa.column('interview_auto_score_triggered', sa.Boolean) == sa.false())
+_awaiting_score = sa.and_(_completed_at.isnot(None),
+                          sa.column('interview_ai_score', sa.Float).is_(None))
+
+# name -> (columns, partial predicate)
+INDEXES = {
+    'idx_interview_active': (['interview_started_at', 'interview_last_activity'], _open_interview),
+    'idx_interview_open_expires': (['interview_expires_at'], _open_interview),
+    'idx_analysis_awaiting': (['interview_ai_analysis_status'], _awaiting_analysis),
+    'idx_analysis_unscored': (['interview_ai_analysis_status'], _awaiting_score),
+    'idx_analysis_status_started': (['interview_ai_analysis_status', 'interview_analysis_started_at'], None),
+    'idx_interview_session_id': (['interview_session_id'], None),
+}
+
+
+def _existing_indexes():
+    inspector = sa.inspect(op.get_bind())
+    indexes = inspector.get_indexes('candidates')
+    unique = inspector.get_unique_constraints('candidates')
+    return ({idx['name'] for idx in indexes},
+            [idx['column_names'] for idx in indexes] + [uc['column_names'] for uc in unique])
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    names, indexed_columns = _existing_indexes()
+
+    for name, (columns, where) in INDEXES.items():
+        if name in names:
+            continue
+        kwargs = {'sqlite_where': where, 'postgresql_where': where} if where is not None else {}
+        op.create_index(name, 'candidates', columns, **kwargs)
+
+    # create_all already made interview_token UNIQUE on newer databases
+    if ['interview_token'] not in indexed_columns:
+        op.create_index('idx_interview_token', 'candidates', ['interview_token'])
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    names, _ = _existing_indexes()
+    for name in ['idx_interview_token', 'idx_analysis_unscored', 'idx_analysis_awaiting',
+                 'idx_interview_open_expires', 'idx_interview_active']:
+        if name in names:
+            op.drop_index(name, table_name='candidates')